@@ -5,6 +5,7 @@ GAME_TITLE = "Ruleta Rusa con Cartas"
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 FPS = 60
+DIRTY_RECT_RENDERING = True  # Redibujar solo las zonas que cambian (ui/dirty_rects.py)
 
 # Colores (RGB)
 BLACK = (0, 0, 0)
@@ -23,8 +24,43 @@ CARD_SPACING = 20
 # Configuración de la ruleta
 INITIAL_PROBABILITY = 1
 PROBABILITY_INCREMENT = 10
+ROULETTE_ANGLE_STEP = 2  # Grados entre los giros precalculados de la rueda (divisor de 360)
+
+# Configuración de la IA local (ai/mcts_player.py)
+MCTS_TIME_BUDGET = 0.5  # Segundos de búsqueda por decisión
+MCTS_WORKERS = 1  # Procesos que buscan en paralelo
+
+# Decisiones de la IA (ai/decision_worker.py)
+AI_BACKEND = "mcts"  # "mcts" (local), "gemini" u "ollama"
+AI_DECISION_TIMEOUT = 15  # Segundos antes de jugar por la IA una respuesta de emergencia
+AI_DECISION_DEADLINE = 3.0  # Plazo de Gemini/Ollama por decisión antes de usar la IA local (ai/coordinator.py)
+
+# Caché de decisiones de Gemini/Ollama (ai/decision_cache.py)
+DECISION_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "decisiones_ia.json")
+DECISION_CACHE_SIZE = 4096  # Decisiones máximas guardadas
+DECISION_CACHE_TTL = 24 * 3600  # Segundos que vale una decisión guardada
+
+# Prompts y memoria de Gemini/Ollama (ai/prompting.py)
+LLM_MEMORY_TURNS = 8  # Mensajes recientes que se conservan; los anteriores se resumen
+LLM_PROMPT_TOKEN_BUDGET = 64  # Tokens máximos de la descripción del estado
+
+# Salud de Gemini/Ollama (ai/health.py)
+LLM_MIN_TIMEOUT = 1.0  # Segundos; el timeout se adapta a la latencia reciente entre estos límites
+LLM_MAX_TIMEOUT = 10.0
+LLM_BREAKER_COOLDOWN = 30.0  # Segundos sin enviar peticiones tras abrirse el cortacircuitos
+
+# Registro (utils/logging_setup.py); se configura en main.py
+LOG_LEVEL = os.getenv("JUEGO_IA_LOG_LEVEL", "INFO")  # "DEBUG" incluye prompts y payloads
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs")
+LOG_MAX_BYTES = 1_000_000  # Tamaño a partir del cual rota el fichero (las copias se comprimen)
+LOG_BACKUP_COUNT = 5  # Copias rotadas que se conservan
+LOG_PAYLOAD_SAMPLE_RATE = 0.1  # Fracción de prompts y respuestas completas que se registran
+
+# Asesor de probabilidad de victoria para el jugador (ui/advisor.py)
+ADVISOR_ENABLED = True
+ADVISOR_MAX_ROLLOUTS = 4000  # Partidas simuladas por opción
 
 # Añade esta línea al final del archivo
-#OLLAMA_URL = "http://localhost:11434"  # URL por defecto de Ollama
+OLLAMA_URL = "http://localhost:11434"  # URL por defecto de Ollama
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Decisiones de la IA con plazo fijo y respaldo local.
+
+`DecisionCoordinator` es una `Policy` que envuelve a otra lenta o poco
+fiable (normalmente un `LLMPolicy`). En cada decisión:
+    1. lanza la política principal en su propio hilo, sobre una copia de la
+       partida;
+    2. calcula a la vez una respuesta local rápida (por defecto IS-MCTS con
+       un presupuesto pequeño);
+    3. espera a la principal como mucho hasta `deadline` segundos desde el
+       inicio y, si no ha respondido a tiempo (o ha fallado), usa la local.
+
+Así la latencia de la IA queda acotada por `deadline` sea cual sea el estado
+de la red. Una respuesta tardía de la principal se descarta, y mientras siga
+en marcha las decisiones siguientes van directamente a la local para no
+acumular peticiones.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from ai.decision_worker import copy_game
+from ai.mcts_player import ISMCTSPlayer
+from game.policies import Policy
+from game.rng import RngStream
+
+
+class DecisionCoordinator(Policy):
+    """Política con plazo: la principal si responde a tiempo, si no la local."""
+
+    def __init__(self, primary, local=None, deadline=3.0, seed=None):
+        """
+        Args:
+            primary: Política principal (por ejemplo `LLMPolicy`)
+            local: Política local de respaldo (por defecto IS-MCTS de 0.1 s)
+            deadline: Segundos máximos por decisión
+            seed: Semilla de los generadores de las copias de la partida
+        """
+        self.primary = primary
+        self.local = local or ISMCTSPlayer(time_budget=min(0.1, deadline / 4))
+        self.deadline = deadline
+        self.last_source = None  # "primary" o "local"
+        self.stats = {"primary": 0, "local": 0, "late": 0, "failed": 0, "busy": 0}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ia-principal")
+        self._running = None
+        # Las copias no toman nada del azar de la partida (ver decision_worker.copy_game)
+        self.rng_stream = RngStream(seed)
+
+    def choose_card(self, game, player):
+        return self._decide(game, player, "choose_card", _valid_card)
+
+    def decide_after_losing(self, game, player):
+        return self._decide(game, player, "decide_after_losing", _valid_loss_decision)
+
+    def _decide(self, game, player, method, is_valid):
+        start = time.monotonic()
+        future = None
+        if self._running is not None and not self._running.done():
+            # La principal sigue con una decisión anterior que llegó tarde
+            self.stats["busy"] += 1
+        else:
+            copy = copy_game(game, self.rng_stream.spawn(1)[0].random())
+            copy_player = copy.ai_player if player is game.ai_player else copy.player
+            future = self._running = self._executor.submit(
+                getattr(self.primary, method), copy, copy_player)
+
+        local_answer = getattr(self.local, method)(game, player)
+        if future is None:
+            return self._use_local(local_answer)
+
+        try:
+            answer = future.result(timeout=max(0.0, self.deadline - (time.monotonic() - start)))
+        except FutureTimeoutError:
+            self.stats["late"] += 1
+            logging.warning(f"La IA principal no respondió en {self.deadline} s; se usa la local")
+            return self._use_local(local_answer)
+        except Exception as e:
+            self.stats["failed"] += 1
+            logging.error(f"Error en la IA principal: {e}", exc_info=True)
+            return self._use_local(local_answer)
+
+        if getattr(self.primary, "last_failed", False) or not is_valid(player, answer):
+            self.stats["failed"] += 1
+            return self._use_local(local_answer)
+        self.stats["primary"] += 1
+        self.last_source = "primary"
+        return answer
+
+    def _use_local(self, answer):
+        self.stats["local"] += 1
+        self.last_source = "local"
+        return answer
+
+    def close(self):
+        """Detiene el hilo de la principal y libera las dos políticas."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.primary.close()
+        self.local.close()
+
+
+def _valid_card(player, index):
+    hand = player.hand
+    return isinstance(index, int) and 0 <= index < len(hand) and hand[index].type == "number"
+
+
+def _valid_loss_decision(player, decision):
+    if not isinstance(decision, dict) or decision.get("choice") not in ("skill", "roulette"):
+        return False
+    if decision["choice"] == "roulette":
+        return True
+    index = decision.get("card_index")
+    hand = player.hand
+    return isinstance(index, int) and 0 <= index < len(hand) and hand[index].type == "skill"
@@ -0,0 +1,183 @@
+"""
+Caché de decisiones de los jugadores LLM por estado canónico.
+
+Muchas posiciones que llegan a `make_decision` son equivalentes aunque el
+prompt cambie: las mismas cartas numéricas, las mismas habilidades y la
+misma probabilidad de la ruleta, solo que en otro orden en la mano. La clave
+canónica ignora ese orden y las decisiones se guardan por valor de carta y
+tipo de habilidad, no por índice; al leerlas se traducen a los índices de la
+mano real.
+
+Expulsión:
+    - Caché llena: se expulsa la entrada usada hace más tiempo (LRU).
+    - Entradas más antiguas que `ttl` segundos: se descartan al leerlas y al
+      cargar el fichero.
+
+Con `path` las entradas se conservan entre sesiones en un fichero JSON.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def canonical_key(game_state):
+    """
+    Clave canónica de un estado en el formato de `make_decision`.
+
+    Returns:
+        tuple: (valores numéricos ordenados, (habilidad, copias) ordenadas, probabilidad)
+    """
+    numbers = []
+    skills = {}
+    for card in game_state["hand"]:
+        if card.type == "number":
+            numbers.append(card.value)
+        else:
+            skills[card.effect_type] = skills.get(card.effect_type, 0) + 1
+    return (tuple(sorted(numbers)), tuple(sorted(skills.items())),
+            game_state.get("roulette_probability"))
+
+
+def canonical_decision(decision, hand):
+    """Sustituye los índices de `decision` por el valor de la carta o el tipo de habilidad."""
+    return {
+        "card_value": _card_at(hand, decision.get("card_to_play"), "number", "value"),
+        "if_lose_choice": decision.get("if_lose_choice"),
+        "skill_effect": _card_at(hand, decision.get("skill_card_index"), "skill", "effect_type"),
+        "reasoning": decision.get("reasoning"),
+    }
+
+
+def remap_decision(entry, hand):
+    """Traduce una decisión canónica a los índices de `hand` (None si no hay carta)."""
+    return {
+        "card_to_play": _index_of(hand, "number", "value", entry["card_value"]),
+        "if_lose_choice": entry["if_lose_choice"],
+        "skill_card_index": _index_of(hand, "skill", "effect_type", entry["skill_effect"]),
+        "reasoning": entry["reasoning"],
+    }
+
+
+def _card_at(hand, index, card_type, attribute):
+    if isinstance(index, int) and 0 <= index < len(hand) and hand[index].type == card_type:
+        return getattr(hand[index], attribute)
+    return None
+
+
+def _index_of(hand, card_type, attribute, wanted):
+    if wanted is None:
+        return None
+    return next((i for i, card in enumerate(hand)
+                 if card.type == card_type and getattr(card, attribute) == wanted), None)
+
+
+class DecisionCache:
+    """Caché LRU con caducidad de decisiones de un jugador LLM."""
+
+    def __init__(self, capacity=4096, ttl=24 * 3600, path=None):
+        """
+        Args:
+            capacity: Número máximo de decisiones guardadas
+            ttl: Segundos que vale una decisión (None = no caducan)
+            path: Fichero JSON donde se conservan entre sesiones (opcional)
+        """
+        if capacity <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()  # clave -> (decisión canónica, instante de guardado)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def get(self, game_state):
+        """
+        Busca la decisión de un estado.
+
+        Returns:
+            dict: Decisión con los índices de la mano de `game_state`, o None
+        """
+        key = canonical_key(game_state)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1], time.time()):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return remap_decision(entry[0], game_state["hand"])
+
+    def put(self, game_state, decision):
+        """Guarda la decisión tomada en `game_state`."""
+        key = canonical_key(game_state)
+        entry = (canonical_decision(decision, game_state["hand"]), time.time())
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.capacity:
+                self._entries.popitem(last=False)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def load(self):
+        """Carga las entradas vigentes de `path` (las caducadas se descartan)."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"No se pudo cargar la caché de decisiones {self.path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for numbers, skills, probability, decision, stored_at in data.get("entries", []):
+                if self._expired(stored_at, now):
+                    continue
+                key = (tuple(numbers), tuple((effect, count) for effect, count in skills), probability)
+                self._entries[key] = (decision, stored_at)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        logging.info(f"Caché de decisiones cargada: {len(self._entries)} entradas")
+
+    def save(self):
+        """Escribe las entradas en `path` (sin efecto si la caché no tiene fichero)."""
+        if self.path is None:
+            return
+        with self._lock:
+            entries = [[list(numbers), [list(skill) for skill in skills], probability, decision, stored_at]
+                       for (numbers, skills, probability), (decision, stored_at) in self._entries.items()]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Escritura atómica: un cierre a medias no deja el fichero corrupto
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Devuelve el tamaño y la tasa de aciertos de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
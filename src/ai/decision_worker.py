@@ -0,0 +1,199 @@
+"""
+Decisiones de la IA fuera del bucle de la interfaz.
+
+`DecisionWorker` ejecuta las decisiones de la IA (la carta de cada turno y la
+respuesta tras perder) en un hilo propio y devuelve `PendingDecision`, que
+envuelve un `concurrent.futures.Future`. `GameScreen` consulta en cada
+fotograma si la decisión ha terminado, así que la ventana sigue dibujando y
+atendiendo eventos aunque la IA tarde (por ejemplo, en una petición HTTP).
+
+Cada decisión se calcula sobre una copia de la partida hecha con
+`GameState`, de modo que el hilo nunca lee el `Game` que modifica la
+interfaz. Los índices devueltos son válidos en la partida original porque
+la copia conserva el orden de las manos. Cada copia lleva su propio
+generador, derivado de un `RngStream` del trabajador: pedir decisiones (o
+adelantarlas) nunca consume el azar de la partida, que sigue siendo
+reproducible con su semilla.
+
+Las decisiones pueden pedirse por adelantado con `prefetch` (la carta de la
+IA mientras el jugador elige la suya; la respuesta tras perder mientras se
+revela el turno). Al pedirla de verdad se reutiliza la decisión adelantada
+solo si la partida sigue exactamente en la misma posición.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from game.rng import RngStream
+
+
+class PendingDecision:
+    """Decisión de la IA en curso."""
+
+    def __init__(self, future, kind, generation):
+        self.future = future
+        self.kind = kind  # "card" o "loss"
+        self.generation = generation
+        self.started_at = time.monotonic()
+
+    def done(self):
+        return self.future.done()
+
+    def elapsed(self):
+        """Segundos desde que se pidió la decisión."""
+        return time.monotonic() - self.started_at
+
+    def result(self):
+        """Resultado de la decisión (lanza la excepción si falló)."""
+        return self.future.result(timeout=0)
+
+    def cancel(self):
+        """Cancela la decisión si aún no ha empezado; si ya corre, su resultado se ignora."""
+        return self.future.cancel()
+
+
+class DecisionWorker:
+    """Ejecuta las decisiones de la IA en un hilo demonio y devuelve futuros."""
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: Semilla de los generadores de las copias de la partida
+        """
+        self.generation = 0
+        self.rng_stream = RngStream(seed)
+        self._jobs = queue.Queue()
+        self._pending = []
+        self._prefetched = {}  # tipo -> (GameState, PendingDecision)
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self._thread = threading.Thread(target=self._run, name="decisiones-ia", daemon=True)
+        self._thread.start()
+
+    def submit_card_choice(self, game):
+        """Pide a la política de la IA la carta del turno. El resultado es un índice válido."""
+        return self._take("card", game)
+
+    def submit_loss_decision(self, game):
+        """Pide la respuesta de la IA tras perder (ver `Game.decide_after_losing`)."""
+        return self._take("loss", game)
+
+    def prefetch(self, kind, game):
+        """
+        Empieza a calcular una decisión antes de que haga falta.
+
+        Si ya hay una decisión adelantada de ese tipo para la misma posición no
+        se hace nada; si la posición ha cambiado, la anterior se descarta.
+
+        Args:
+            kind: "card" o "loss"
+            game: Partida en la posición para la que se adelanta la decisión
+        """
+        state = game.snapshot()
+        entry = self._prefetched.get(kind)
+        if entry is not None:
+            if entry[0] == state and self._usable(entry[1]):
+                return
+            entry[1].cancel()
+        self._prefetched[kind] = (state, self._submit(kind, game, state))
+
+    def _take(self, kind, game):
+        """Devuelve la decisión adelantada si sigue siendo válida o pide una nueva."""
+        state = game.snapshot()
+        entry = self._prefetched.pop(kind, None)
+        if entry is not None:
+            if entry[0] == state and self._usable(entry[1]):
+                self.prefetch_hits += 1
+                return entry[1]
+            entry[1].cancel()
+        self.prefetch_misses += 1
+        return self._submit(kind, game, state)
+
+    def _usable(self, pending):
+        return self.is_current(pending) and not pending.future.cancelled()
+
+    def _submit(self, kind, game, state):
+        function = _choose_card if kind == "card" else _decide_after_losing
+        future = Future()
+        pending = PendingDecision(future, kind, self.generation)
+        self._pending = [p for p in self._pending if not p.done()] + [pending]
+        rng = self.rng_stream.spawn(1)[0].random()
+        self._jobs.put((future, function, copy_game(game, rng, state)))
+        return pending
+
+    def cancel_all(self):
+        """
+        Cancela las decisiones pendientes (por ejemplo, al terminar la partida).
+
+        Las que ya están en marcha no pueden interrumpirse, pero su generación
+        queda obsoleta y la interfaz descarta su resultado.
+        """
+        self.generation += 1
+        for pending in self._pending:
+            pending.cancel()
+        self._pending = []
+        self._prefetched = {}
+
+    def is_current(self, pending):
+        """Indica si `pending` pertenece a la generación actual."""
+        return pending is not None and pending.generation == self.generation
+
+    def shutdown(self):
+        """Detiene el hilo trabajador tras cancelar lo pendiente."""
+        self.cancel_all()
+        self._jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, function, game = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(game))
+            except Exception as e:
+                logging.error(f"Error en la decisión de la IA: {e}", exc_info=True)
+                future.set_exception(e)
+
+
+def copy_game(game, rng, state=None):
+    """
+    Copia independiente de la partida (en la posición `state`, o la actual) para decidir en otro hilo.
+
+    Args:
+        game: Partida original
+        rng: Generador `random.Random` de la copia; nunca se toma del de `game`
+        state: `GameState` a copiar (por defecto, la posición actual)
+    """
+    state = state or game.snapshot()
+    return state.to_game(
+        player_name=game.player.name,
+        ai_name=game.ai_player.name,
+        ai_policy=game.ai_policy,
+        rng=rng,
+    )
+
+
+def _choose_card(game):
+    """Carta de la IA para el turno; si la política no da un índice válido, una al azar."""
+    hand = game.ai_player.hand
+    index = None
+    if game.ai_policy is not None:
+        index = game.ai_policy.choose_card(game, game.ai_player)
+    if index is None or not (0 <= index < len(hand)) or hand[index].type != "number":
+        index = random_card(game)
+    return index
+
+
+def _decide_after_losing(game):
+    return game.decide_after_losing()
+
+
+def random_card(game):
+    """Índice de una carta numérica al azar de la IA (respuesta de emergencia)."""
+    number_cards = [i for i, card in enumerate(game.ai_player.hand) if card.type == "number"]
+    return game.rng.choice(number_cards) if number_cards else None
@@ -3,51 +3,60 @@ import sys
 import json
 import logging
 import requests
-from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config.settings import GEMINI_API_KEY
+from config.settings import GEMINI_API_KEY, LLM_MEMORY_TURNS, LLM_PROMPT_TOKEN_BUDGET
+from config.settings import LLM_MIN_TIMEOUT, LLM_MAX_TIMEOUT, LLM_BREAKER_COOLDOWN
+from ai.health import BackendUnavailable, InvalidResponse, get_health
+from ai.http_client import get_session, warm_up
+from ai.prompting import ConversationMemory, DECISION_REQUEST, encode_state, system_prompt
+from ai.streaming import gemini_stream_text, read_decision
 
-# Configurar logging
-log_dir = os.path.join(os.path.dirname(__file__), '../../logs')
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, f"gemini_player_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+# Reglas del juego; el prompt de sistema completo se construye una sola vez
+SYSTEM_PROMPT = system_prompt("""
+Eres una IA que juega un juego de cartas llamado "Ruleta Rusa con Cartas". Las reglas son:
+1. Tienes cartas numéricas (1-10) y cartas de habilidad.
+2. En cada turno, ambos jugadores juegan una carta numérica. El número más alto gana.
+3. Si pierdes, puedes usar una carta de habilidad o arriesgarte con una ruleta rusa.
+4. Las habilidades incluyen: aumentar tu número, intercambiar cartas, o salvarte automáticamente.
+5. La ruleta empieza con 1% de probabilidad de "muerte" y aumenta 10% cada turno.
+6. El juego termina cuando un jugador "muere" en la ruleta o se acaban las cartas numéricas.
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()  # También mostrar en consola
-    ]
-)
+Tu objetivo es ganar el juego tomando decisiones estratégicas sobre qué cartas jugar y cuándo arriesgarte.
+""")
 
 class AIPlayerWithGemini:
     """Implementa un jugador de IA que usa Google Gemini para tomar decisiones."""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, base_url=None, session=None, decision_cache=None, stream=True,
+                 health=None):
         # Configurar la API de Gemini
         self.api_key = api_key or GEMINI_API_KEY
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+        self.base_url = base_url or "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+        # Sesión HTTP con conexiones persistentes y reintentos (ai/http_client.py)
+        self.session = session or get_session()
+        # Caché opcional de decisiones por estado canónico (ai/decision_cache.py)
+        self.decision_cache = decision_cache
+        # Leer la respuesta en streaming y cortarla al completarse la decisión
+        self.stream = stream
+        # Latencia reciente, timeout adaptativo y cortacircuitos compartidos (ai/health.py)
+        self.health = health or get_health("gemini", min_timeout=LLM_MIN_TIMEOUT, max_timeout=LLM_MAX_TIMEOUT,
+                                           cooldown=LLM_BREAKER_COOLDOWN)
         logging.info("Inicializando AIPlayerWithGemini")
         
-        # Sistema de memoria para el contexto del juego
-        self.game_memory = []
+        # Sistema de memoria para el contexto del juego: últimos turnos y un resumen
+        # de los anteriores (ver ai/prompting.py)
+        self.game_memory = ConversationMemory(max_turns=LLM_MEMORY_TURNS)
+        # Tokens máximos de la descripción del estado en cada petición
+        self.token_budget = LLM_PROMPT_TOKEN_BUDGET
         
+    def warm_up(self):
+        """Abre en segundo plano la conexión con Gemini para la primera decisión."""
+        return warm_up(self.base_url, self.session)
+    
     def initialize_conversation(self):
         """Inicializa la conversación con la IA explicándole el juego."""
-        system_prompt = """
-        Eres una IA que juega un juego de cartas llamado "Ruleta Rusa con Cartas". Las reglas son:
-        1. Tienes cartas numéricas (1-10) y cartas de habilidad.
-        2. En cada turno, ambos jugadores juegan una carta numérica. El número más alto gana.
-        3. Si pierdes, puedes usar una carta de habilidad o arriesgarte con una ruleta rusa.
-        4. Las habilidades incluyen: aumentar tu número, intercambiar cartas, o salvarte automáticamente.
-        5. La ruleta empieza con 1% de probabilidad de "muerte" y aumenta 10% cada turno.
-        6. El juego termina cuando un jugador "muere" en la ruleta o se acaban las cartas numéricas.
-        
-        Tu objetivo es ganar el juego tomando decisiones estratégicas sobre qué cartas jugar y cuándo arriesgarte.
-        """
-        
-        self.game_memory.append({"role": "system", "content": system_prompt})
+        # El prompt de sistema se construye una vez al importar el módulo
+        self.game_memory.set_system(SYSTEM_PROMPT)
         logging.info("Conversación inicializada con sistema de reglas")
     
     def make_decision(self, game_state):
@@ -60,34 +69,27 @@ class AIPlayerWithGemini:
         Returns:
             dict: Decisión tomada por la IA
         """
+        # Un estado equivalente ya decidido no necesita otra petición
+        if self.decision_cache is not None:
+            cached = self.decision_cache.get(game_state)
+            if cached is not None:
+                logging.info(f"Decisión obtenida de la caché: {cached}")
+                return cached
+        
         # Convertir el estado del juego a un formato legible para la IA
         state_description = self._format_game_state(game_state)
-        logging.info("Estado del juego formateado para Gemini:")
-        logging.info(state_description)
+        # Los textos voluminosos van como payload: se muestrean y formatean en el
+        # hilo de registro (utils/logging_setup.py), no en el de la decisión
+        logging.debug("Estado del juego formateado para Gemini", extra={"payload": state_description})
         
         # Añadir el estado a la memoria
         self.game_memory.append({"role": "user", "content": state_description})
         
-        # Crear el prompt para la IA
-        prompt = f"""
-        Basado en el estado actual del juego:
-        {state_description}
-        
-        Por favor, toma una decisión estratégica:
-        1. ¿Qué carta numérica deberías jugar? Elige la mejor opción.
-        2. Si pierdes este turno, ¿deberías usar una carta de habilidad o arriesgarte con la ruleta?
-        
-        Responde únicamente con un objeto JSON como este:
-        {{
-            "card_to_play": indice_de_la_carta,
-            "if_lose_choice": "skill" o "roulette",
-            "skill_card_index": índice_de_la_carta_de_habilidad (si elegiste skill),
-            "reasoning": "breve explicación de tu decisión"
-        }}
-        """
+        # Crear el prompt para la IA (las instrucciones fijas van en el prompt de sistema)
+        prompt = f"{state_description}\n{DECISION_REQUEST}"
         
         messages = [
-            {"role": "system", "parts": [{"text": self.game_memory[0]["content"]}]},
+            {"role": "system", "parts": [{"text": self.game_memory.system["content"]}]},
             {"role": "user", "parts": [{"text": prompt}]}
         ]
         
@@ -95,34 +97,39 @@ class AIPlayerWithGemini:
         
         try:
             # Hacer la solicitud a Gemini
-            response_text = self._call_gemini(messages)
+            response_text, decision = self.health.call(self._call_gemini, messages,
+                                                       parse=self._parse_response)
             
             # Añadir la respuesta a la memoria
             self.game_memory.append({"role": "model", "content": response_text})
             
-            # Registrar la respuesta completa
-            logging.info("Respuesta completa de Gemini:")
-            logging.info(response_text)
-            
-            # Extraer el JSON de la respuesta
-            json_str = self._extract_json(response_text)
-            logging.info(f"JSON extraído: {json_str}")
-            
-            if json_str:
-                decision = json.loads(json_str)
-                logging.info(f"Decisión parseada exitosamente: {decision}")
-            else:
-                # Si no hay JSON, crearemos uno por defecto
-                decision = {
-                    "card_to_play": 0,  # Primera carta
-                    "if_lose_choice": "roulette",
-                    "skill_card_index": None,
-                    "reasoning": "Decisión por defecto debido a un error en la salida"
-                }
-                logging.warning("No se pudo extraer JSON, usando decisión por defecto")
-            
+            logging.info(f"Decisión parseada exitosamente: {decision}")
+            if self.decision_cache is not None:
+                self.decision_cache.put(game_state, decision)
             return decision
             
+        except InvalidResponse as e:
+            # Ya contó como fallo en el cortacircuitos; se juega la decisión por defecto
+            self.game_memory.append({"role": "model", "content": e.text})
+            logging.warning(f"{e}, usando decisión por defecto")
+            return {
+                "card_to_play": 0,  # Primera carta
+                "if_lose_choice": "roulette",
+                "skill_card_index": None,
+                "reasoning": "Decisión por defecto debido a un error en la salida",
+                "default": True  # No es una respuesta del modelo
+            }
+            
+        except BackendUnavailable as e:
+            # Circuito abierto: se responde al momento sin contactar con el servidor
+            logging.warning(str(e))
+            return {
+                "card_to_play": 0,
+                "if_lose_choice": "roulette",
+                "skill_card_index": None,
+                "reasoning": "Servidor de IA no disponible",
+                "default": True  # No es una respuesta del modelo
+            }
         except Exception as e:
             logging.error(f"Error al comunicarse con Gemini: {e}", exc_info=True)
             # Devolver una decisión por defecto en caso de error
@@ -130,7 +137,8 @@ class AIPlayerWithGemini:
                 "card_to_play": 0,  # Primera carta
                 "if_lose_choice": "roulette",
                 "skill_card_index": None,
-                "reasoning": "Error en la comunicación con la IA"
+                "reasoning": "Error en la comunicación con la IA",
+                "default": True  # No es una respuesta del modelo
             }
     
     def _call_gemini(self, messages, timeout=10):
@@ -148,10 +156,13 @@ class AIPlayerWithGemini:
             }
         }
         
+        if self.stream:
+            return self._call_gemini_stream(payload, timeout)
+        
         logging.info(f"Enviando solicitud a Gemini API")
         
         try:
-            response = requests.post(url, json=payload, timeout=timeout)
+            response = self.session.post(url, json=payload, timeout=timeout)
             logging.info(f"Respuesta recibida - Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -167,7 +178,7 @@ class AIPlayerWithGemini:
                 
                 error_msg = "No se pudo extraer la respuesta de Gemini"
                 logging.error(error_msg)
-                logging.error(f"Respuesta completa: {response_data}")
+                logging.error("Respuesta completa de Gemini", extra={"payload": response_data})
                 raise Exception(error_msg)
             else:
                 error_msg = f"Error en la llamada a Gemini: {response.status_code} - {response.text}"
@@ -183,6 +194,59 @@ class AIPlayerWithGemini:
             logging.critical(error_msg)
             raise Exception(error_msg)
     
+    def _call_gemini_stream(self, payload, timeout):
+        """
+        Llamada en streaming a Gemini (`streamGenerateContent`).
+        
+        Devuelve el JSON de la decisión en cuanto está completo y corta el resto
+        de la generación (ver ai/streaming.py).
+        """
+        url = self.base_url.replace(":generateContent", ":streamGenerateContent")
+        url = f"{url}?alt=sse&key={self.api_key}"
+        
+        logging.info("Enviando solicitud en streaming a Gemini API")
+        
+        try:
+            with self.session.post(url, json=payload, timeout=timeout, stream=True) as response:
+                logging.info(f"Respuesta recibida - Status: {response.status_code}")
+                if response.status_code != 200:
+                    error_msg = f"Error en la llamada a Gemini: {response.status_code} - {response.text}"
+                    logging.error(error_msg)
+                    raise Exception(error_msg)
+                response_text, cut_short = read_decision(gemini_stream_text(response))
+        except requests.exceptions.Timeout:
+            error_msg = f"Timeout en la solicitud a Gemini después de {timeout} segundos"
+            logging.error(error_msg)
+            raise Exception(error_msg)
+        except requests.exceptions.ConnectionError:
+            error_msg = "No se pudo conectar a Gemini API."
+            logging.critical(error_msg)
+            raise Exception(error_msg)
+        
+        if cut_short:
+            # Cortar la respuesta cierra su conexión: se abre otra para la próxima decisión
+            logging.info("Decisión completa recibida; se descarta el resto de la generación")
+            warm_up(self.base_url, self.session)
+        return response_text
+    
+    def _parse_response(self, response_text):
+        """
+        Extrae la decisión de la respuesta del modelo (se llama dentro de `health.call`).
+        
+        Returns:
+            tuple: (texto de la respuesta, decisión)
+            
+        Raises:
+            InvalidResponse: Si la respuesta no contiene un objeto JSON válido
+        """
+        logging.info("Respuesta completa de Gemini", extra={"payload": response_text})
+        json_str = self._extract_json(response_text)
+        logging.debug("JSON extraído", extra={"payload": json_str})
+        decision = json.loads(json_str) if json_str else None
+        if not isinstance(decision, dict):
+            raise InvalidResponse("No se pudo extraer JSON de la respuesta", response_text)
+        return response_text, decision
+    
     def _extract_json(self, text):
         """Extrae JSON de la respuesta de texto."""
         logging.info("Intentando extraer JSON de la respuesta...")
@@ -217,30 +281,5 @@ class AIPlayerWithGemini:
         return None
     
     def _format_game_state(self, game_state):
-        """Formatea el estado del juego para la IA."""
-        hand = game_state["hand"]
-        hand_description = "Tus cartas son:\n"
-        
-        # Añade información sobre las cartas numéricas y de habilidad por separado
-        number_cards = []
-        skill_cards = []
-        
-        for i, card in enumerate(hand):
-            if card.type == "number":
-                number_cards.append(f"{i}: Carta Numérica {card.value}")
-            else:
-                skill_cards.append(f"{i}: Habilidad '{card.name}' - {card.description}")
-        
-        hand_description += "\nCartas numéricas:\n"
-        hand_description += "\n".join(number_cards) if number_cards else "No tienes cartas numéricas"
-        
-        hand_description += "\n\nCartas de habilidad:\n"
-        hand_description += "\n".join(skill_cards) if skill_cards else "No tienes cartas de habilidad"
-        
-        return f"""
-        {hand_description}
-        
-        Última carta jugada por el oponente: {game_state.get('opponent_last_card', 'Ninguna')}
-        Probabilidad actual de la ruleta: {game_state.get('roulette_probability', 1)}%
-        Turno actual: {game_state.get('turn_count', 0)}
-        """
\ No newline at end of file
+        """Formatea el estado del juego para la IA de forma compacta (ver ai/prompting.py)."""
+        return encode_state(game_state, self.token_budget)
\ No newline at end of file
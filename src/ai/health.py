@@ -0,0 +1,215 @@
+"""
+Salud de los servidores remotos de IA: timeouts adaptativos y cortacircuitos.
+
+`BackendHealth` guarda las últimas llamadas a un servidor (latencia y si
+fallaron) y de ellas deriva:
+    - el timeout de la siguiente llamada, a partir del percentil 99 de la
+      latencia reciente (acotado entre `min_timeout` y `max_timeout`);
+    - el estado del cortacircuitos:
+        cerrado  -> las peticiones pasan con normalidad;
+        abierto  -> se rechazan al momento durante `cooldown` segundos, tras
+                    `failure_streak` fallos seguidos o una tasa de error
+                    reciente mayor que `max_error_rate`;
+        semiabierto -> pasado el `cooldown` se deja pasar una única petición
+                    de prueba: si va bien se cierra y si falla se vuelve a
+                    abrir con el doble de espera.
+
+Con el circuito abierto el jugador LLM falla al instante y la IA local toma
+la decisión (ver ai/coordinator.py) en lugar de esperar al timeout en cada
+turno.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+CLOSED = "cerrado"
+OPEN = "abierto"
+HALF_OPEN = "semiabierto"
+
+
+class BackendUnavailable(Exception):
+    """El cortacircuitos del servidor está abierto."""
+
+
+class InvalidResponse(Exception):
+    """El servidor respondió, pero sin una decisión utilizable."""
+
+    def __init__(self, message, text=None):
+        super().__init__(message)
+        self.text = text  # Respuesta recibida
+
+
+class BackendHealth:
+    """Estadísticas recientes y cortacircuitos de un servidor de IA."""
+
+    def __init__(self, name, window=50, min_timeout=1.0, max_timeout=10.0, timeout_factor=1.5,
+                 min_samples=5, failure_streak=3, max_error_rate=0.5, cooldown=30.0,
+                 max_cooldown=300.0, clock=time.monotonic):
+        """
+        Args:
+            name: Nombre del servidor (para el registro)
+            window: Llamadas recientes que se tienen en cuenta
+            min_timeout: Timeout mínimo (segundos)
+            max_timeout: Timeout máximo, y el que se usa sin datos suficientes
+            timeout_factor: Margen sobre el percentil 99 de la latencia
+            min_samples: Llamadas correctas necesarias para adaptar el timeout
+                (y llamadas mínimas para juzgar la tasa de error)
+            failure_streak: Fallos seguidos que abren el circuito
+            max_error_rate: Tasa de error reciente que abre el circuito
+            cooldown: Segundos con el circuito abierto antes de probar de nuevo
+            max_cooldown: Espera máxima tras varias pruebas fallidas
+            clock: Reloj (inyectable para pruebas)
+        """
+        self.name = name
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.min_samples = min_samples
+        self.failure_streak = failure_streak
+        self.max_error_rate = max_error_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+
+        self.calls = deque(maxlen=window)  # (latencia o None, correcta)
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.opened_at = None
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Indica si se puede enviar una petición ahora.
+
+        Con el circuito abierto y el `cooldown` cumplido pasa a semiabierto y
+        deja pasar una única petición de prueba.
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logging.info(f"Cortacircuitos de {self.name}: probando de nuevo el servidor")
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency):
+        """Registra una llamada correcta que tardó `latency` segundos."""
+        with self._lock:
+            self.calls.append((latency, True))
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logging.info(f"Cortacircuitos de {self.name}: servidor recuperado")
+                self.state = CLOSED
+                self.cooldown = self.base_cooldown
+                self._probe_in_flight = False
+
+    def record_failure(self, latency=None):
+        """Registra una llamada fallida (error, timeout o respuesta no válida)."""
+        with self._lock:
+            self.calls.append((latency, False))
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                # La prueba ha fallado: se espera el doble antes de la siguiente
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == CLOSED and self._should_open():
+                self._open()
+
+    def _should_open(self):
+        if self.consecutive_failures >= self.failure_streak:
+            return True
+        if len(self.calls) < self.min_samples:
+            return False
+        failures = sum(1 for _, ok in self.calls if not ok)
+        return failures / len(self.calls) > self.max_error_rate
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self._probe_in_flight = False
+        logging.warning(f"Cortacircuitos de {self.name} abierto durante {self.cooldown:.0f} s")
+
+    def percentile(self, p):
+        """Percentil `p` (0-100) de la latencia de las llamadas correctas recientes, o None."""
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self.calls if ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def timeout(self):
+        """Timeout para la siguiente llamada según la latencia reciente."""
+        with self._lock:
+            successes = sum(1 for _, ok in self.calls if ok)
+        if successes < self.min_samples:
+            return self.max_timeout
+        p99 = self.percentile(99)
+        return max(self.min_timeout, min(self.max_timeout, p99 * self.timeout_factor))
+
+    def call(self, function, *args, parse=None):
+        """
+        Llama a `function(*args, timeout=...)` con el timeout adaptativo y registra el resultado.
+
+        Args:
+            function: Función que hace la petición
+            parse: Función opcional que valida y convierte la respuesta; si lanza
+                una excepción (p. ej. `InvalidResponse`) la llamada cuenta como
+                fallo, igual que un error de red
+
+        Returns:
+            La respuesta de `function`, o lo que devuelva `parse`
+
+        Raises:
+            BackendUnavailable: Si el circuito está abierto (sin llegar a llamar)
+        """
+        if not self.allow_request():
+            raise BackendUnavailable(f"{self.name} no disponible (cortacircuitos {self.state})")
+        start = time.perf_counter()
+        try:
+            result = function(*args, timeout=self.timeout())
+            if parse is not None:
+                result = parse(result)
+        except Exception:
+            self.record_failure(time.perf_counter() - start)
+            raise
+        self.record_success(time.perf_counter() - start)
+        return result
+
+    def stats(self):
+        """Resumen del estado del servidor."""
+        with self._lock:
+            calls = len(self.calls)
+            failures = sum(1 for _, ok in self.calls if not ok)
+            state, rejected = self.state, self.rejected
+        return {
+            "state": state,
+            "calls": calls,
+            "error_rate": failures / calls if calls else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "timeout": self.timeout(),
+            "rejected": rejected,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_health(name, **kwargs):
+    """`BackendHealth` compartido de un servidor (se crea la primera vez con `kwargs`)."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = BackendHealth(name, **kwargs)
+        return _registry[name]
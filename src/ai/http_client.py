@@ -0,0 +1,103 @@
+"""
+Transporte HTTP compartido por los jugadores LLM (Gemini y Ollama).
+
+Todas las peticiones pasan por una única `requests.Session` con un grupo de
+conexiones persistentes (keep-alive), así que la conexión TCP y TLS se abre
+una vez y se reutiliza en cada decisión. Los errores transitorios (429 y 5xx,
+o fallos al conectar) se reintentan con espera exponencial y una variación
+aleatoria para no sincronizar los reintentos.
+
+`warm_up` abre la conexión en segundo plano al arrancar el juego, de modo que
+la primera decisión de la IA no paga el coste del establecimiento.
+"""
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_session(pool_size=4, retries=3, backoff_factor=0.3, backoff_jitter=0.2):
+    """
+    Crea una sesión con conexiones persistentes y política de reintentos.
+
+    Args:
+        pool_size: Conexiones que se conservan abiertas por servidor
+        retries: Reintentos máximos por petición
+        backoff_factor: Base de la espera exponencial entre reintentos (segundos)
+        backoff_jitter: Variación aleatoria máxima añadida a cada espera (segundos)
+
+    Returns:
+        requests.Session: Sesión lista para usar
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        # Un timeout de lectura suele significar que el modelo es lento:
+        # reintentarlo solo alargaría la espera de la interfaz
+        read=0,
+        status=retries,
+        status_forcelist=RETRY_STATUS,
+        # Las peticiones a los modelos no tienen efectos secundarios
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Sesión compartida del proceso (se crea la primera vez que se pide)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
+
+
+def close_session():
+    """Cierra las conexiones de la sesión compartida."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def warm_up(url, session=None, timeout=5):
+    """
+    Abre en segundo plano una conexión con el servidor de `url`.
+
+    Solo se contacta la raíz del servidor; la respuesta da igual, lo que
+    importa es que la conexión quede abierta en el grupo de la sesión.
+
+    Returns:
+        threading.Thread: Hilo que hace el calentamiento
+    """
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}/"
+    session = session or get_session()
+
+    def run():
+        try:
+            session.head(origin, timeout=timeout)
+            logging.info(f"Conexión precalentada con {parts.netloc}")
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"No se pudo precalentar la conexión con {parts.netloc}: {e}")
+
+    thread = threading.Thread(target=run, name="precalentar-http", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,76 @@
+"""
+Adaptador de los jugadores LLM (`AIPlayerWithGemini`, `AIPlayerWithOllama`)
+a la interfaz `Policy` que usa `Game` para decidir por la IA.
+
+El modelo contesta en una sola respuesta qué carta jugar y qué hacer si
+pierde el turno; ese plan se guarda y se reutiliza en `decide_after_losing`
+para no hacer una segunda petición en el mismo turno.
+"""
+from game.policies import Policy, RandomPolicy
+
+
+def llm_game_state(game, player):
+    """Estado del juego en el formato que espera `make_decision`."""
+    opponent = game.player if player is game.ai_player else game.ai_player
+    return {
+        "hand": player.hand,
+        "opponent_last_card": opponent.played_card.value if opponent.played_card else None,
+        "roulette_probability": game.roulette.get_probability(),
+        "turn_count": game.turn_count,
+        "skill_used": game.skill_used_this_turn,
+    }
+
+
+class LLMPolicy(Policy):
+    """Política que delega en un jugador LLM con `make_decision(game_state)`."""
+
+    def __init__(self, llm_player, fallback=None):
+        """
+        Args:
+            llm_player: Jugador LLM ya configurado
+            fallback: Política para respuestas inválidas (por defecto `RandomPolicy`)
+        """
+        self.llm_player = llm_player
+        self.fallback = fallback or RandomPolicy()
+        self._plan = None  # (turno, elección si pierde, tipo de habilidad)
+        self.last_failed = False  # La última decisión no vino del modelo (error o respuesta vacía)
+        if not llm_player.game_memory:
+            llm_player.initialize_conversation()
+
+    def choose_card(self, game, player):
+        decision = self.llm_player.make_decision(llm_game_state(game, player))
+        self.last_failed = bool(decision.get("default"))
+        hand = player.hand
+
+        index = decision.get("card_to_play")
+        if not _valid_index(hand, index, "number"):
+            index = self.fallback.choose_card(game, player)
+
+        # Los índices cambian al jugar la carta: se recuerda el tipo de habilidad
+        skill_index = decision.get("skill_card_index")
+        effect = hand[skill_index].effect_type if _valid_index(hand, skill_index, "skill") else None
+        self._plan = (game.turn_count, decision.get("if_lose_choice"), effect)
+        return index
+
+    def decide_after_losing(self, game, player):
+        hand = player.hand
+        plan, self._plan = self._plan, None
+        # El turno ya se ha contado al perder, así que el plan es de turn_count - 1
+        if plan is not None and plan[0] == game.turn_count - 1:
+            _, choice, effect = plan
+        else:
+            decision = self.llm_player.make_decision(llm_game_state(game, player))
+            self.last_failed = bool(decision.get("default"))
+            choice = decision.get("if_lose_choice")
+            skill_index = decision.get("skill_card_index")
+            effect = hand[skill_index].effect_type if _valid_index(hand, skill_index, "skill") else None
+
+        if choice == "skill" and effect is not None:
+            for i, card in enumerate(hand):
+                if card.type == "skill" and card.effect_type == effect:
+                    return {"choice": "skill", "card_index": i}
+        return {"choice": "roulette"}
+
+
+def _valid_index(hand, index, card_type):
+    return isinstance(index, int) and 0 <= index < len(hand) and hand[index].type == card_type
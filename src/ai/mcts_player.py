@@ -0,0 +1,340 @@
+"""
+Jugador de IA local basado en Monte Carlo Tree Search sobre conjuntos de información.
+
+La IA no ve la mano del jugador humano. En cada iteración se "determiniza":
+se reparte al humano una mano compatible con lo que la IA sabe (su propia
+mano, las cartas que ya han salido del juego y el tamaño de la mano rival) y
+se recorre el árbol con esa partida concreta. Los nodos del árbol son
+conjuntos de información de la IA, así que las estadísticas de todas las
+determinizaciones se acumulan en los mismos nodos.
+
+El humano se modela con una política (por defecto `RandomPolicy`) y la
+ruleta como azar. El árbol se conserva entre jugadas: al volver a decidir se
+continúa desde el nodo de la posición actual. Con `workers > 1` se lanzan
+búsquedas independientes en otros procesos y se suman sus estadísticas en
+la raíz. Los procesos se arrancan al crear el jugador y reciben el plazo
+absoluto de la jugada; lo que no llegue a tiempo se descarta.
+
+Se usa como política de la IA en `Game`:
+    game = Game(ai_policy=ISMCTSPlayer(time_budget=1.0))
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from game.card import SKILL_DEFINITIONS
+from game.game_logic import Game
+from game.policies import Policy, RandomPolicy
+from game.state import SKILL_CODES, PLAYER, determinize, is_skill_code
+
+SKILL_EFFECTS = tuple(skill["effect"] for skill in SKILL_DEFINITIONS)
+CODE_EFFECTS = {code: effect for effect, code in SKILL_CODES.items()}
+
+ROULETTE = ("roulette",)
+
+# Parte del presupuesto que los procesos trabajadores reservan para devolver
+# sus estadísticas antes del plazo (como máximo, segundos)
+RESULT_MARGIN = 0.1
+MAX_RESULT_MARGIN = 0.02
+
+
+class _Node:
+    """Conjunto de información de la IA con las estadísticas de sus acciones."""
+
+    __slots__ = ("visits", "stats")
+
+    def __init__(self):
+        self.visits = 0
+        self.stats = {}  # acción -> [visitas, victorias de la IA]
+
+
+def info_key(state):
+    """
+    Clave del conjunto de información de la IA para un `GameState`.
+
+    Solo usa lo que la IA puede ver: su mano, las cartas que han salido del
+    juego, cuántas cartas de cada clase tiene el humano y el estado público.
+    """
+    player_numbers = sum(1 for code in state.player_hand if not is_skill_code(code))
+    if state.decision_pending:
+        turn = (state.current_loser, state.skill_used, state.player_played, state.ai_played)
+    else:
+        # Al inicio del turno lo que quedó del turno anterior ya no importa
+        turn = None
+    return (
+        tuple(sorted(state.ai_hand)),
+        tuple(sorted(state.discard_pile)),
+        player_numbers,
+        len(state.player_hand) - player_numbers,
+        state.probability,
+        turn,
+    )
+
+
+def ai_actions(state):
+    """Acciones de la IA en un punto de decisión, sin duplicados por valor o tipo."""
+    if state.decision_pending:
+        skills = sorted({CODE_EFFECTS[code] for code in state.ai_hand if is_skill_code(code)})
+        return [ROULETTE] + [("skill", effect) for effect in skills]
+    return [("card", value) for value in sorted({code for code in state.ai_hand
+                                                 if not is_skill_code(code)})]
+
+
+class ISMCTSPlayer(Policy):
+    """Política de la IA basada en IS-MCTS con presupuesto de tiempo por jugada."""
+
+    def __init__(self, time_budget=1.0, max_iterations=None, exploration=0.7, workers=1,
+                 opponent_policy=None, seed=None, max_nodes=200000):
+        """
+        Args:
+            time_budget: Segundos de reloj por decisión
+            max_iterations: Límite opcional de iteraciones por decisión
+            exploration: Constante de exploración de UCB1
+            workers: Procesos que buscan en paralelo (1 = solo este proceso)
+            opponent_policy: Modelo del jugador humano (por defecto `RandomPolicy`)
+            seed: Semilla del generador de la búsqueda
+            max_nodes: Nodos máximos que se conservan entre jugadas
+        """
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.exploration = exploration
+        self.workers = workers
+        self.opponent_policy = opponent_policy or RandomPolicy()
+        self.rollout_policy = RandomPolicy()
+        self.rng = random.Random(seed)
+        self.max_nodes = max_nodes
+        self.nodes = {}
+        self.last_search = {}
+        self._scratch = Game(rng=self.rng)
+        self._executor = None
+        self._discard_size = 0
+        if workers > 1:
+            self._start_workers()
+
+    def _start_workers(self):
+        """Arranca el pool y espera a que todos sus procesos estén listos."""
+        self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+        # Una tarea por proceso: con "spawn" cada uno tarda en importar el juego,
+        # y ese arranque no debe salir del presupuesto de la primera jugada
+        warmups = [self._executor.submit(_worker_ready, 0.05) for _ in range(self.workers - 1)]
+        for future in warmups:
+            future.result()
+
+    def choose_card(self, game, player):
+        state = game.snapshot()
+        actions = ai_actions(state)
+        if len(actions) <= 1:
+            return self._card_index(player, actions[0]) if actions else None
+        return self._card_index(player, self.search(state))
+
+    def decide_after_losing(self, game, player):
+        if game.skill_used_this_turn or game.current_loser is not player:
+            return {"choice": "roulette"}
+        state = game.snapshot()
+        actions = ai_actions(state)
+        action = self.search(state) if len(actions) > 1 else ROULETTE
+        if action == ROULETTE:
+            return {"choice": "roulette"}
+        index = next(i for i, card in enumerate(player.hand)
+                     if card.type == "skill" and card.effect_type == action[1])
+        return {"choice": "skill", "card_index": index}
+
+    @staticmethod
+    def _card_index(player, action):
+        return next(i for i, card in enumerate(player.hand)
+                    if card.type == "number" and card.value == action[1])
+
+    def search(self, state):
+        """
+        Busca la mejor acción de la IA en la posición `state` durante `time_budget`.
+
+        Returns:
+            tuple: La acción con más visitas (ver `ai_actions`), o una al azar si
+                no dio tiempo a ninguna iteración
+        """
+        self._prune(state)
+        deadline = time.perf_counter() + self.time_budget
+        futures = []
+        if self.workers > 1:
+            if self._executor is None:
+                self._start_workers()
+            # Los procesos no comparten `perf_counter`: se les pasa el plazo en hora
+            # del sistema, adelantado lo justo para que el resultado llegue a tiempo
+            margin = min(MAX_RESULT_MARGIN, self.time_budget * RESULT_MARGIN)
+            wall_deadline = time.time() + self.time_budget - margin
+            for _ in range(self.workers - 1):
+                args = (state, wall_deadline, self.max_iterations, self.exploration,
+                        self.opponent_policy, self.rng.getrandbits(64))
+                futures.append(self._executor.submit(_worker_search, args))
+
+        root = self._run(state, deadline)
+        stats = {action: list(values) for action, values in root.stats.items()}
+        for future in futures:
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except FutureTimeout:
+                # El proceso no terminó a tiempo: se descarta su búsqueda
+                future.cancel()
+                continue
+            for action, (visits, wins) in result.items():
+                total = stats.setdefault(action, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+
+        self.last_search = {
+            action: {"visits": visits, "win_rate": wins / visits if visits else 0.0}
+            for action, (visits, wins) in stats.items()
+        }
+        if not stats:
+            # Sin iteraciones (presupuesto 0 o plazo ya vencido): acción legal al azar
+            action = self.rng.choice(ai_actions(state))
+            self.last_search = {action: {"visits": 0, "win_rate": 0.0}}
+            return action
+        return max(stats, key=lambda a: (stats[a][0], stats[a][1]))
+
+    def _run(self, state, deadline):
+        """Itera IS-MCTS desde `state` hasta el plazo y devuelve el nodo raíz."""
+        root_key = info_key(state)
+        root = self.nodes.get(root_key)
+        if root is None:
+            root = self.nodes[root_key] = _Node()
+
+        iterations = 0
+        while time.perf_counter() < deadline:
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            self._iterate(state, root)
+            iterations += 1
+        return root
+
+    def _iterate(self, state, root):
+        game = self._scratch
+        determinize(state, PLAYER, self.rng).restore(game)
+
+        path = []
+        node = root
+        current = state
+        while True:
+            action, untried = self._select(node, ai_actions(current))
+            path.append((node, action))
+            self._apply(game, action)
+            if game.is_game_over():
+                break
+            current = game.snapshot()
+            key = info_key(current)
+            child = self.nodes.get(key)
+            if child is None:
+                child = self.nodes[key] = _Node()
+            if untried:
+                self._rollout(game)
+                break
+            node = child
+
+        reward = 1.0 if game.winner is game.ai_player else 0.0
+        for node, action in path:
+            node.visits += 1
+            stats = node.stats[action]
+            stats[0] += 1
+            stats[1] += reward
+
+    def _select(self, node, actions):
+        """UCB1 sobre las acciones de la IA; primero las no exploradas."""
+        stats = node.stats
+        untried = [action for action in actions if action not in stats]
+        if untried:
+            action = self.rng.choice(untried)
+            stats[action] = [0, 0.0]
+            return action, True
+
+        log_visits = math.log(node.visits or 1)
+        best, best_score = None, -1.0
+        for action in actions:
+            visits, wins = stats[action]
+            score = wins / visits + self.exploration * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best, best_score = action, score
+        return best, False
+
+    def _apply(self, game, action):
+        """Aplica una acción de la IA y avanza hasta su siguiente decisión."""
+        ai = game.ai_player
+        if action[0] == "card":
+            ai_index = self._card_index(ai, action)
+            player_index = self.opponent_policy.choose_card(game, game.player)
+            game.play_turn(player_index, ai_index)
+        elif action[0] == "skill":
+            index = next(i for i, card in enumerate(ai.hand)
+                         if card.type == "skill" and card.effect_type == action[1])
+            ai.use_skill_card(index, game, game.player)
+        else:
+            game.use_roulette(ai)
+        self._advance(game)
+
+    def _advance(self, game):
+        """Resuelve el azar y las decisiones del humano hasta que le toque a la IA."""
+        player = game.player
+        while not game.is_game_over() and game.decision_pending:
+            loser = game.current_loser
+            if game.skill_used_this_turn:
+                # Tras una habilidad que traslada la derrota solo queda la ruleta
+                game.use_roulette(loser)
+            elif loser is player:
+                self._resolve(game, player, self.opponent_policy.decide_after_losing(game, player))
+            else:
+                return
+
+    @staticmethod
+    def _resolve(game, player, decision):
+        opponent = game.ai_player if player is game.player else game.player
+        if decision["choice"] != "skill" or not player.use_skill_card(
+                decision["card_index"], game, opponent):
+            game.use_roulette(player)
+
+    def _rollout(self, game):
+        """Termina la partida con jugadas aleatorias para ambos."""
+        policy = self.rollout_policy
+        player, ai = game.player, game.ai_player
+        while not game.is_game_over():
+            if game.decision_pending:
+                self._resolve(game, ai, policy.decide_after_losing(game, ai))
+                self._advance(game)
+            else:
+                game.play_turn(self.opponent_policy.choose_card(game, player),
+                               policy.choose_card(game, ai))
+                self._advance(game)
+
+    def _prune(self, state):
+        """Descarta los nodos de turnos anteriores (o de otra partida) para reutilizar el resto."""
+        discard_size = len(state.discard_pile)
+        if discard_size < self._discard_size:
+            # Partida nueva
+            self.nodes.clear()
+        elif len(self.nodes) > self.max_nodes // 2:
+            self.nodes = {key: node for key, node in self.nodes.items()
+                          if len(key[1]) >= discard_size}
+            if len(self.nodes) > self.max_nodes:
+                self.nodes.clear()
+        self._discard_size = discard_size
+
+    def close(self):
+        """Detiene los procesos trabajadores, si los hay."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def _worker_ready(delay):
+    """Tarea de arranque del pool: mantiene ocupado el proceso para que se cree otro."""
+    time.sleep(delay)
+    return True
+
+
+def _worker_search(args):
+    """Búsqueda independiente en un proceso trabajador; devuelve las estadísticas de la raíz."""
+    state, wall_deadline, max_iterations, exploration, opponent_policy, seed = args
+    remaining = wall_deadline - time.time()
+    player = ISMCTSPlayer(time_budget=max(0.0, remaining), max_iterations=max_iterations,
+                          exploration=exploration, opponent_policy=opponent_policy, seed=seed)
+    root = player._run(state, time.perf_counter() + remaining)
+    return root.stats
@@ -0,0 +1,172 @@
+"""
+Prompts y memoria de conversación de los jugadores LLM.
+
+- `ConversationMemory` guarda el prompt de sistema una sola vez y los
+  últimos turnos en un anillo de tamaño fijo; lo que sale del anillo se
+  resume en unas pocas líneas, así que la memoria no crece con la partida.
+- `encode_state` codifica el estado del juego en pocas líneas y, si supera
+  el presupuesto de tokens, pasa a formatos cada vez más cortos.
+- `system_prompt` junta las reglas, la leyenda de habilidades y el formato de
+  respuesta: todo lo que no cambia entre peticiones va en el prompt de
+  sistema, que se construye una vez por jugador.
+"""
+import re
+import textwrap
+from collections import deque
+
+from game.card import SKILL_DEFINITIONS
+
+SKILL_LEGEND = "Habilidades: " + "; ".join(
+    f"{skill['name']} = {skill['desc'].lower()}" for skill in SKILL_DEFINITIONS)
+
+RESPONSE_FORMAT = (
+    "Formato del estado: \"N índice:valor\" son tus cartas numéricas y \"H índice:nombre\" "
+    "tus habilidades.\n"
+    "Responde únicamente con un objeto JSON con estas claves, en este orden:\n"
+    '{"card_to_play": índice_de_carta_numérica, "if_lose_choice": "skill" o "roulette", '
+    '"skill_card_index": índice_de_habilidad o null, "reasoning": "explicación breve"}'
+)
+
+DECISION_REQUEST = "Elige carta y qué hacer si pierdes. Solo JSON."
+
+_CHOICE_PATTERN = re.compile(r'"if_lose_choice"\s*:\s*"(\w+)"')
+
+
+def system_prompt(rules):
+    """Prompt de sistema completo a partir del texto de reglas de un jugador."""
+    return "\n".join([textwrap.dedent(rules).strip(), SKILL_LEGEND, RESPONSE_FORMAT])
+
+
+def estimate_tokens(text):
+    """Estimación barata de tokens (unos cuatro caracteres por token)."""
+    return (len(text) + 3) // 4
+
+
+def encode_state(game_state, token_budget=None):
+    """
+    Codifica el estado del juego de forma compacta.
+
+    Prueba formatos de más a menos detallado y devuelve el primero que cabe en
+    `token_budget`; el último (solo índices y valores) se devuelve siempre.
+
+    Args:
+        game_state: Diccionario con el estado en el formato de `make_decision`
+        token_budget: Tokens máximos del estado (None = sin límite)
+
+    Returns:
+        str: Estado codificado
+    """
+    hand = game_state["hand"]
+    numbers = [f"{i}:{card.value}" for i, card in enumerate(hand) if card.type == "number"]
+    skills = [(i, card) for i, card in enumerate(hand) if card.type == "skill"]
+    opponent = game_state.get("opponent_last_card")
+    probability = game_state.get("roulette_probability", 1)
+    turn = game_state.get("turn_count", 0)
+    skill_used = "sí" if game_state.get("skill_used") else "no"
+
+    hand_line = "N " + (" ".join(numbers) or "-")
+    formats = [
+        # Nombres de las habilidades y estado completo
+        "\n".join([
+            f"{hand_line} | H " + (" ".join(f"{i}:{card.name}" for i, card in skills) or "-"),
+            f"Rival jugó: {opponent if opponent is not None else '-'} | Ruleta: {probability}% "
+            f"| Turno: {turn} | Habilidad usada: {skill_used}",
+        ]),
+        # Habilidades por su inicial y solo lo que cambia la decisión
+        f"{hand_line} | H " + (" ".join(f"{i}:{card.name[0]}" for i, card in skills) or "-")
+        + f" | R {probability}%",
+    ]
+    if token_budget is not None:
+        for encoded in formats[:-1]:
+            if estimate_tokens(encoded) <= token_budget:
+                return encoded
+    return formats[0] if token_budget is None else formats[-1]
+
+
+def summarize_turns(summary, entry):
+    """
+    Resumidor local por defecto: acumula cuántos estados y respuestas han salido
+    de la memoria y qué eligió el modelo tras perder.
+
+    Args:
+        summary: Resumen anterior (dict) o None
+        entry: Mensaje que sale de la memoria ({"role", "content"})
+
+    Returns:
+        dict: Resumen actualizado (de tamaño fijo)
+    """
+    summary = dict(summary or {"estados": 0, "respuestas": 0, "ruleta": 0, "habilidad": 0})
+    if entry["role"] == "user":
+        summary["estados"] += 1
+    else:
+        summary["respuestas"] += 1
+        match = _CHOICE_PATTERN.search(entry["content"])
+        if match and match.group(1) == "roulette":
+            summary["ruleta"] += 1
+        elif match and match.group(1) == "skill":
+            summary["habilidad"] += 1
+    return summary
+
+
+class ConversationMemory:
+    """
+    Memoria acotada de un jugador LLM.
+
+    Se comporta como la lista de mensajes anterior (`len`, índices e
+    iteración): el primer mensaje es el prompt de sistema, le sigue el resumen
+    de los turnos antiguos, si lo hay, y después los turnos recientes.
+    """
+
+    def __init__(self, max_turns=8, summarizer=summarize_turns):
+        """
+        Args:
+            max_turns: Mensajes recientes que se conservan completos
+            summarizer: Función `(resumen, mensaje) -> resumen` para los mensajes que
+                salen del anillo (None = se descartan sin resumir)
+        """
+        self.system = None
+        self.turns = deque(maxlen=max_turns)
+        self.summarizer = summarizer
+        self.summary = None
+
+    def set_system(self, content):
+        """Fija el prompt de sistema (se guarda una sola vez, fuera del anillo)."""
+        self.system = {"role": "system", "content": content}
+
+    def append(self, message):
+        """Añade un mensaje; si el anillo está lleno, el más antiguo pasa al resumen."""
+        if message["role"] == "system":
+            self.set_system(message["content"])
+            return
+        if len(self.turns) == self.turns.maxlen and self.summarizer is not None:
+            self.summary = self.summarizer(self.summary, self.turns[0])
+        self.turns.append(message)
+
+    def summary_text(self):
+        """Resumen de los turnos antiguos en una línea, o None."""
+        if not self.summary:
+            return None
+        return "Turnos anteriores: " + ", ".join(f"{key} {value}" for key, value in self.summary.items())
+
+    def messages(self):
+        """Mensajes en orden: sistema, resumen y turnos recientes."""
+        messages = [self.system] if self.system is not None else []
+        summary = self.summary_text()
+        if summary is not None:
+            messages.append({"role": "user", "content": summary})
+        messages.extend(self.turns)
+        return messages
+
+    def clear(self):
+        """Olvida los turnos y el resumen (el prompt de sistema se conserva)."""
+        self.turns.clear()
+        self.summary = None
+
+    def __len__(self):
+        return len(self.messages())
+
+    def __getitem__(self, index):
+        return self.messages()[index]
+
+    def __iter__(self):
+        return iter(self.messages())
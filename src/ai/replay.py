@@ -0,0 +1,192 @@
+"""
+Grabaciones y fallos simulados para el servidor de pruebas (ai/stub_server.py).
+
+- `Cassette` guarda respuestas reales de Gemini u Ollama indexadas por
+  petición (`request_key`) y las devuelve después sin red. Si una misma
+  petición se grabó varias veces, las respuestas se reproducen por turnos.
+  La clave de la API viaja en la URL y nunca forma parte de la clave ni del
+  fichero.
+- `FaultInjector` añade a cada respuesta una latencia sacada de una
+  distribución (`parse_latency`) y, con las probabilidades indicadas, la
+  convierte en un error HTTP o en un timeout (el servidor no contesta).
+
+Con las dos cosas se puede medir toda la cadena de la IA (cliente HTTP,
+streaming, timeouts adaptativos, cortacircuitos y plazo de decisión) en una
+máquina sin conexión.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+
+CASSETTE_VERSION = 1
+
+# Campos de la petición que no cambian la respuesta
+_VOLATILE_FIELDS = ("stream",)
+
+
+def request_key(path, payload):
+    """
+    Clave de una petición: ruta sin parámetros y cuerpo JSON canónico.
+
+    Las variantes con y sin streaming de una petición comparten clave (la
+    respuesta grabada se sirve en el formato que se pida), y la consulta de
+    la URL (donde Gemini lleva la clave de la API) se ignora.
+    """
+    path = path.split("?", 1)[0].replace(":streamGenerateContent", ":generateContent")
+    body = {key: value for key, value in payload.items() if key not in _VOLATILE_FIELDS}
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{path}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Respuestas grabadas por petición, con persistencia en un fichero JSON."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Fichero de la grabación (None = solo en memoria)
+        """
+        self.path = path
+        self.interactions = {}  # clave -> [{"status", "text"}, ...]
+        self.hits = 0
+        self.misses = 0
+        self._turns = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def record(self, key, status, text):
+        """Añade una respuesta (el texto completo generado por el modelo) para `key`."""
+        with self._lock:
+            self.interactions.setdefault(key, []).append({"status": status, "text": text})
+
+    def lookup(self, key):
+        """
+        Siguiente respuesta grabada para `key`, o None.
+
+        Returns:
+            dict: {"status", "text"} de la respuesta
+        """
+        with self._lock:
+            responses = self.interactions.get(key)
+            if not responses:
+                self.misses += 1
+                return None
+            turn = self._turns.get(key, 0)
+            self._turns[key] = turn + 1
+            self.hits += 1
+            return responses[turn % len(responses)]
+
+    def load(self):
+        """Carga las respuestas de `path`."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"No se pudo cargar la grabación {self.path}: {e}")
+            return
+        if data.get("version") != CASSETTE_VERSION:
+            logging.warning(f"Versión de grabación no compatible en {self.path}")
+            return
+        with self._lock:
+            self.interactions = data.get("interactions", {})
+            self._turns.clear()
+        logging.info(f"Grabación cargada: {len(self)} peticiones")
+
+    def save(self):
+        """Escribe las respuestas en `path` (sin efecto si no tiene fichero)."""
+        if self.path is None:
+            return
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": dict(self.interactions)}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Escritura atómica: un cierre a medias no deja el fichero corrupto
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(temporary, self.path)
+
+    def __len__(self):
+        return len(self.interactions)
+
+
+def parse_latency(spec):
+    """
+    Distribución de latencia a partir de un texto.
+
+    Formatos (segundos):
+        "0.2" o "fixed:0.2"       siempre el mismo valor
+        "uniform:0.1,0.5"         uniforme entre dos valores
+        "normal:0.3,0.1"          normal (media, desviación), sin negativos
+        "lognormal:0.3,0.5"       lognormal (mediana, sigma), con cola larga
+        "exp:0.3"                 exponencial con esa media
+
+    Returns:
+        callable: Función `(rng) -> segundos`, o None si `spec` está vacío
+    """
+    if not spec:
+        return None
+    kind, _, params = spec.partition(":")
+    if not params:
+        kind, params = "fixed", kind
+    try:
+        values = [float(value) for value in params.split(",")]
+    except ValueError:
+        raise ValueError(f"Latencia no válida: {spec!r}")
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(*values)
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(*values))
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda rng: median * rng.lognormvariate(0.0, sigma)
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Latencia no válida: {spec!r}")
+
+
+class FaultInjector:
+    """Latencia, errores y timeouts simulados para cada petición."""
+
+    def __init__(self, latency=None, error_rate=0.0, error_status=503, timeout_rate=0.0, seed=None):
+        """
+        Args:
+            latency: Distribución de latencia (texto de `parse_latency`) o None
+            error_rate: Probabilidad de responder con `error_status`
+            error_status: Código HTTP de los errores simulados
+            timeout_rate: Probabilidad de no responder (el cliente agota su timeout)
+            seed: Semilla para repetir la misma secuencia de fallos
+        """
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        self.counts = {"latency": 0.0, "errors": 0, "timeouts": 0}
+        self._lock = threading.Lock()
+
+    def next_fault(self):
+        """
+        Sortea el destino de una petición.
+
+        Returns:
+            tuple: (segundos de espera, "ok", "error" o "timeout")
+        """
+        with self._lock:
+            delay = self.latency(self.rng) if self.latency is not None else 0.0
+            roll = self.rng.random()
+            if roll < self.timeout_rate:
+                outcome = "timeout"
+                self.counts["timeouts"] += 1
+            elif roll < self.timeout_rate + self.error_rate:
+                outcome = "error"
+                self.counts["errors"] += 1
+            else:
+                outcome = "ok"
+            self.counts["latency"] += delay
+        return delay, outcome
@@ -0,0 +1,155 @@
+"""
+Lectura incremental de respuestas en streaming de Gemini y Ollama.
+
+El modelo contesta con un objeto JSON (ver el prompt de `make_decision`).
+`JsonObjectScanner` recibe el texto a trozos, a medida que llega, y da la
+decisión por terminada en cuanto:
+    - se cierra el primer objeto JSON válido de la respuesta, o
+    - dentro del objeto ya están completos los campos de la decisión
+      (`decision_ready`), aunque falten otros como "reasoning".
+Así se puede cortar la conexión sin esperar al resto de la generación. Si la
+respuesta termina con el objeto sin cerrar pero con la decisión completa
+(el modelo paró antes de la llave final), `finish` lo cierra.
+
+El analizador distingue las llaves y comas que van dentro de cadenas (con
+sus escapes), por lo que el texto libre de "reasoning" no lo confunde.
+"""
+import json
+
+
+def decision_ready(decision):
+    """Indica si un objeto parcial ya contiene todo lo necesario para jugar."""
+    if "card_to_play" not in decision or "if_lose_choice" not in decision:
+        return False
+    return decision["if_lose_choice"] != "skill" or "skill_card_index" in decision
+
+
+class JsonObjectScanner:
+    """Busca de forma incremental el objeto JSON de la decisión en un texto que llega a trozos."""
+
+    def __init__(self, ready=decision_ready):
+        """
+        Args:
+            ready: Función que decide si un objeto parcial ya basta (None = esperar al cierre)
+        """
+        self.ready = ready
+        self.text = ""
+        self.result = None  # Texto JSON de la decisión cuando se encuentra
+        self._pos = 0
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """
+        Añade un trozo de texto.
+
+        Returns:
+            str: El texto JSON de la decisión si ya está completa, o None
+        """
+        if self.result is not None:
+            return self.result
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._depth == 0:
+                # Fuera de un objeto solo importa dónde empieza el siguiente
+                if char == "{":
+                    self._start, self._depth = i, 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{" or char == "[":
+                self._depth += 1
+            elif char == "}" or char == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._accept(text[self._start:i + 1], complete=True):
+                        self._pos = i + 1
+                        return self.result
+                    # Llaves de texto libre que no forman un JSON válido
+                    self._start = None
+            elif char == "," and self._depth == 1 and self.ready is not None:
+                if self._accept(text[self._start:i] + "}", complete=False):
+                    self._pos = i + 1
+                    return self.result
+        self._pos = len(text)
+        return None
+
+    def finish(self):
+        """
+        Da por terminado el texto recibido.
+
+        Si quedó abierto un objeto de primer nivel (fuera de cualquier cadena) que
+        ya contiene la decisión, se cierra y se acepta.
+
+        Returns:
+            str: El texto JSON de la decisión, o None
+        """
+        if (self.result is None and self._depth == 1 and not self._in_string
+                and self.ready is not None):
+            tail = self.text[self._start:].rstrip().rstrip(",")
+            self._accept(tail + "}", complete=False)
+        return self.result
+
+    def _accept(self, candidate, complete):
+        try:
+            decision = json.loads(candidate)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(decision, dict) or not (complete or self.ready(decision)):
+            return False
+        self.result = candidate
+        return True
+
+
+def gemini_stream_text(response):
+    """Trozos de texto de una respuesta `streamGenerateContent?alt=sse` de Gemini."""
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        chunk = json.loads(line[5:])
+        for candidate in chunk.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                yield part.get("text", "")
+
+
+def ollama_stream_text(response):
+    """Trozos de texto de una respuesta de `/api/chat` de Ollama con `"stream": true`."""
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            continue
+        chunk = json.loads(line)
+        yield chunk.get("message", {}).get("content", "")
+        if chunk.get("done"):
+            return
+
+
+def read_decision(chunks, scanner=None):
+    """
+    Consume trozos de texto hasta tener la decisión completa.
+
+    Args:
+        chunks: Iterable de trozos de texto (se deja de leer al encontrar la decisión)
+        scanner: `JsonObjectScanner` a usar (por defecto uno nuevo)
+
+    Returns:
+        tuple: (texto, terminado_antes) con el JSON de la decisión si se encontró o, si
+            no, todo el texto recibido; `terminado_antes` indica si se cortó la lectura
+    """
+    scanner = scanner or JsonObjectScanner()
+    for chunk in chunks:
+        if scanner.feed(chunk) is not None:
+            return scanner.result, True
+    return scanner.finish() or scanner.text, False
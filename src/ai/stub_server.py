@@ -0,0 +1,609 @@
+"""
+Servidor HTTP local que imita las API de Gemini y Ollama.
+
+Sirve para probar y medir los jugadores LLM sin red ni claves: responde a
+`POST .../models/<modelo>:generateContent` (y `:streamGenerateContent?alt=sse`)
+con la forma de Gemini y a `POST /api/chat` (con `"stream"` a true o false)
+con la de Ollama. La respuesta es siempre una decisión válida: la primera
+carta numérica que aparece en el prompt y la ruleta, seguida de un
+"reasoning" largo como el que suelen generar los modelos.
+
+`token_delay` simula la velocidad de generación: cada trozo de unos cuatro
+caracteres tarda ese tiempo, tanto en streaming como sin él.
+
+Habla HTTP/1.1, así que mantiene abiertas las conexiones entre peticiones
+igual que los servidores reales. `handshake_delay` añade una espera a cada
+conexión nueva para simular el coste del establecimiento TCP y TLS.
+
+Además de la respuesta sintética puede servir respuestas reales grabadas
+(`cassette`) y grabarlas haciendo de intermediario con el servidor real
+(`upstream`), y simular latencia, errores y timeouts (`faults`), ver
+ai/replay.py.
+
+Uso como prueba de rendimiento del cliente HTTP:
+    python -m ai.stub_server --requests 50 --handshake-delay 0.02
+de la lectura en streaming de los jugadores:
+    python -m ai.stub_server --streaming --requests 10 --token-delay 0.01
+grabación de tráfico real (los jugadores apuntan a la URL que se muestra):
+    python -m ai.stub_server --serve --record grabacion.json \
+        --upstream https://generativelanguage.googleapis.com --gemini-model gemini-pro
+y prueba de carga de toda la cadena de la IA sin red, con fallos simulados:
+    python -m ai.stub_server --load 20 --concurrency 4 --replay grabacion.json \
+        --latency lognormal:0.4,0.6 --error-rate 0.05 --timeout-rate 0.02 --seed 1 \
+        --report informe.json --baseline informe_anterior.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import re
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+
+from ai.replay import Cassette, FaultInjector, request_key
+
+# Primera carta numérica en el formato compacto ("N 0:7 1:3 ...") o en el antiguo
+CARD_PATTERN = re.compile(r"^N (\d+):|(\d+): Carta Numérica", re.MULTILINE)
+STUB_REASONING = (
+    "Respuesta del servidor de pruebas. Juego la primera carta numérica de la mano "
+    "porque no conozco la carta del rival; si pierdo el turno prefiero girar la ruleta "
+    "mientras la probabilidad siga siendo baja y guardar las habilidades para más adelante, "
+    "cuando el riesgo de la ruleta sea mayor y una habilidad valga más."
+)
+CHUNK_SIZE = 4  # Caracteres por trozo (aproximadamente un token)
+
+
+def stub_decision(prompt):
+    """Decisión fija y válida para el prompt: la primera carta numérica listada."""
+    match = CARD_PATTERN.search(prompt)
+    return {
+        "card_to_play": int(match.group(1) or match.group(2)) if match else 0,
+        "if_lose_choice": "roulette",
+        "skill_card_index": None,
+        "reasoning": STUB_REASONING,
+    }
+
+
+def _chunks(text):
+    return [text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo van en escrituras separadas: sin esto, Nagle y el ACK
+    # retardado añaden ~40 ms a cada respuesta por una conexión reutilizada
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.on_connection()
+
+    def do_HEAD(self):
+        self._send(200, b"")
+
+    def do_GET(self):
+        self._send(200, b"{}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, b'{"error": "JSON inv\\u00e1lido"}')
+            return
+        self.server.requests_served += 1
+
+        path = self.path.split("?", 1)[0]
+        if path.endswith(":generateContent") or path.endswith(":streamGenerateContent"):
+            prompt = " ".join(part.get("text", "") for message in payload.get("contents", [])
+                              for part in message.get("parts", []))
+        elif path == "/api/chat":
+            prompt = " ".join(message.get("content", "") for message in payload.get("messages", []))
+        else:
+            self._send(404, b'{"error": "ruta desconocida"}')
+            return
+
+        if self.server.faults is not None:
+            delay, outcome = self.server.faults.next_fault()
+            if delay:
+                self.server.wait(delay)
+            if outcome == "timeout":
+                # No se contesta: el cliente agota su timeout
+                self.server.wait(self.server.hang_time)
+                self.close_connection = True
+                return
+            if outcome == "error":
+                self._send(self.server.faults.error_status, b'{"error": "fallo simulado"}')
+                return
+
+        status, text = self._answer(path, payload, prompt)
+        if status != 200:
+            self._send(status, text.encode("utf-8"))
+            return
+        self._reply(path, payload, text)
+
+    def _answer(self, path, payload, prompt):
+        """
+        Texto que genera el modelo para la petición.
+
+        Returns:
+            tuple: (código HTTP, texto de la respuesta o cuerpo del error)
+        """
+        server = self.server
+        if server.upstream is not None:
+            return self._forward(path, payload)
+        if server.cassette is not None:
+            recorded = server.cassette.lookup(request_key(path, payload))
+            if recorded is not None:
+                return recorded["status"], recorded["text"]
+            if server.strict:
+                return 404, json.dumps({"error": "petición sin grabar"})
+        return 200, json.dumps(stub_decision(prompt), ensure_ascii=False)
+
+    def _forward(self, path, payload):
+        """Reenvía la petición (sin streaming) al servidor real y graba la respuesta."""
+        server = self.server
+        gemini = path != "/api/chat"
+        if gemini:
+            query = [(name, value) for name, value in parse_qsl(self.path.partition("?")[2])
+                     if name != "alt"]
+            url = (server.upstream + path.replace(":streamGenerateContent", ":generateContent")
+                   + ("?" + urlencode(query) if query else ""))
+            upstream_payload = payload
+        else:
+            url = server.upstream + path
+            upstream_payload = dict(payload, stream=False)
+        response = server.session.post(url, json=upstream_payload, timeout=server.upstream_timeout)
+        if response.status_code != 200:
+            return response.status_code, response.text
+        data = response.json()
+        if gemini:
+            parts = data.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+            text = "".join(part.get("text", "") for part in parts)
+        else:
+            text = data.get("message", {}).get("content", "")
+        server.cassette.record(request_key(path, payload), 200, text)
+        server.cassette.save()
+        return 200, text
+
+    def _reply(self, path, payload, text):
+        """Envía `text` con la forma de Gemini u Ollama, en streaming si se pidió."""
+        chunks = _chunks(text)
+        if path != "/api/chat":
+            if path.endswith(":streamGenerateContent"):
+                self._stream("text/event-stream", (
+                    "data: " + json.dumps({"candidates": [{"content": {
+                        "role": "model", "parts": [{"text": chunk}]}}]}) + "\r\n\r\n"
+                    for chunk in chunks))
+                return
+            self._generate(chunks)
+            body = {"candidates": [{"content": {"role": "model", "parts": [{"text": "".join(chunks)}]}}]}
+        else:
+            model = payload.get("model")
+            if payload.get("stream", True):
+                lines = (json.dumps({"model": model, "message": {"role": "assistant", "content": chunk},
+                                     "done": False}) + "\n" for chunk in chunks)
+                done = json.dumps({"model": model, "message": {"role": "assistant", "content": ""},
+                                   "done": True}) + "\n"
+                self._stream("application/x-ndjson", itertools.chain(lines, [done]))
+                return
+            self._generate(chunks)
+            body = {"model": model, "message": {"role": "assistant", "content": "".join(chunks)},
+                    "done": True}
+        self._send(200, json.dumps(body).encode("utf-8"))
+
+    def _generate(self, chunks):
+        """Simula el tiempo de generación de una respuesta completa."""
+        if self.server.token_delay:
+            self.server.wait(self.server.token_delay * len(chunks))
+
+    def _stream(self, content_type, events):
+        """Envía `events` con codificación por trozos, uno cada `token_delay` segundos."""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in events:
+                if self.server.token_delay:
+                    self.server.wait(self.server.token_delay)
+                data = event.encode("utf-8")
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente cortó la respuesta: se deja de generar, como los servidores reales
+            self.server.aborted_streams += 1
+            self.close_connection = True
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug("stub_server: " + format, *args)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Servidor de pruebas en un hilo propio."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, handshake_delay=0.0, token_delay=0.0, cassette=None,
+                 strict=False, upstream=None, upstream_timeout=60.0, faults=None, hang_time=30.0,
+                 gemini_model="stub"):
+        """
+        Args:
+            host: Dirección de escucha
+            port: Puerto (0 = uno libre cualquiera)
+            handshake_delay: Segundos de espera en cada conexión nueva
+            token_delay: Segundos que tarda en generarse cada trozo de la respuesta
+            cassette: `Cassette` con respuestas grabadas que se reproducen
+            strict: Con `cassette`, responder 404 a una petición sin grabar en lugar
+                de con la decisión sintética
+            upstream: URL base del servidor real; si se indica, cada petición se le
+                reenvía y su respuesta se graba en `cassette`
+            upstream_timeout: Timeout de las peticiones al servidor real
+            faults: `FaultInjector` con la latencia, los errores y los timeouts simulados
+            hang_time: Segundos que se retiene una petición con timeout simulado
+            gemini_model: Modelo de la ruta de Gemini (`gemini_url`)
+        """
+        super().__init__((host, port), _StubHandler)
+        self.handshake_delay = handshake_delay
+        self.token_delay = token_delay
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.cassette = cassette if cassette is not None or upstream is None else Cassette()
+        self.strict = strict
+        self.upstream_timeout = upstream_timeout
+        self.faults = faults
+        self.hang_time = hang_time
+        self.gemini_model = gemini_model
+        self.session = None
+        if self.upstream is not None:
+            from ai.http_client import build_session
+            self.session = build_session(retries=0)
+        self._stopping = threading.Event()
+        self.connections = 0
+        self.requests_served = 0
+        self.aborted_streams = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def gemini_url(self):
+        return f"{self.url}/v1beta/models/{self.gemini_model}:generateContent"
+
+    def handle_error(self, request, client_address):
+        # Un cliente que corta una respuesta en streaming cierra la conexión de golpe
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def wait(self, seconds):
+        """Espera `seconds` segundos o hasta que se detenga el servidor."""
+        self._stopping.wait(seconds)
+
+    def on_connection(self):
+        self.connections += 1
+        if self.handshake_delay:
+            time.sleep(self.handshake_delay)
+
+    def start(self):
+        """Atiende peticiones en segundo plano."""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self.shutdown()
+        self.server_close()
+        if self.session is not None:
+            self.session.close()
+
+
+def benchmark(requests_count=50, handshake_delay=0.02):
+    """
+    Compara `requests.post` (conexión nueva por petición) con la sesión compartida.
+
+    Returns:
+        dict: Por modo, latencia media y mediana (ms) y conexiones abiertas
+    """
+    import requests
+    from ai.http_client import build_session
+
+    server = StubServer(handshake_delay=handshake_delay).start()
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "N 0:5"}],
+               "stream": False}
+    url = f"{server.url}/api/chat"
+    session = build_session()
+    modes = {"sin_sesion": requests.post, "sesion_compartida": session.post}
+    results = {}
+    try:
+        for name, post in modes.items():
+            connections = server.connections
+            latencies = []
+            for _ in range(requests_count):
+                start = time.perf_counter()
+                post(url, json=payload, timeout=10).raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+            results[name] = {
+                "media_ms": statistics.mean(latencies),
+                "mediana_ms": statistics.median(latencies),
+                "conexiones": server.connections - connections,
+            }
+    finally:
+        session.close()
+        server.stop()
+    return results
+
+
+def benchmark_streaming(decisions=10, token_delay=0.01):
+    """
+    Compara el tiempo hasta la decisión de los jugadores con y sin streaming.
+
+    Returns:
+        dict: Por jugador y modo, tiempo medio por decisión (ms)
+    """
+    import random
+    from ai.ai_player import AIPlayerWithOllama
+    from ai.gemini_player import AIPlayerWithGemini
+    from ai.http_client import build_session
+    from ai.llm_policy import llm_game_state
+    from game.game_logic import Game
+
+    server = StubServer(token_delay=token_delay).start()
+    game = Game(rng=random.Random(0))
+    game.setup_game()
+    game_state = llm_game_state(game, game.ai_player)
+    players = {
+        "gemini": lambda stream: AIPlayerWithGemini(api_key="stub", base_url=server.gemini_url,
+                                                    session=build_session(), stream=stream),
+        "ollama": lambda stream: AIPlayerWithOllama(base_url=server.url, session=build_session(),
+                                                    stream=stream),
+    }
+    results = {}
+    try:
+        for name, build in players.items():
+            for stream in (False, True):
+                player = build(stream)
+                player.initialize_conversation()
+                start = time.perf_counter()
+                for _ in range(decisions):
+                    player.make_decision(game_state)
+                elapsed = (time.perf_counter() - start) * 1000 / decisions
+                results[f"{name}_{'streaming' if stream else 'completa'}"] = {"media_ms": elapsed}
+    finally:
+        server.stop()
+    return results
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class _TimedPolicy:
+    """Envuelve una política y anota cuánto tarda cada decisión (ms)."""
+
+    def __init__(self, policy, latencies):
+        self.policy = policy
+        self.latencies = latencies
+
+    def choose_card(self, game, player):
+        return self._timed(self.policy.choose_card, game, player)
+
+    def decide_after_losing(self, game, player):
+        return self._timed(self.policy.decide_after_losing, game, player)
+
+    def _timed(self, method, game, player):
+        start = time.perf_counter()
+        try:
+            return method(game, player)
+        finally:
+            self.latencies.append((time.perf_counter() - start) * 1000)
+
+    def close(self):
+        self.policy.close()
+
+
+def load_test(games=10, concurrency=4, backend="ollama", deadline=3.0, stream=True, token_delay=0.0,
+              cassette=None, faults=None, seed=0):
+    """
+    Prueba de carga de toda la cadena de la IA contra el servidor de pruebas.
+
+    Juega `games` partidas (`concurrency` a la vez) en las que la IA es la de
+    main.py con Gemini u Ollama: `DecisionCoordinator(LLMPolicy(jugador))`,
+    con un `BackendHealth` compartido entre todas, y mide el tiempo de cada
+    decisión tal y como lo ve el juego.
+
+    Args:
+        games: Partidas que se juegan
+        concurrency: Partidas simultáneas
+        backend: "gemini" u "ollama"
+        deadline: Plazo del coordinador por decisión (segundos)
+        stream: Jugadores en modo streaming
+        token_delay: Segundos por trozo de respuesta generado
+        cassette: `Cassette` con respuestas grabadas (None = respuesta sintética)
+        faults: `FaultInjector` con los fallos simulados
+        seed: Semilla de las partidas
+
+    Returns:
+        dict: Latencias (ms), origen de las decisiones y contadores del servidor
+    """
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from ai.ai_player import AIPlayerWithOllama
+    from ai.coordinator import DecisionCoordinator
+    from ai.gemini_player import AIPlayerWithGemini
+    from ai.health import BackendHealth
+    from ai.http_client import build_session
+    from ai.llm_policy import LLMPolicy
+    from game.policies import RandomPolicy
+    from game.simulation import play_match
+
+    server = StubServer(token_delay=token_delay, cassette=cassette, faults=faults).start()
+    session = build_session(pool_size=concurrency)
+    health = BackendHealth(backend)
+    latencies = []
+    sources = {"primary": 0, "local": 0, "late": 0, "failed": 0, "busy": 0}
+    sources_lock = threading.Lock()
+
+    def play(index):
+        if backend == "gemini":
+            player = AIPlayerWithGemini(api_key="stub", base_url=server.gemini_url, session=session,
+                                        stream=stream, health=health)
+        else:
+            player = AIPlayerWithOllama(base_url=server.url, session=session, stream=stream, health=health)
+        coordinator = DecisionCoordinator(LLMPolicy(player), deadline=deadline)
+        try:
+            play_match(RandomPolicy(), _TimedPolicy(coordinator, latencies),
+                       rng=random.Random(seed * 104729 + index))
+        finally:
+            coordinator.close()
+        with sources_lock:
+            for key, value in coordinator.stats.items():
+                sources[key] += value
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(play, range(games)))
+    finally:
+        elapsed = time.perf_counter() - start
+        session.close()
+        server.stop()
+
+    decisions = sources["primary"] + sources["local"]
+    return {
+        "partidas": games,
+        "decisiones": decisions,
+        "decisiones_por_s": decisions / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": max(latencies) if latencies else None,
+        "fraccion_local": sources["local"] / decisions if decisions else 0.0,
+        "coordinador": sources,
+        "peticiones": server.requests_served,
+        "fallos_simulados": dict(faults.counts) if faults is not None else {},
+        "grabacion": {"aciertos": cassette.hits, "fallos": cassette.misses} if cassette is not None else {},
+        "servidor_ia": health.stats(),
+    }
+
+
+def compare_reports(report, baseline, tolerance=0.2):
+    """
+    Compara un informe de `load_test` con otro anterior.
+
+    Returns:
+        list: Descripción de cada métrica que empeora más de `tolerance` (vacía si ninguna)
+    """
+    regressions = []
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        old, new = baseline.get(metric), report.get(metric)
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"{metric}: {old:.1f} -> {new:.1f}")
+    old, new = baseline.get("fraccion_local"), report.get("fraccion_local")
+    if old is not None and new is not None and new > old + tolerance:
+        regressions.append(f"fraccion_local: {old:.2f} -> {new:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de pruebas de Gemini/Ollama")
+    parser.add_argument("--serve", action="store_true", help="Solo servir hasta Ctrl+C")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=50, help="Peticiones por modo")
+    parser.add_argument("--handshake-delay", type=float, default=0.02,
+                        help="Segundos simulados de establecimiento por conexión")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Medir los jugadores con y sin streaming")
+    parser.add_argument("--token-delay", type=float, default=0.01,
+                        help="Segundos simulados de generación por trozo de respuesta")
+    parser.add_argument("--record", metavar="FICHERO", help="Grabar las respuestas de --upstream")
+    parser.add_argument("--upstream", help="URL base del servidor real al que se reenvía al grabar")
+    parser.add_argument("--replay", metavar="FICHERO", help="Reproducir respuestas grabadas")
+    parser.add_argument("--strict", action="store_true",
+                        help="Con --replay, responder 404 a las peticiones sin grabar")
+    parser.add_argument("--gemini-model", default="stub", help="Modelo en la ruta de Gemini")
+    parser.add_argument("--latency", help="Latencia simulada, p. ej. 0.2, uniform:0.1,0.5 o "
+                                          "lognormal:0.3,0.5 (ver ai/replay.py)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidad de error HTTP")
+    parser.add_argument("--error-status", type=int, default=503, help="Código de los errores simulados")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="Probabilidad de que una petición no reciba respuesta")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los fallos y de las partidas")
+    parser.add_argument("--load", type=int, metavar="PARTIDAS",
+                        help="Prueba de carga de la IA completa con este número de partidas")
+    parser.add_argument("--concurrency", type=int, default=4, help="Partidas simultáneas con --load")
+    parser.add_argument("--backend", choices=("gemini", "ollama"), default="ollama")
+    parser.add_argument("--deadline", type=float, default=3.0, help="Plazo por decisión con --load")
+    parser.add_argument("--report", metavar="FICHERO", help="Guardar el informe de --load en JSON")
+    parser.add_argument("--baseline", metavar="FICHERO",
+                        help="Informe anterior; termina con error si el nuevo empeora")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Empeoramiento tolerado (fracción)")
+    args = parser.parse_args()
+
+    if args.record and not args.upstream:
+        parser.error("--record necesita --upstream")
+    cassette = Cassette(args.record or args.replay) if args.record or args.replay else None
+    faults = None
+    if args.latency or args.error_rate or args.timeout_rate:
+        faults = FaultInjector(args.latency, args.error_rate, args.error_status, args.timeout_rate,
+                               seed=args.seed)
+
+    if args.serve or args.record:
+        server = StubServer(port=args.port, handshake_delay=args.handshake_delay,
+                            token_delay=args.token_delay, cassette=cassette, strict=args.strict,
+                            upstream=args.upstream, faults=faults, gemini_model=args.gemini_model)
+        print(f"Servidor de pruebas en {server.url} (Gemini: {server.gemini_url})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        return
+
+    if args.load:
+        logging.disable(logging.WARNING)
+        report = load_test(args.load, args.concurrency, args.backend, args.deadline,
+                           token_delay=args.token_delay, cassette=cassette, faults=faults, seed=args.seed)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare_reports(report, json.load(f), args.tolerance)
+            for regression in regressions:
+                print(f"Empeora {regression}")
+            if regressions:
+                sys.exit(1)
+        return
+
+    if args.streaming:
+        logging.disable(logging.INFO)
+        for name, stats in benchmark_streaming(args.requests, args.token_delay).items():
+            print(f"{name}: media {stats['media_ms']:.1f} ms por decisión")
+        return
+
+    for name, stats in benchmark(args.requests, args.handshake_delay).items():
+        print(f"{name}: media {stats['media_ms']:.2f} ms, mediana {stats['mediana_ms']:.2f} ms, "
+              f"conexiones {stats['conexiones']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Motor vectorizado de partidas en lote con NumPy.
+
+Mantiene N partidas simultáneas como arrays (estructura de arrays): las manos
+son vectores de conteo por valor, las habilidades son conteos por tipo y la
+ruleta, los turnos y el estado de vida son vectores de longitud N. Cada paso
+de `Game.play_turn`, `SkillCard.use` y `Roulette.spin` avanza todas las
+partidas con una operación enmascarada.
+
+Reproduce las reglas de `game_logic.py`, `card.py` y `roulette.py` jugando con
+`RandomPolicy` en el asiento del jugador y la lógica integrada de la IA, que
+son las políticas por defecto de `game.simulation`. `compare_engines` comprueba
+la equivalencia estadística entre ambos motores.
+
+Uso:
+    python -m game.batch_engine --games 1000000 --check 20000
+"""
+import argparse
+import math
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from .rng import RngStream
+from .simulation import run_simulation
+
+# Orden de los tipos de habilidad en los vectores de conteo
+SKILL_TYPES = ("increase", "swap", "block", "double")
+INCREASE, SWAP, BLOCK, DOUBLE = range(len(SKILL_TYPES))
+
+# Composición del mazo definida en Game._generate_number_cards/_generate_skill_cards
+NUMBER_VALUES = 10
+COPIES_PER_CARD = 2
+NUMBER_CARDS_PER_HAND = 7
+SKILL_CARDS_PER_HAND = 4
+
+# Asientos / códigos de perdedor del turno
+NOBODY, PLAYER, AI = 0, 1, 2
+
+# |z| a partir del cual `compare_engines` se considera una diferencia real
+Z_THRESHOLD = 4
+
+# Tamaño máximo de los mazos que reparte BatchGames._deal
+_MAX_DECK = NUMBER_VALUES * COPIES_PER_CARD
+
+
+@lru_cache(maxsize=None)
+def _deal_thresholds():
+    """
+    Umbrales de la extracción hipergeométrica indexados por (copias, restantes, pedidas).
+
+    Con g copias de un valor entre T cartas restantes y n cartas por extraer,
+    se obtienen 0 copias si u < P(0) y 2 copias si u >= 1 - P(2).
+    """
+    size = (COPIES_PER_CARD + 1) * (_MAX_DECK + 1) * (_MAX_DECK + 1)
+    none_drawn = np.ones(size)
+    below_two = np.ones(size)
+    for g in range(COPIES_PER_CARD + 1):
+        for total in range(g, _MAX_DECK + 1):
+            for need in range(0, total + 1):
+                key = (g * (_MAX_DECK + 1) + total) * (_MAX_DECK + 1) + need
+                none_drawn[key] = math.comb(total - g, need) / math.comb(total, need)
+                if g == 2:
+                    below_two[key] = 1 - math.comb(total - 2, need - 2) / math.comb(total, need) if need >= 2 else 1
+    return none_drawn.astype(np.float32), below_two.astype(np.float32)
+
+
+class BatchGames:
+    """
+    N partidas simultáneas representadas como arrays de NumPy.
+
+    Los arrays de trabajo solo contienen las partidas activas: al final de cada
+    turno las partidas terminadas vuelcan su resultado en `winner`, `turns` y
+    `alive` (de longitud N) y se compactan fuera. Las manos se guardan con forma
+    (valores, partidas) para que las reducciones por carta recorran memoria contigua.
+    """
+
+    def __init__(self, n_games, rng=None, initial_probability=1, increment=10,
+                 player_skill_threshold=20, ai_skill_threshold=20):
+        """
+        Args:
+            n_games: Número de partidas simultáneas
+            rng: `numpy.random.Generator` o semilla
+            initial_probability: Probabilidad inicial de la ruleta (%)
+            increment: Incremento de la probabilidad por turno decidido (%)
+            player_skill_threshold: Umbral de `RandomPolicy` para el jugador
+            ai_skill_threshold: Umbral de la lógica integrada de la IA
+        """
+        self.n = n_games
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self.initial_probability = initial_probability
+        self.increment = increment
+        self.skill_thresholds = {PLAYER: player_skill_threshold, AI: ai_skill_threshold}
+
+        # Resultados por partida
+        self.winner = np.zeros(n_games, dtype=np.int8)
+        self.turns = np.zeros(n_games, dtype=np.int16)
+        self.alive = {seat: np.ones(n_games, dtype=bool) for seat in (PLAYER, AI)}
+
+        # Estado de las partidas activas
+        self.games = np.arange(n_games, dtype=np.int32)
+        self.hands = {}
+        self.skills = {}
+        self.played = {}
+        # Tamaños de mano mantenidos aparte para no reducir los conteos en cada paso
+        self.hand_sizes = {}
+        self.skill_sizes = {}
+        self.probability = np.full(n_games, initial_probability, dtype=np.int16)
+        self.turn_count = np.zeros(n_games, dtype=np.int8)
+        self.current_loser = np.zeros(n_games, dtype=np.int8)
+        self._finished = np.zeros(n_games, dtype=bool)
+
+    @property
+    def active_count(self):
+        return len(self.games)
+
+    def _deal(self, copies, needed):
+        """
+        Extrae `needed` cartas sin reemplazo de un mazo con `copies[c]` copias por columna.
+
+        Equivale a barajar y tomar las primeras cartas: por cada columna se extrae
+        un conteo hipergeométrico, que con a lo sumo dos copias se obtiene
+        comparando un único uniforme con dos umbrales precalculados.
+        """
+        thresholds = _deal_thresholds()
+        m = copies.shape[1]
+        total = copies.sum(axis=0, dtype=np.int16)
+        need = np.full(m, needed, dtype=np.int16)
+        drawn = np.empty_like(copies)
+        for c in range(copies.shape[0]):
+            g = copies[c]
+            key = (g * (_MAX_DECK + 1) + total) * (_MAX_DECK + 1) + need
+            drawn[c] = count = self._draw_count(thresholds, key, m)
+            need -= count
+            total -= g
+        return drawn
+
+    def _deal_full(self, columns, needed, m):
+        """
+        `_deal` de un mazo completo (`COPIES_PER_CARD` copias de cada una de `columns` columnas).
+
+        Las copias y las cartas restantes de cada columna son las mismas en todas
+        las partidas, así que el umbral solo depende de las cartas que faltan por
+        extraer y se busca en un tramo contiguo de la tabla.
+        """
+        thresholds = _deal_thresholds()
+        stride = _MAX_DECK + 1
+        need = np.full(m, needed, dtype=np.int16)
+        drawn = np.empty((columns, m), dtype=np.int8)
+        for c in range(columns):
+            total = (columns - c) * COPIES_PER_CARD
+            start = (COPIES_PER_CARD * stride + total) * stride
+            tables = [table[start:start + stride] for table in thresholds]
+            drawn[c] = count = self._draw_count(tables, need, m)
+            need -= count
+        return drawn
+
+    def _draw_count(self, thresholds, key, m):
+        """Copias extraídas de una columna: un uniforme comparado con los dos umbrales de `key`."""
+        u = self.rng.random(m, dtype=np.float32)
+        count = (u >= thresholds[0].take(key)).view(np.int8)
+        count += (u >= thresholds[1].take(key)).view(np.int8)
+        return count
+
+    def setup_game(self):
+        """Reparte las manos de todas las partidas (equivale a `Game.setup_game`)."""
+        m = self.active_count
+        self.hands[PLAYER] = self._deal_full(NUMBER_VALUES, NUMBER_CARDS_PER_HAND, m)
+        self.hands[AI] = self._deal(COPIES_PER_CARD - self.hands[PLAYER], NUMBER_CARDS_PER_HAND)
+
+        self.skills[PLAYER] = self._deal_full(len(SKILL_TYPES), SKILL_CARDS_PER_HAND, m)
+        self.skills[AI] = COPIES_PER_CARD - self.skills[PLAYER]
+
+        for seat in (PLAYER, AI):
+            self.played[seat] = np.zeros(m, dtype=np.int8)
+            self.hand_sizes[seat] = np.full(m, NUMBER_CARDS_PER_HAND, dtype=np.int8)
+            self.skill_sizes[seat] = np.full(m, SKILL_CARDS_PER_HAND, dtype=np.int8)
+
+    def _draw_index(self, counts, total, mask=None):
+        """Elige una carta al azar (uniforme sobre cartas); -1 donde `mask` es falso o no hay cartas."""
+        pick = (self.rng.random(counts.shape[1]) * total).astype(np.int8)
+        # Suma acumulada fila a fila: mucho más rápida que cumsum sobre el eje 0
+        cumulative = np.zeros_like(total)
+        index = np.zeros_like(total)
+        for row in counts:
+            cumulative += row
+            index += (cumulative <= pick).view(np.int8)
+        valid = total > 0
+        if mask is not None:
+            valid &= mask
+        return np.where(valid, index, np.int8(-1))
+
+    @staticmethod
+    def _remove(counts, index):
+        """Quita de cada mano la carta de la columna indicada (ninguna si es -1)."""
+        for c, row in enumerate(counts):
+            row -= (index == c).view(np.int8)
+
+    def play_turn(self):
+        """Juega un turno en todas las partidas activas (equivale a `Game.play_turn`)."""
+        for seat in (PLAYER, AI):
+            index = self._draw_index(self.hands[seat], self.hand_sizes[seat])
+            self._remove(self.hands[seat], index)
+            self.hand_sizes[seat] -= 1
+            # Valor de la carta (0 = sin carta); como mucho 20 tras Duplicar, cabe en int8
+            index += 1
+            self.played[seat] = index
+
+        player_card, ai_card = self.played[PLAYER], self.played[AI]
+        decided = (player_card != ai_card).view(np.int8)
+        # NOBODY (0) en empate, PLAYER (1) si pierde el jugador y AI (2) si pierde la IA
+        self.current_loser = decided + (player_card > ai_card).view(np.int8)
+        self.turn_count += decided
+        self.probability += decided * np.int16(self.increment)
+        np.minimum(self.probability, 100, out=self.probability)
+
+    def resolve_losses(self):
+        """Resuelve la decisión del perdedor de cada turno, igual que `game.simulation`."""
+        turn_loser = self.current_loser.copy()
+        for seat, opponent in ((PLAYER, AI), (AI, PLAYER)):
+            loses = turn_loser == seat
+            wants_skill = (
+                loses
+                & (self.skill_sizes[seat] > 0)
+                & (self.probability > self.skill_thresholds[seat])
+            )
+            self.use_skill(seat, wants_skill)
+            # Si la habilidad traslada la derrota, el rival solo puede girar la ruleta
+            self.spin(opponent, wants_skill & (self.current_loser == opponent))
+            self.spin(seat, loses & ~wants_skill)
+
+    def use_skill(self, seat, mask):
+        """
+        Usa una habilidad al azar del asiento dado (equivale a `SkillCard.use`).
+
+        Solo se llama con `mask` dentro de las partidas en las que `seat` ha
+        perdido el turno. Se opera sobre los arrays completos: donde `mask` es
+        falso la habilidad es -1 y ninguna de las operaciones cambia nada.
+        """
+        if not mask.any():
+            return
+        opponent = AI if seat == PLAYER else PLAYER
+        skill = self._draw_index(self.skills[seat], self.skill_sizes[seat], mask)
+        self._remove(self.skills[seat], skill)
+        self.skill_sizes[seat] -= mask.view(np.int8)
+
+        own, other = self.played[seat], self.played[opponent]
+        swap = skill == SWAP
+        increase = skill == INCREASE
+        new_own = np.where(swap, other, own)
+        new_own += increase.view(np.int8) * np.int8(3)
+        new_own <<= (skill == DOUBLE).view(np.int8)
+        new_other = np.where(swap, own, other)
+
+        # Quien usa la habilidad había perdido: sigue perdiendo salvo que supere al
+        # rival. En caso de empate, Aumento anula la derrota e Intercambio/Duplicar
+        # la mantienen; Bloqueo la anula siempre
+        beats = (new_own > new_other).view(np.int8)
+        loser = beats * np.int8(opponent - seat)
+        loser += np.int8(seat)
+        nobody = (skill == BLOCK) | (increase & (new_own == new_other))
+        loser *= (~nobody).view(np.int8)
+
+        self.played[seat] = new_own
+        self.played[opponent] = new_other
+        self.current_loser = np.where(mask, loser, self.current_loser)
+
+    def spin(self, seat, mask):
+        """Gira la ruleta para el asiento dado (equivale a `Game.use_roulette`)."""
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return
+        # Solo se sortea para las partidas que giran
+        dies = rows[self.rng.random(len(rows)) * 100 <= self.probability[rows]]
+        dead_games = self.games[dies]
+        self.alive[seat][dead_games] = False
+        self.winner[dead_games] = AI if seat == PLAYER else PLAYER
+        self._finished[dies] = True
+
+    def check_game_over(self):
+        """
+        Termina las partidas con muerte o sin cartas numéricas (equivale a
+        `Game.is_game_over`) y las compacta fuera de los arrays de trabajo.
+        """
+        player_empty = self.hand_sizes[PLAYER] == 0
+        ai_empty = self.hand_sizes[AI] == 0
+        out_of_cards = ~self._finished & (player_empty | ai_empty)
+        # Como en Game.is_game_over, se comprueba antes la mano del jugador
+        self.winner[self.games[out_of_cards]] = np.where(player_empty[out_of_cards], AI, PLAYER)
+
+        finished = self._finished | out_of_cards
+        self.turns[self.games[finished]] = self.turn_count[finished]
+        if finished.any():
+            # `take` con los índices calculados una vez es más rápido que `compress`
+            keep = np.flatnonzero(~finished)
+            self.games = self.games.take(keep)
+            for seat in (PLAYER, AI):
+                self.hands[seat] = self.hands[seat].take(keep, axis=1)
+                self.skills[seat] = self.skills[seat].take(keep, axis=1)
+                self.hand_sizes[seat] = self.hand_sizes[seat].take(keep)
+                self.skill_sizes[seat] = self.skill_sizes[seat].take(keep)
+                self.played[seat] = self.played[seat].take(keep)
+            self.probability = self.probability.take(keep)
+            self.turn_count = self.turn_count.take(keep)
+            self.current_loser = self.current_loser.take(keep)
+            self._finished = self._finished.take(keep)
+
+    def run(self):
+        """
+        Juega todas las partidas hasta el final.
+
+        Returns:
+            dict: Estadísticas con el mismo formato que `game.simulation.run_simulation`
+        """
+        self.setup_game()
+        while self.active_count:
+            self.play_turn()
+            self.resolve_losses()
+            self.check_game_over()
+
+        return {
+            "games": self.n,
+            "player_wins": int((self.winner == PLAYER).sum()),
+            "ai_wins": int((self.winner == AI).sum()),
+            "turns": int(self.turns.sum(dtype=np.int64)),
+            "deaths": int((~(self.alive[PLAYER] & self.alive[AI])).sum()),
+        }
+
+
+def run_batch(n_games, batch_size=250000, seed=None, **kwargs):
+    """
+    Simula partidas con el motor vectorizado en bloques de `batch_size`.
+
+    Args:
+        n_games: Número total de partidas
+        batch_size: Partidas simultáneas por bloque
+        seed: Semilla raíz; el bloque b usa el flujo `RngStream(seed).child(b)`
+        **kwargs: Parámetros adicionales de `BatchGames`
+
+    Returns:
+        dict: Estadísticas agregadas, incluyendo la tasa de partidas por segundo
+    """
+    root = RngStream(seed)
+    stats = {"games": 0, "player_wins": 0, "ai_wins": 0, "turns": 0, "deaths": 0}
+
+    start = time.perf_counter()
+    for batch, first_index in enumerate(range(0, n_games, batch_size)):
+        size = min(batch_size, n_games - first_index)
+        rng = root.child(batch).numpy()
+        for key, value in BatchGames(size, rng=rng, **kwargs).run().items():
+            stats[key] += value
+    elapsed = time.perf_counter() - start
+
+    stats["elapsed"] = elapsed
+    stats["games_per_second"] = stats["games"] / elapsed if elapsed > 0 else float("inf")
+    return stats
+
+
+def compare_engines(n_object_games=20000, n_batch_games=1000000, seed=None):
+    """
+    Comprueba la equivalencia estadística entre el motor vectorizado y `Game`.
+
+    Calcula el estadístico z de la diferencia de proporciones de victorias del
+    jugador y de muertes en la ruleta, y de la diferencia de turnos medios.
+    Con motores equivalentes, |z| > Z_THRESHOLD (4) es prácticamente imposible.
+
+    Returns:
+        dict: Estadístico z por métrica
+    """
+    reference = run_simulation(n_object_games, workers=1, seed=seed)
+    batch = run_batch(n_batch_games, seed=seed)
+
+    z_scores = {}
+    for key in ("player_wins", "deaths"):
+        p1 = reference[key] / reference["games"]
+        p2 = batch[key] / batch["games"]
+        pooled = (reference[key] + batch[key]) / (reference["games"] + batch["games"])
+        se = math.sqrt(pooled * (1 - pooled) * (1 / reference["games"] + 1 / batch["games"]))
+        z_scores[key] = (p1 - p2) / se if se > 0 else 0.0
+
+    # Para los turnos se usa la varianza observada en el motor vectorizado
+    sample = BatchGames(min(n_batch_games, 100000), rng=seed)
+    sample.run()
+    variance = float(sample.turns.var())
+    mean1 = reference["turns"] / reference["games"]
+    mean2 = batch["turns"] / batch["games"]
+    se = math.sqrt(variance * (1 / reference["games"] + 1 / batch["games"]))
+    z_scores["turns"] = (mean1 - mean2) / se if se > 0 else 0.0
+    return z_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Motor vectorizado de partidas en lote")
+    parser.add_argument("--games", type=int, default=1000000, help="Número de partidas")
+    parser.add_argument("--batch-size", type=int, default=250000, help="Partidas por bloque")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla")
+    parser.add_argument("--check", type=int, default=0,
+                        help="Partidas del motor de objetos para comprobar la equivalencia")
+    args = parser.parse_args()
+
+    stats = run_batch(args.games, batch_size=args.batch_size, seed=args.seed)
+    games = stats["games"]
+    print(f"Partidas: {games}")
+    print(f"Victorias jugador: {stats['player_wins'] / games:.4f}")
+    print(f"Victorias IA: {stats['ai_wins'] / games:.4f}")
+    print(f"Turnos medios: {stats['turns'] / games:.3f}")
+    print(f"Muertes en la ruleta: {stats['deaths'] / games:.4f}")
+    print(f"Tiempo: {stats['elapsed']:.2f} s ({stats['games_per_second']:.0f} partidas/s)")
+
+    if args.check:
+        z_scores = compare_engines(args.check, args.games, seed=args.seed)
+        for key, z in z_scores.items():
+            print(f"z({key}) = {z:+.2f}{'  <-- DIFERENCIA' if abs(z) > Z_THRESHOLD else ''}")
+
+
+if __name__ == "__main__":
+    main()
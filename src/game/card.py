@@ -1,3 +1,11 @@
+# Habilidades del juego (Game._generate_skill_cards crea dos copias de cada una)
+SKILL_DEFINITIONS = [
+    {"name": "Aumento", "desc": "Aumenta tu número en 3", "effect": "increase"},
+    {"name": "Intercambio", "desc": "Intercambia tu carta con la del oponente", "effect": "swap"},
+    {"name": "Salvavidas", "desc": "Te salva automáticamente sin usar la ruleta", "effect": "block"},
+    {"name": "Duplicar", "desc": "Duplica el valor de tu carta", "effect": "double"},
+]
+
 class Card:
     """Clase base para todas las cartas del juego."""
     def __init__(self, id):
@@ -1,6 +1,8 @@
 import random
-from .card import NumberCard, SkillCard
+from .card import NumberCard, SkillCard, SKILL_DEFINITIONS
 from .roulette import Roulette
+from .state import GameState, PLAYER, AI, encode_card
+from .zobrist import ZobristTracker
 import logging
 
 class Player:
@@ -56,22 +58,46 @@ class Player:
                 if result:
                     game_state.skill_used_this_turn = True  # Marcar que se usó una habilidad
                     self.hand.pop(card_index)
+                    code = encode_card(card)
+                    game_state.zobrist.remove(PLAYER if self is game_state.player else AI, code)
+                    game_state.discard_pile.append(code)
+                    # Si la derrota pasa al oponente, este aún tiene que girar la ruleta
+                    game_state.decision_pending = game_state.current_loser not in (None, self)
                 return result
         return False
 
 class Game:
     """Controla la lógica del juego de cartas con ruleta rusa."""
     
-    def __init__(self, player_name="Jugador", ai_name="IA"):
+    def __init__(self, player_name="Jugador", ai_name="IA", ai_policy=None, rng=None, seed=None):
+        """
+        Inicializa la partida.
+        
+        Args:
+            player_name: Nombre del jugador humano
+            ai_name: Nombre del jugador IA
+            ai_policy: Política opcional (ver game.policies) que decide por la IA.
+                Si es None se usa la lógica aleatoria integrada.
+            rng: Generador `random.Random` propio de la partida (ver game.rng)
+            seed: Semilla para crear el generador si no se pasa `rng`
+        """
+        # Cada partida usa su propio generador en lugar del módulo global `random`
+        self.rng = rng if rng is not None else random.Random(seed)
         self.player = Player(player_name)
         self.ai_player = Player(ai_name)
-        self.roulette = Roulette(initial_probability=1)
+        self.roulette = Roulette(initial_probability=1, rng=self.rng)
         self.turn_count = 0
         self.current_player = None
         self.winner = None
         self.game_over = False
         self.current_loser = None
         self.skill_used_this_turn = False
+        self.decision_pending = False  # El perdedor del turno aún no ha resuelto su derrota
+        self.game_message = ""
+        self.turn_completed = False
+        self.ai_policy = ai_policy
+        self.zobrist = ZobristTracker()  # Hash incremental de las manos (ver position_hash)
+        self.discard_pile = []  # Códigos de las cartas que ya salieron del juego (públicas)
     
     def setup_game(self):
         """Configura el juego, reparte las cartas iniciales."""
@@ -80,8 +106,8 @@ class Game:
         skill_cards = self._generate_skill_cards()
         
         # Barajar las cartas
-        random.shuffle(number_cards)
-        random.shuffle(skill_cards)
+        self.rng.shuffle(number_cards)
+        self.rng.shuffle(skill_cards)
         
         # Repartir 5 cartas numéricas y 4 de habilidad a cada jugador
         player_number_cards = number_cards[:7]
@@ -94,6 +120,8 @@ class Game:
         
         # El jugador humano comienza
         self.current_player = self.player
+        self.discard_pile = []
+        self.zobrist.reset(self)
     
     def _generate_number_cards(self):
         """Genera las cartas numéricas para el juego."""
@@ -110,17 +138,10 @@ class Game:
     
     def _generate_skill_cards(self):
         """Genera las cartas de habilidad para el juego."""
-        skills = [
-            {"name": "Aumento", "desc": "Aumenta tu número en 3", "effect": "increase"},
-            {"name": "Intercambio", "desc": "Intercambia tu carta con la del oponente", "effect": "swap"},
-            {"name": "Salvavidas", "desc": "Te salva automáticamente sin usar la ruleta", "effect": "block"},
-            {"name": "Duplicar", "desc": "Duplica el valor de tu carta", "effect": "double"},
-        ]
-        
         cards = []
         id_counter = 100  # IDs para cartas de habilidad comienzan en 100
         
-        for skill in skills:
+        for skill in SKILL_DEFINITIONS:
             # Crear dos copias de cada habilidad
             for _ in range(2):
                 cards.append(SkillCard(
@@ -133,24 +154,37 @@ class Game:
         
         return cards
     
-    def play_turn(self, player_card_index):
+    def play_turn(self, player_card_index, ai_card_index=None):
         """
         Juega un turno completo.
         
         Args:
             player_card_index: Índice de la carta que el jugador quiere jugar
+            ai_card_index: Índice de la carta que juega la IA. Si es None la elige
+                la política de la IA o, en su defecto, se escoge al azar.
             
         Returns:
             dict: Información sobre el resultado del turno
         """
         
-        # Reiniciamos el indicador al inicio de cada turno
+        # Reiniciamos los indicadores al inicio de cada turno
         self.skill_used_this_turn = False
+        self.decision_pending = False
+        
+        # La política de la IA elige antes de que la carta del jugador salga de
+        # la mano: ambos juegan a la vez y la IA no debe ver esa carta
+        player_hand = self.player.hand
+        if (ai_card_index is None and self.ai_policy is not None
+                and 0 <= player_card_index < len(player_hand)
+                and player_hand[player_card_index].type == "number"):
+            ai_card_index = self.ai_policy.choose_card(self, self.ai_player)
         
         # Jugar carta del jugador humano
         player_card = self.player.play_number_card(player_card_index)
         if not player_card:
             return {"status": "error", "message": "Carta inválida"}
+        self.zobrist.remove(PLAYER, player_card.value)
+        self.discard_pile.append(player_card.value)
         
         # IA juega una carta (selecciona una carta numérica aleatoria)
         ai_number_cards = [i for i, card in enumerate(self.ai_player.hand) 
@@ -159,9 +193,12 @@ class Game:
         if not ai_number_cards:
             return {"status": "win", "winner": self.player.name, "reason": "IA sin cartas numéricas"}
         
-        # La IA escoge una carta numérica aleatoria (más adelante implementaremos la integración con Gemini)
-        ai_card_index = random.choice(ai_number_cards)
+        # Sin elección explícita, la IA escoge una carta numérica aleatoria
+        if ai_card_index not in ai_number_cards:
+            ai_card_index = self.rng.choice(ai_number_cards)
         ai_card = self.ai_player.play_number_card(ai_card_index)
+        self.zobrist.remove(AI, ai_card.value)
+        self.discard_pile.append(ai_card.value)
         
         # Determinar ganador del turno
         turn_winner = None
@@ -180,6 +217,8 @@ class Game:
                 "ai_card": ai_card
             }
         
+        self.decision_pending = True
+        
         # Incrementar el contador de turnos y la probabilidad de la ruleta
         self.turn_count += 1
         self.roulette.increase_probability()
@@ -203,19 +242,36 @@ class Game:
             bool: True si el jugador "muere"
         """
         result = self.roulette.spin()
-        if result:
+        self._apply_roulette_result(player, result)
+        return result
+    
+    def _apply_roulette_result(self, player, died):
+        """Aplica el resultado de un giro de la ruleta de `player`."""
+        self.decision_pending = False
+        if died:
             player.alive = False
             self.game_over = True
             self.winner = self.player if player == self.ai_player else self.ai_player
-        return result
     
     def ai_decision_after_losing(self):
         """
-        La IA decide si usar una carta de habilidad o girar la ruleta.
+        La IA decide si usar una carta de habilidad o girar la ruleta, y lo aplica.
         
         Returns:
             dict: Información sobre la decisión tomada
         """
+        return self.apply_ai_decision(self.decide_after_losing())
+    
+    def decide_after_losing(self):
+        """
+        La IA decide si usar una carta de habilidad o girar la ruleta, sin aplicarlo.
+        
+        Solo lee la partida, así que puede ejecutarse fuera del bucle de la
+        interfaz (por ejemplo, sobre una copia en otro hilo).
+        
+        Returns:
+            dict: {"choice": "skill", "card_index": i} o {"choice": "roulette"}
+        """
         logging.info("Solicitando decisión a la IA después de perder")
         
         # Si estamos usando una IA externa (que no está implementada aquí),
@@ -228,22 +284,49 @@ class Game:
             "skill_used": self.skill_used_this_turn
         }
         
-        logging.info(f"Estado del juego preparado para la IA: {game_state}")
+        # Formateo diferido: en simulaciones masivas el registro suele estar desactivado
+        logging.info("Estado del juego preparado para la IA: %s", game_state)
         
         # Versión simple que no depende de la IA externa
         # Buscar cartas de habilidad disponibles
         ai_skill_cards = [i for i, card in enumerate(self.ai_player.hand) 
                         if card.type == "skill"]
         
-        logging.info(f"Cartas de habilidad disponibles: {ai_skill_cards}")
-        logging.info(f"Probabilidad actual de la ruleta: {self.roulette.get_probability()}%")
+        logging.info("Cartas de habilidad disponibles: %s", ai_skill_cards)
+        logging.info("Probabilidad actual de la ruleta: %s%%", self.roulette.get_probability())
         
-        # Decisión simple basada en la probabilidad de la ruleta
-        # Si la probabilidad es alta, preferimos usar una habilidad (si hay disponible)
-        if ai_skill_cards and not self.skill_used_this_turn and self.roulette.get_probability() > 20:
-            # Usar una carta de habilidad aleatoria
-            skill_index = random.choice(ai_skill_cards)
-            skill_card = self.ai_player.hand[skill_index]
+        if self.ai_policy is not None:
+            # Delegar la decisión en la política configurada
+            decision = self.ai_policy.decide_after_losing(self, self.ai_player)
+            skill_index = decision.get("card_index") if decision["choice"] == "skill" else None
+            if skill_index not in ai_skill_cards or self.skill_used_this_turn:
+                skill_index = None
+        elif ai_skill_cards and not self.skill_used_this_turn and self.roulette.get_probability() > 20:
+            # Decisión simple basada en la probabilidad de la ruleta:
+            # si es alta, preferimos usar una habilidad aleatoria
+            skill_index = self.rng.choice(ai_skill_cards)
+        else:
+            skill_index = None
+        
+        if skill_index is not None:
+            return {"choice": "skill", "card_index": skill_index}
+        return {"choice": "roulette"}
+    
+    def apply_ai_decision(self, decision):
+        """
+        Aplica una decisión de `decide_after_losing`.
+        
+        Una habilidad que ya no es válida (índice fuera de la mano o habilidad
+        ya usada en el turno) se sustituye por la ruleta.
+        
+        Returns:
+            dict: Información sobre la decisión tomada
+        """
+        hand = self.ai_player.hand
+        skill_index = decision.get("card_index") if decision["choice"] == "skill" else None
+        if (skill_index is not None and not self.skill_used_this_turn
+                and 0 <= skill_index < len(hand) and hand[skill_index].type == "skill"):
+            skill_card = hand[skill_index]
             
             logging.info(f"La IA decide usar la habilidad {skill_card.name} (índice {skill_index})")
             
@@ -275,6 +358,156 @@ class Game:
                 "died": result
             }
     
+    def snapshot(self):
+        """
+        Captura el estado completo de la partida.
+        
+        Returns:
+            GameState: Instantánea inmutable y hashable
+        """
+        return GameState.from_game(self)
+    
+    def restore(self, state):
+        """Restablece la partida al estado de una instantánea de `snapshot`."""
+        state.restore(self)
+    
+    def position_hash(self):
+        """
+        Hash Zobrist de la posición actual (ver game.zobrist).
+        
+        Las manos se actualizan de forma incremental con cada jugada; el resto
+        del estado son unos pocos escalares, así que la llamada es O(1).
+        """
+        return self.zobrist.position_hash(self)
+    
+    def legal_moves(self):
+        """
+        Enumera las jugadas legales en la posición actual.
+        
+        Las jugadas son tuplas pequeñas que entiende `make_move`:
+            - ("play", índice_jugador, índice_ia): ambos juegan una carta numérica
+            - ("skill", asiento, índice): el perdedor usa una carta de habilidad
+            - ("roulette", asiento, None): el perdedor gira la ruleta. Para
+              fijar el resultado (nodos de azar) se sustituye None por True/False
+        
+        `asiento` es `state.PLAYER` o `state.AI`.
+        
+        Returns:
+            list: Jugadas legales (vacía si la partida ha terminado)
+        """
+        player, ai = self.player, self.ai_player
+        if self.game_over or not player.alive or not ai.alive:
+            return []
+        
+        if self.decision_pending:
+            loser = self.current_loser
+            seat = PLAYER if loser is player else AI
+            moves = []
+            if not self.skill_used_this_turn:
+                moves = [("skill", seat, i) for i, card in enumerate(loser.hand) if card.type == "skill"]
+            moves.append(("roulette", seat, None))
+            return moves
+        
+        player_cards = [i for i, card in enumerate(player.hand) if card.type == "number"]
+        ai_cards = [i for i, card in enumerate(ai.hand) if card.type == "number"]
+        return [("play", i, j) for i in player_cards for j in ai_cards]
+    
+    def make_move(self, move):
+        """
+        Aplica una jugada de `legal_moves` y devuelve lo necesario para deshacerla.
+        
+        Pensado para búsquedas en árbol sobre una única partida mutable: el
+        registro solo guarda el delta de la jugada (cartas retiradas de la
+        mano, cartas jugadas y sus valores, y los escalares que cambian), sin
+        copiar la partida.
+        
+        Args:
+            move: Jugada como la devuelve `legal_moves`
+            
+        Returns:
+            tuple: Registro para `unmake_move`
+        """
+        kind = move[0]
+        # Escalares que puede cambiar cualquier jugada
+        common = (self.current_loser, self.skill_used_this_turn, self.decision_pending,
+                  self.game_over, self.winner, self.game_message)
+        
+        if kind == "play":
+            _, player_index, ai_index = move
+            player, ai = self.player, self.ai_player
+            record = (kind, common, player_index, player.hand[player_index],
+                      ai_index, ai.hand[ai_index], player.played_card, ai.played_card,
+                      self.turn_count, self.roulette.current_probability)
+            if self.play_turn(player_index, ai_index)["status"] == "error":
+                raise ValueError(f"Jugada ilegal: {move}")
+            return record
+        
+        _, seat, argument = move
+        user = self.player if seat == PLAYER else self.ai_player
+        
+        if kind == "skill":
+            target = self.ai_player if user is self.player else self.player
+            user_card, target_card = user.played_card, target.played_card
+            # Aumento y Duplicar modifican el valor de la carta jugada en el sitio
+            record = (kind, common, user, argument, user.hand[argument],
+                      user_card, user_card.value if user_card else None,
+                      target_card, target_card.value if target_card else None,
+                      self.turn_completed)
+            if not user.use_skill_card(argument, self, target):
+                # Una habilidad rechazada solo puede haber cambiado el mensaje
+                self.game_message = common[5]
+                raise ValueError(f"Jugada ilegal: {move}")
+            return record
+        
+        if kind == "roulette":
+            record = (kind, common, user, user.alive)
+            if argument is None:
+                self.use_roulette(user)
+            else:
+                self._apply_roulette_result(user, argument)
+            return record
+        
+        raise ValueError(f"Jugada desconocida: {move}")
+    
+    def unmake_move(self, record):
+        """Deshace exactamente una jugada aplicada con `make_move`."""
+        kind = record[0]
+        
+        if kind == "play":
+            (_, _, player_index, player_card, ai_index, ai_card,
+             player_played, ai_played, turn_count, probability) = record
+            self.player.hand.insert(player_index, player_card)
+            self.ai_player.hand.insert(ai_index, ai_card)
+            self.zobrist.add(PLAYER, player_card.value)
+            self.zobrist.add(AI, ai_card.value)
+            del self.discard_pile[-2:]
+            self.player.played_card = player_played
+            self.ai_player.played_card = ai_played
+            self.turn_count = turn_count
+            self.roulette.current_probability = probability
+        
+        elif kind == "skill":
+            (_, _, user, index, skill_card, user_card, user_value,
+             target_card, target_value, turn_completed) = record
+            target = self.ai_player if user is self.player else self.player
+            user.hand.insert(index, skill_card)
+            self.zobrist.add(PLAYER if user is self.player else AI, encode_card(skill_card))
+            self.discard_pile.pop()
+            # Intercambio cambia las referencias; Aumento y Duplicar, los valores
+            user.played_card, target.played_card = user_card, target_card
+            if user_card is not None:
+                user_card.value = user_value
+            if target_card is not None:
+                target_card.value = target_value
+            self.turn_completed = turn_completed
+        
+        else:
+            _, _, user, alive = record
+            user.alive = alive
+        
+        (self.current_loser, self.skill_used_this_turn, self.decision_pending,
+         self.game_over, self.winner, self.game_message) = record[1]
+    
     def is_game_over(self):
         """Comprueba si el juego ha terminado."""
         # El juego termina si alguien muere en la ruleta
@@ -0,0 +1,70 @@
+class Policy:
+    """
+    Interfaz base para las políticas que deciden por un asiento de la partida.
+
+    Una política elige la carta numérica de cada turno y qué hacer tras perder
+    un turno. Se usa tanto para la IA dentro de `Game` (parámetro `ai_policy`)
+    como para ambos asientos en el simulador sin interfaz. Las políticas
+    aleatorias deben usar `game.rng` para que las partidas sean reproducibles.
+    """
+
+    def choose_card(self, game, player):
+        """
+        Elige la carta numérica que se jugará este turno.
+
+        Args:
+            game: Partida en curso
+            player: Jugador por el que decide la política
+
+        Returns:
+            int: Índice de la carta en la mano, o None para dejar elegir al juego
+        """
+        raise NotImplementedError
+
+    def decide_after_losing(self, game, player):
+        """
+        Decide entre usar una carta de habilidad o girar la ruleta.
+
+        Args:
+            game: Partida en curso
+            player: Jugador que ha perdido el turno
+
+        Returns:
+            dict: {"choice": "skill", "card_index": i} o {"choice": "roulette"}
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Libera los recursos de la política (procesos, conexiones). Por defecto no hace nada."""
+
+
+class RandomPolicy(Policy):
+    """
+    Política aleatoria equivalente a la lógica integrada de la IA.
+
+    Juega una carta numérica al azar y, tras perder, usa una habilidad al azar
+    solo si la probabilidad de la ruleta supera el umbral indicado.
+    """
+
+    def __init__(self, skill_threshold=20):
+        self.skill_threshold = skill_threshold
+
+    def choose_card(self, game, player):
+        number_cards = [i for i, card in enumerate(player.hand) if card.type == "number"]
+        if not number_cards:
+            return None
+        return game.rng.choice(number_cards)
+
+    def decide_after_losing(self, game, player):
+        skill_cards = [i for i, card in enumerate(player.hand) if card.type == "skill"]
+        if (skill_cards and not game.skill_used_this_turn
+                and game.roulette.get_probability() > self.skill_threshold):
+            return {"choice": "skill", "card_index": game.rng.choice(skill_cards)}
+        return {"choice": "roulette"}
+
+
+class RouletteOnlyPolicy(RandomPolicy):
+    """Política que juega cartas al azar y nunca usa habilidades."""
+
+    def decide_after_losing(self, game, player):
+        return {"choice": "roulette"}
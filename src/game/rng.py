@@ -0,0 +1,76 @@
+"""
+Flujos de números aleatorios reproducibles e independientes.
+
+Cada `RngStream` se identifica por una semilla raíz y una ruta de índices.
+La semilla efectiva se deriva con BLAKE2b, de modo que los flujos hijos
+(`spawn`) son independientes entre sí y se pueden reconstruir en cualquier
+proceso sin reiniciar el módulo global `random`.
+
+Ejemplo:
+    root = RngStream(1234)
+    workers = root.spawn(8)            # un flujo por proceso trabajador
+    game = Game(rng=workers[0].random())
+"""
+import hashlib
+import random
+
+
+def derive_seed(root_seed, *path):
+    """
+    Deriva una semilla de 64 bits a partir de una semilla raíz y una ruta.
+
+    Args:
+        root_seed: Semilla raíz (entero)
+        *path: Índices o etiquetas que identifican el flujo
+
+    Returns:
+        int: Semilla derivada
+    """
+    key = ":".join(str(part) for part in (root_seed,) + path).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class RngStream:
+    """Flujo aleatorio divisible identificado por (semilla raíz, ruta)."""
+
+    def __init__(self, seed=None, path=()):
+        """
+        Args:
+            seed: Semilla raíz. Si es None se elige una al azar
+            path: Ruta del flujo dentro del árbol de flujos
+        """
+        self.root_seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self.path = tuple(path)
+        self._children = 0
+
+    @property
+    def seed(self):
+        """Semilla efectiva de este flujo."""
+        return derive_seed(self.root_seed, *self.path)
+
+    def child(self, index):
+        """Devuelve el flujo hijo con el índice dado."""
+        return RngStream(self.root_seed, self.path + (index,))
+
+    def spawn(self, n):
+        """
+        Crea `n` flujos hijos nuevos e independientes.
+
+        Llamadas sucesivas devuelven hijos distintos, igual que
+        `numpy.random.SeedSequence.spawn`.
+        """
+        children = [self.child(self._children + i) for i in range(n)]
+        self._children += n
+        return children
+
+    def random(self):
+        """Devuelve un `random.Random` sembrado con este flujo."""
+        return random.Random(self.seed)
+
+    def numpy(self):
+        """Devuelve un `numpy.random.Generator` sembrado con este flujo."""
+        import numpy as np
+        return np.random.default_rng(self.seed)
+
+    def __repr__(self):
+        return f"RngStream(seed={self.root_seed}, path={self.path})"
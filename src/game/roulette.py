@@ -1,18 +1,76 @@
 import random
+from functools import lru_cache
+
+
+def death_chance(probability):
+    """
+    Probabilidad real de "muerte" de un único giro con la probabilidad dada (%).
+
+    `Roulette.spin` muere si `random() * 100 <= probabilidad`, es decir, con
+    probabilidad `probabilidad / 100` acotada a [0, 1].
+    """
+    return min(max(probability, 0), 100) / 100
+
+
+@lru_cache(maxsize=256)
+def survival_table(start_probability, increment):
+    """
+    Tabla de supervivencia acumulada para una secuencia de giros.
+
+    El giro k-ésimo (k = 1, 2, ...) se hace con probabilidad
+    `min(start_probability + (k - 1) * increment, 100)`, igual que si entre
+    giro y giro se llamara a `Roulette.increase_probability`.
+
+    Args:
+        start_probability: Probabilidad del primer giro (%)
+        increment: Incremento entre giros (%). Debe ser positivo
+
+    Returns:
+        tuple: survival[k] = probabilidad de sobrevivir a los k primeros giros.
+            La tabla termina en el primer giro con probabilidad 100 (survival = 0)
+    """
+    if increment <= 0:
+        raise ValueError("El incremento debe ser positivo")
+    survival = [1.0]
+    probability = start_probability
+    while survival[-1] > 0 and probability < 100:
+        survival.append(survival[-1] * (1 - death_chance(probability)))
+        probability += increment
+    if survival[-1] > 0:
+        # Giro con probabilidad 100: a partir de aquí nadie sobrevive
+        survival.append(0.0)
+    return tuple(survival)
+
+
+@lru_cache(maxsize=256)
+def death_by_pull_table(start_probability, increment):
+    """
+    Probabilidad de morir exactamente en el giro k-ésimo (ver `survival_table`).
+
+    Returns:
+        tuple: death[k] para k >= 1 (death[0] = 0)
+    """
+    survival = survival_table(start_probability, increment)
+    return (0.0,) + tuple(survival[k - 1] - survival[k] for k in range(1, len(survival)))
+
 
 class Roulette:
     """Implementa la mecánica de ruleta rusa con probabilidad creciente."""
     
-    def __init__(self, initial_probability=1):
+    def __init__(self, initial_probability=1, rng=None, increment=10):
         """
         Inicializa la ruleta con una probabilidad dada.
         
         Args:
             initial_probability: Probabilidad inicial de "muerte" en porcentaje
+            rng: Generador `random.Random` a usar (por defecto, uno propio)
+            increment: Incremento de la probabilidad en cada turno (%)
         """
+        self.rng = rng if rng is not None else random.Random()
         self.initial_probability = initial_probability
         self.current_probability = initial_probability
-        self.increment = 10  # Incremento en cada turno (10%)
+        self.increment = increment  # Incremento en cada turno (10% por defecto)
+        self._np_rng = None
     
     def spin(self):
         """
@@ -21,14 +79,60 @@ class Roulette:
         Returns:
             bool: True si el jugador "muere", False en caso contrario
         """
-        random_value = random.random() * 100  # Valor entre 0 y 100
+        random_value = self.rng.random() * 100  # Valor entre 0 y 100
         return random_value <= self.current_probability
     
-    def increase_probability(self):
+    def spin_batch(self, probabilities=None, size=None):
+        """
+        Simula muchos giros independientes con una sola llamada vectorizada.
+        
+        Args:
+            probabilities: Probabilidad (%) de cada giro, como secuencia o array.
+                Si es None se usa la probabilidad actual
+            size: Número de giros cuando `probabilities` es None o un escalar
+        
+        Returns:
+            numpy.ndarray: Array booleano, True donde el jugador "muere"
+        """
+        import numpy as np
+        
+        if self._np_rng is None:
+            # Generador de NumPy derivado del flujo propio de la ruleta
+            self._np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        
+        if probabilities is None:
+            probabilities = self.current_probability
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if size is None:
+            size = probabilities.shape
+        return self._np_rng.random(size) * 100 <= probabilities
+    
+    def increase_probability(self, turns=1):
         """Aumenta la probabilidad de "muerte" según el incremento establecido."""
-        self.current_probability += self.increment
+        self.current_probability = self.probability_after(turns)
+    
+    def probability_after(self, turns):
+        """Probabilidad tras `turns` incrementos, sin modificar la ruleta."""
         # Aseguramos que no supere el 100%
-        self.current_probability = min(self.current_probability, 100)
+        return min(self.current_probability + turns * self.increment, 100)
+    
+    def survival_probability(self, pulls):
+        """
+        Probabilidad de sobrevivir a los próximos `pulls` giros en O(1).
+        
+        El primer giro se hace con la probabilidad actual y cada uno de los
+        siguientes tras un incremento, como ocurre turno a turno en la partida.
+        """
+        if pulls <= 0:
+            return 1.0
+        if self.increment <= 0:
+            return (1 - death_chance(self.current_probability)) ** pulls
+        survival = survival_table(self.current_probability, self.increment)
+        return survival[pulls] if pulls < len(survival) else 0.0
+    
+    def death_probability_within(self, pulls):
+        """Probabilidad de morir en alguno de los próximos `pulls` giros."""
+        return 1.0 - self.survival_probability(pulls)
     
     def reset(self):
         """Restablece la probabilidad al valor inicial."""
@@ -0,0 +1,203 @@
+"""
+Simulador de partidas sin interfaz gráfica.
+
+Juega partidas completas a través de `Game.setup_game`, `Game.play_turn`,
+`Game.use_roulette` y `Game.ai_decision_after_losing`, con políticas
+intercambiables para ambos asientos. No importa pygame ni los módulos de IA
+que hacen peticiones HTTP, por lo que puede ejecutarse en lotes repartidos
+en varios procesos.
+
+Uso:
+    python -m game.simulation --games 1000000 --workers 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .game_logic import Game
+from .policies import RandomPolicy
+from .rng import RngStream
+
+
+def play_match(player_policy, ai_policy=None, rng=None):
+    """
+    Juega una partida completa sin interfaz.
+
+    Args:
+        player_policy: Política que decide por el jugador humano
+        ai_policy: Política de la IA. Si es None se usa la lógica integrada de `Game`
+        rng: Generador `random.Random` de la partida
+
+    Returns:
+        dict: Ganador ("player" o "ai"), turnos jugados y si hubo muerte en la ruleta
+    """
+    game = Game(ai_policy=ai_policy, rng=rng)
+    game.setup_game()
+    return finish_match(game, player_policy)
+
+
+def finish_match(game, player_policy):
+    """
+    Termina una partida ya empezada, incluso a mitad de turno.
+
+    Args:
+        game: Partida en curso (la IA juega con su `ai_policy`)
+        player_policy: Política que decide por el jugador humano
+
+    Returns:
+        dict: El mismo resultado que `play_match`
+    """
+    if game.decision_pending and not game.is_game_over():
+        if game.skill_used_this_turn:
+            # Una habilidad trasladó la derrota: solo queda girar la ruleta
+            game.use_roulette(game.current_loser)
+        elif game.current_loser is game.player:
+            _resolve_player_loss(game, player_policy)
+        else:
+            _resolve_ai_loss(game)
+
+    while not game.is_game_over():
+        card_index = player_policy.choose_card(game, game.player)
+        result = game.play_turn(card_index)
+        if result["status"] == "error":
+            raise RuntimeError(f"La política del jugador eligió una carta inválida: {card_index}")
+
+        if game.current_loser is game.player:
+            _resolve_player_loss(game, player_policy)
+        elif game.current_loser is game.ai_player:
+            _resolve_ai_loss(game)
+
+    return {
+        "winner": "player" if game.winner is game.player else "ai",
+        "turns": game.turn_count,
+        "death": not (game.player.alive and game.ai_player.alive),
+    }
+
+
+def _resolve_player_loss(game, player_policy):
+    """Aplica la decisión del jugador humano tras perder, igual que `GameScreen`."""
+    decision = player_policy.decide_after_losing(game, game.player)
+    if decision["choice"] == "skill":
+        used = game.player.use_skill_card(decision["card_index"], game, game.ai_player)
+        if used:
+            # Si la habilidad traslada la derrota a la IA, esta solo puede girar la ruleta
+            if game.current_loser is game.ai_player:
+                game.use_roulette(game.ai_player)
+            return
+    game.use_roulette(game.player)
+
+
+def _resolve_ai_loss(game):
+    """Aplica la decisión de la IA tras perder, igual que `GameScreen.handle_ai_turn`."""
+    decision = game.ai_decision_after_losing()
+    # Si la habilidad de la IA traslada la derrota al jugador, este solo puede girar la ruleta
+    if decision["choice"] == "skill" and game.current_loser is game.player:
+        game.use_roulette(game.player)
+
+
+def replay_match(seed, index, player_policy=None, ai_policy=None):
+    """
+    Repite exactamente la partida número `index` de una simulación con semilla `seed`.
+
+    Returns:
+        dict: El mismo resultado que obtuvo esa partida en `run_simulation`
+    """
+    rng = RngStream(seed).child(index).random()
+    return play_match(player_policy or RandomPolicy(), ai_policy, rng=rng)
+
+
+def _run_chunk(args):
+    """Ejecuta un bloque de partidas en un proceso trabajador."""
+    first_index, n_games, seed, player_policy, ai_policy = args
+    root = RngStream(seed)
+
+    stats = _empty_stats()
+    for index in range(first_index, first_index + n_games):
+        # Un flujo por partida: el resultado no depende del reparto entre procesos
+        rng = root.child(index).random()
+        _accumulate(stats, play_match(player_policy, ai_policy, rng=rng))
+    return stats
+
+
+def _empty_stats():
+    return {"games": 0, "player_wins": 0, "ai_wins": 0, "turns": 0, "deaths": 0}
+
+
+def _accumulate(stats, match):
+    stats["games"] += 1
+    stats["player_wins" if match["winner"] == "player" else "ai_wins"] += 1
+    stats["turns"] += match["turns"]
+    stats["deaths"] += match["death"]
+
+
+def run_simulation(n_games, player_policy=None, ai_policy=None, workers=None,
+                   chunk_size=10000, seed=None):
+    """
+    Simula un lote de partidas repartido en un pool de procesos.
+
+    Args:
+        n_games: Número total de partidas
+        player_policy: Política del jugador humano (por defecto `RandomPolicy`)
+        ai_policy: Política de la IA (por defecto la lógica integrada de `Game`)
+        workers: Número de procesos (por defecto, uno por CPU). Con 1 no se crea pool
+        chunk_size: Partidas por tarea enviada a cada proceso
+        seed: Semilla raíz; la partida i usa el flujo `RngStream(seed).child(i)`
+            y puede repetirse con `replay_match(seed, i)`
+
+    Returns:
+        dict: Estadísticas agregadas, incluyendo la tasa de partidas por segundo
+    """
+    player_policy = player_policy or RandomPolicy()
+    workers = workers or os.cpu_count() or 1
+    seed = seed if seed is not None else RngStream().root_seed
+
+    chunks = []
+    for first_index in range(0, n_games, chunk_size):
+        size = min(chunk_size, n_games - first_index)
+        chunks.append((first_index, size, seed, player_policy, ai_policy))
+
+    stats = _empty_stats()
+    start = time.perf_counter()
+    if workers == 1:
+        results = map(_run_chunk, chunks)
+        for chunk_stats in results:
+            _merge(stats, chunk_stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_stats in executor.map(_run_chunk, chunks):
+                _merge(stats, chunk_stats)
+    elapsed = time.perf_counter() - start
+
+    stats["seed"] = seed
+    stats["elapsed"] = elapsed
+    stats["games_per_second"] = stats["games"] / elapsed if elapsed > 0 else float("inf")
+    return stats
+
+
+def _merge(stats, other):
+    for key, value in other.items():
+        stats[key] += value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de partidas sin interfaz")
+    parser.add_argument("--games", type=int, default=100000, help="Número de partidas")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos trabajadores")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Partidas por tarea")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base")
+    args = parser.parse_args()
+
+    stats = run_simulation(args.games, workers=args.workers,
+                           chunk_size=args.chunk_size, seed=args.seed)
+    games = stats["games"]
+    print(f"Partidas: {games} (semilla {stats['seed']})")
+    print(f"Victorias jugador: {stats['player_wins'] / games:.4f}")
+    print(f"Victorias IA: {stats['ai_wins'] / games:.4f}")
+    print(f"Turnos medios: {stats['turns'] / games:.3f}")
+    print(f"Muertes en la ruleta: {stats['deaths'] / games:.4f}")
+    print(f"Tiempo: {stats['elapsed']:.2f} s ({stats['games_per_second']:.0f} partidas/s)")
+
+
+if __name__ == "__main__":
+    main()
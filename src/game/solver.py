@@ -0,0 +1,568 @@
+"""
+Solver exacto (expectimax) y tabla de finales para la partida.
+
+El valor de una posición es la probabilidad de que gane la IA. La IA elige
+la acción que maximiza ese valor; el jugador humano se modela como
+`RandomPolicy` (carta numérica uniforme y, tras perder, una habilidad al azar
+si la probabilidad de la ruleta supera el umbral) y la ruleta es un nodo de
+azar con probabilidad `death_chance`. Las cartas se juegan a la vez, así que
+la IA elige su carta sin conocer la del jugador.
+
+Las posiciones al inicio de turno se identifican por:
+    (números del jugador, números de la IA, habilidades del jugador,
+     habilidades de la IA, probabilidad de la ruleta)
+con los números como tuplas ordenadas y las habilidades como recuentos por
+tipo (en el orden de SKILL_DEFINITIONS). El orden de las cartas en la mano no
+influye en el valor, así que las transposiciones se resuelven una sola vez.
+
+La tabla de finales (`EndgameTablebase`) guarda en un fichero .npy mapeado en
+memoria el valor de todas las posiciones con pocas cartas numéricas por mano,
+construido hacia atrás desde el final; consultarla es O(1).
+
+Uso:
+    python -m game.solver --build-tablebase finales.npy --max-cards 1
+    python -m game.solver --seed 42 --tablebase finales.npy
+"""
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from itertools import combinations_with_replacement
+
+from .card import SKILL_DEFINITIONS
+from .policies import Policy, RandomPolicy
+from .roulette import death_chance
+from .state import PLAYER, AI, SKILL_CODE_BASE, determinize, is_skill_code
+from .zobrist import TranspositionTable
+
+SKILL_EFFECTS = tuple(skill["effect"] for skill in SKILL_DEFINITIONS)
+
+
+def position_key(game):
+    """Clave de inicio de turno de la posición de `game` (ver el docstring del módulo)."""
+    player, ai = game.player, game.ai_player
+    return (
+        _numbers(player),
+        _numbers(ai),
+        _skill_counts(player),
+        _skill_counts(ai),
+        game.roulette.current_probability,
+    )
+
+
+def state_key(state):
+    """Clave de inicio de turno de un `GameState` (misma forma que `position_key`)."""
+    return (
+        _code_numbers(state.player_hand),
+        _code_numbers(state.ai_hand),
+        _code_skill_counts(state.player_hand),
+        _code_skill_counts(state.ai_hand),
+        state.probability,
+    )
+
+
+def _code_numbers(hand):
+    return tuple(sorted(code for code in hand if not is_skill_code(code)))
+
+
+def _code_skill_counts(hand):
+    counts = [0] * len(SKILL_EFFECTS)
+    for code in hand:
+        if is_skill_code(code):
+            counts[code - SKILL_CODE_BASE] += 1
+    return tuple(counts)
+
+
+def _numbers(player):
+    return tuple(sorted(card.value for card in player.hand if card.type == "number"))
+
+
+def _skill_counts(player):
+    counts = [0] * len(SKILL_EFFECTS)
+    for card in player.hand:
+        if card.type == "skill":
+            counts[SKILL_EFFECTS.index(card.effect_type)] += 1
+    return tuple(counts)
+
+
+def _without(values, value):
+    i = values.index(value)
+    return values[:i] + values[i + 1:]
+
+
+def _use_skill(counts, skill):
+    return counts[:skill] + (counts[skill] - 1,) + counts[skill + 1:]
+
+
+def _skill_loser(effect, user_value, opponent_value):
+    """
+    Perdedor tras usar una habilidad quien ha perdido el turno (igual que `SkillCard`).
+
+    Returns:
+        str: "user", "opponent" o None si nadie pierde
+    """
+    if effect == "block":
+        return None
+    if effect == "swap":
+        user_value, opponent_value = opponent_value, user_value
+    elif effect == "increase":
+        user_value += 3
+    elif effect == "double":
+        user_value *= 2
+        if user_value == opponent_value:
+            # Duplicar no cambia el perdedor en caso de empate
+            return "user"
+    if user_value > opponent_value:
+        return "opponent"
+    if user_value < opponent_value:
+        return "user"
+    return None
+
+
+class Solver:
+    """
+    Expectimax exacto con tabla de transposiciones.
+
+    Explorar la partida completa desde el reparto es demasiado costoso; el
+    solver está pensado para finales (pocas cartas por mano) y para
+    construir la tabla de finales.
+    """
+
+    def __init__(self, tablebase=None, increment=10, player_skill_threshold=20,
+                 capacity=1 << 18):
+        """
+        Args:
+            tablebase: `EndgameTablebase` opcional para cortar la búsqueda en los finales
+            increment: Incremento de la ruleta por turno (%)
+            player_skill_threshold: Umbral de `RandomPolicy` que modela al jugador
+            capacity: Entradas de la tabla de transposiciones
+        """
+        if tablebase is not None and not tablebase.matches(increment, player_skill_threshold):
+            raise ValueError("La tabla de finales se construyó con otros parámetros")
+        self.tablebase = tablebase
+        self.increment = increment
+        self.player_skill_threshold = player_skill_threshold
+        self.table = TranspositionTable(capacity)
+
+    def value(self, key):
+        """Probabilidad de que gane la IA desde la posición de inicio de turno `key`."""
+        player_numbers, ai_numbers = key[0], key[1]
+        # Si al jugador se le acaban las cartas gana la IA (se comprueba primero)
+        if not player_numbers:
+            return 1.0
+        if not ai_numbers:
+            return 0.0
+
+        entry = self.table.lookup(key)
+        if entry is not None:
+            return entry.value
+        if self.tablebase is not None:
+            value = self.tablebase.lookup(key)
+            if value is not None:
+                return value
+
+        value, card = self._best_card(key)
+        self.table.store(key, value, depth=len(ai_numbers), move=card)
+        return value
+
+    def card_values(self, key):
+        """
+        Valor de cada carta numérica que puede jugar la IA al inicio de turno.
+
+        Returns:
+            dict: {valor de la carta: probabilidad de que gane la IA}
+        """
+        player_numbers, ai_numbers, player_skills, ai_skills, probability = key
+        weight = 1 / len(player_numbers)
+        values = {}
+        for ai_value in sorted(set(ai_numbers)):
+            ai_rest = _without(ai_numbers, ai_value)
+            total = 0.0
+            for player_value in sorted(set(player_numbers)):
+                player_rest = _without(player_numbers, player_value)
+                total += weight * player_numbers.count(player_value) * self._resolve(
+                    player_rest, ai_rest, player_skills, ai_skills, probability,
+                    player_value, ai_value)
+            values[ai_value] = total
+        return values
+
+    def _best_card(self, key):
+        values = self.card_values(key)
+        card = max(values, key=values.get)
+        return values[card], card
+
+    def _resolve(self, player_numbers, ai_numbers, player_skills, ai_skills, probability,
+                 player_value, ai_value):
+        """Valor tras revelar las cartas del turno."""
+        if player_value == ai_value:
+            # Empate: nadie pierde y la probabilidad no sube
+            return self.value((player_numbers, ai_numbers, player_skills, ai_skills, probability))
+        probability = min(probability + self.increment, 100)
+        if player_value < ai_value:
+            return self.player_loss(player_numbers, ai_numbers, player_skills, ai_skills,
+                                    probability, player_value, ai_value)
+        return self.ai_loss(player_numbers, ai_numbers, player_skills, ai_skills,
+                            probability, player_value, ai_value)[0]
+
+    def player_loss(self, player_numbers, ai_numbers, player_skills, ai_skills, probability,
+                    player_value, ai_value):
+        """Valor cuando el jugador ha perdido el turno (nodo de azar del modelo humano)."""
+        total_skills = sum(player_skills)
+        if not total_skills or probability <= self.player_skill_threshold:
+            return self.roulette(PLAYER, (player_numbers, ai_numbers, player_skills,
+                                          ai_skills, probability))
+
+        total = 0.0
+        for skill, count in enumerate(player_skills):
+            if not count:
+                continue
+            key = (player_numbers, ai_numbers, _use_skill(player_skills, skill),
+                   ai_skills, probability)
+            if _skill_loser(SKILL_EFFECTS[skill], player_value, ai_value) == "opponent":
+                value = self.roulette(AI, key)
+            else:
+                value = self.value(key)
+            total += count / total_skills * value
+        return total
+
+    def ai_loss(self, player_numbers, ai_numbers, player_skills, ai_skills, probability,
+                player_value, ai_value):
+        """
+        Valor de cada respuesta de la IA cuando ha perdido el turno.
+
+        Returns:
+            tuple: (mejor valor, mejor habilidad o None para la ruleta, {acción: valor})
+        """
+        key = (player_numbers, ai_numbers, player_skills, ai_skills, probability)
+        options = {None: self.roulette(AI, key)}
+        for skill, count in enumerate(ai_skills):
+            if not count:
+                continue
+            skill_key = (player_numbers, ai_numbers, player_skills,
+                         _use_skill(ai_skills, skill), probability)
+            if _skill_loser(SKILL_EFFECTS[skill], ai_value, player_value) == "opponent":
+                options[skill] = self.roulette(PLAYER, skill_key)
+            else:
+                options[skill] = self.value(skill_key)
+        best = max(options, key=options.get)
+        return options[best], best, options
+
+    def roulette(self, seat, key):
+        """Valor de que `seat` gire la ruleta con la probabilidad de `key`."""
+        death = death_chance(key[4])
+        dead_value = 1.0 if seat == PLAYER else 0.0
+        if death >= 1:
+            return dead_value
+        return death * dead_value + (1 - death) * self.value(key)
+
+    def evaluate(self, game):
+        """
+        Probabilidad exacta de que gane la IA en la posición actual de `game`.
+
+        Vale al inicio de un turno y cuando hay una derrota pendiente de resolver.
+        """
+        if game.game_over or not game.player.alive or not game.ai_player.alive:
+            return 1.0 if game.winner is game.ai_player else 0.0
+        key = position_key(game)
+        if not game.decision_pending:
+            return self.value(key)
+
+        player_value = game.player.played_card.value
+        ai_value = game.ai_player.played_card.value
+        if game.skill_used_this_turn:
+            # Tras una habilidad, el perdedor solo puede girar la ruleta
+            return self.roulette(PLAYER if game.current_loser is game.player else AI, key)
+        if game.current_loser is game.player:
+            return self.player_loss(*key, player_value, ai_value)
+        return self.ai_loss(*key, player_value, ai_value)[0]
+
+
+class SolverPolicy(Policy):
+    """
+    Política de la IA que juega de forma óptima en los finales.
+
+    La IA no ve la mano del jugador: el valor de cada acción se promedia sobre
+    `samples` determinizaciones de esa mano (`determinize`), repartidas con lo
+    que la IA sabe. `Solver.evaluate` y la tabla de finales, en cambio, usan
+    la posición completa y solo sirven como herramientas de análisis.
+
+    Con más cartas numéricas en la mano que `search_cards` delega en
+    `fallback`, porque la búsqueda exacta sería demasiado lenta. Solo
+    decide por el asiento de la IA.
+    """
+
+    def __init__(self, search_cards=4, tablebase=None, fallback=None, solver=None, samples=8,
+                 seed=None):
+        """
+        Args:
+            search_cards: Máximo de cartas numéricas en la mano de la IA para buscar
+            tablebase: `EndgameTablebase` opcional
+            fallback: Política para las posiciones grandes (por defecto `RandomPolicy`)
+            solver: `Solver` a reutilizar (conserva su tabla entre partidas)
+            samples: Determinizaciones de la mano del jugador por decisión
+            seed: Semilla de las determinizaciones (no usa el azar de la partida)
+        """
+        self.search_cards = search_cards
+        self.fallback = fallback or RandomPolicy()
+        self.solver = solver or Solver(tablebase=tablebase)
+        self.samples = samples
+        self.rng = random.Random(seed)
+
+    def _sample_keys(self, game):
+        """
+        Claves de la posición con la mano del jugador repartida al azar `samples` veces.
+
+        Returns:
+            Counter: {clave: veces que salió}
+        """
+        state = game.snapshot()
+        return Counter(state_key(determinize(state, PLAYER, self.rng)) for _ in range(self.samples))
+
+    def choose_card(self, game, player):
+        ai_numbers = _numbers(player)
+        if len(ai_numbers) > self.search_cards or not _numbers(game.player):
+            return self.fallback.choose_card(game, player)
+        totals = dict.fromkeys(ai_numbers, 0.0)
+        for key, weight in self._sample_keys(game).items():
+            for card, value in self.solver.card_values(key).items():
+                totals[card] += weight * value
+        card = max(totals, key=totals.get)
+        return next(i for i, c in enumerate(player.hand)
+                    if c.type == "number" and c.value == card)
+
+    def decide_after_losing(self, game, player):
+        if (len(_numbers(player)) > self.search_cards or game.skill_used_this_turn
+                or game.current_loser is not player):
+            return self.fallback.decide_after_losing(game, player)
+        totals = {}
+        for key, weight in self._sample_keys(game).items():
+            # La carta jugada por el jugador ya está a la vista
+            _, _, options = self.solver.ai_loss(*key, game.player.played_card.value,
+                                                player.played_card.value)
+            for skill, value in options.items():
+                totals[skill] = totals.get(skill, 0.0) + weight * value
+        skill = max(totals, key=totals.get)
+        if skill is None:
+            return {"choice": "roulette"}
+        effect = SKILL_EFFECTS[skill]
+        index = next(i for i, c in enumerate(player.hand)
+                     if c.type == "skill" and c.effect_type == effect)
+        return {"choice": "skill", "card_index": index}
+
+
+def _number_multisets(size):
+    """Multiconjuntos ordenados de `size` valores 1-10 con como mucho dos copias."""
+    return [values for values in combinations_with_replacement(range(1, 11), size)
+            if all(values.count(v) <= 2 for v in set(values))]
+
+
+class EndgameTablebase:
+    """
+    Tabla de finales construida hacia atrás y mapeada en memoria.
+
+    Guarda el valor de inicio de turno de todas las posiciones con hasta
+    `max_cards` cartas numéricas por mano, para cualquier combinación de
+    habilidades y cualquier probabilidad alcanzable de la ruleta. Con k
+    cartas por mano la IA solo puede usar k habilidades más (una por turno),
+    así que sus recuentos se acotan a k; los del jugador se guardan
+    completos porque su elección aleatoria depende de ellos.
+
+    El fichero es un .npy de float32 (NaN = posición no calculada) con los
+    parámetros en un .json al lado.
+    """
+
+    def __init__(self, path):
+        """Abre una tabla ya construida en modo solo lectura."""
+        import numpy as np
+
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        self._configure(meta)
+        self.values = np.load(path, mmap_mode="r")
+
+    def _configure(self, meta):
+        self.meta = meta
+        self.max_cards = meta["max_cards"]
+        self.increment = meta["increment"]
+        self.player_skill_threshold = meta["player_skill_threshold"]
+        self.probabilities = {p: i for i, p in enumerate(meta["probabilities"])}
+        self.sections = {}
+        offset = 0
+        for size in range(1, self.max_cards + 1):
+            ranks = {values: i for i, values in enumerate(_number_multisets(size))}
+            ai_cap = min(size, 2)
+            shape = (len(ranks), len(ranks), 3 ** len(SKILL_EFFECTS),
+                     (ai_cap + 1) ** len(SKILL_EFFECTS), len(self.probabilities))
+            count = 1
+            for dim in shape:
+                count *= dim
+            self.sections[size] = (offset, ranks, ai_cap, shape)
+            offset += count
+        self.size = offset
+
+    def matches(self, increment, player_skill_threshold):
+        return (self.increment == increment
+                and self.player_skill_threshold == player_skill_threshold)
+
+    def index(self, key):
+        """Posición de `key` en el fichero, o None si la tabla no la cubre."""
+        player_numbers, ai_numbers, player_skills, ai_skills, probability = key
+        section = self.sections.get(len(ai_numbers))
+        level = self.probabilities.get(probability)
+        if section is None or level is None or len(player_numbers) != len(ai_numbers):
+            return None
+        offset, ranks, ai_cap, shape = section
+        player_rank = ranks.get(player_numbers)
+        ai_rank = ranks.get(ai_numbers)
+        if player_rank is None or ai_rank is None:
+            return None
+
+        player_skill_index = 0
+        for count in reversed(player_skills):
+            player_skill_index = player_skill_index * 3 + min(count, 2)
+        ai_skill_index = 0
+        for count in reversed(ai_skills):
+            ai_skill_index = ai_skill_index * (ai_cap + 1) + min(count, ai_cap)
+
+        index = player_rank
+        for value, dim in zip((ai_rank, player_skill_index, ai_skill_index, level), shape[1:]):
+            index = index * dim + value
+        return offset + index
+
+    def lookup(self, key):
+        """Valor de la posición `key`, o None si no está en la tabla."""
+        index = self.index(key)
+        if index is None:
+            return None
+        value = float(self.values[index])
+        return None if value != value else value
+
+    @classmethod
+    def build(cls, path, max_cards=1, initial_probability=1, increment=10,
+              player_skill_threshold=20, verbose=False):
+        """
+        Construye la tabla hacia atrás: primero las posiciones con una carta
+        por mano y después las de k cartas, resueltas con la tabla ya
+        calculada para k - 1.
+
+        Args:
+            path: Fichero .npy de salida (los parámetros se guardan en `path + ".json"`)
+            max_cards: Cartas numéricas por mano de las posiciones más grandes.
+                Con 1 son 1,4 millones de posiciones; con 2 ya son más de 200 millones
+            initial_probability: Probabilidad inicial de la ruleta (%)
+            increment: Incremento de la ruleta por turno (%)
+            player_skill_threshold: Umbral de `RandomPolicy` que modela al jugador
+
+        Returns:
+            EndgameTablebase: La tabla, abierta en modo solo lectura
+        """
+        import numpy as np
+
+        probabilities = []
+        probability = initial_probability
+        while probability < 100:
+            probabilities.append(probability)
+            probability += increment
+        probabilities.append(100)
+        meta = {
+            "max_cards": max_cards,
+            "initial_probability": initial_probability,
+            "increment": increment,
+            "player_skill_threshold": player_skill_threshold,
+            "probabilities": probabilities,
+        }
+
+        table = cls.__new__(cls)
+        table._configure(dict(meta, max_cards=0))
+        full = cls.__new__(cls)
+        full._configure(meta)
+        values = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                           shape=(full.size,))
+        values[:] = np.nan
+        table.values = values
+
+        skill_vectors = [_skill_vector(i, 3) for i in range(3 ** len(SKILL_EFFECTS))]
+        for size in range(1, max_cards + 1):
+            start = time.perf_counter()
+            # Las posiciones de este nivel solo dependen de los niveles ya construidos
+            solver = Solver(tablebase=table, increment=increment,
+                            player_skill_threshold=player_skill_threshold)
+            offset, ranks, ai_cap, shape = full.sections[size]
+            ai_vectors = [_skill_vector(i, ai_cap + 1) for i in range(shape[3])]
+            index = offset
+            for player_numbers in ranks:
+                for ai_numbers in ranks:
+                    for player_skills in skill_vectors:
+                        for ai_skills in ai_vectors:
+                            for probability in probabilities:
+                                key = (player_numbers, ai_numbers, player_skills,
+                                       ai_skills, probability)
+                                values[index] = solver._best_card(key)[0]
+                                index += 1
+                # La tabla de transposiciones solo sirve dentro de un mismo nivel
+                solver.table.clear()
+            table._configure(dict(meta, max_cards=size))
+            if verbose:
+                print(f"Nivel {size}: {shape} en {time.perf_counter() - start:.1f} s")
+
+        values.flush()
+        del values
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        return cls(path)
+
+
+def _skill_vector(index, base):
+    vector = []
+    for _ in SKILL_EFFECTS:
+        vector.append(index % base)
+        index //= base
+    return tuple(vector)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solver exacto y tabla de finales")
+    parser.add_argument("--build-tablebase", metavar="FICHERO", help="Construye la tabla de finales")
+    parser.add_argument("--max-cards", type=int, default=1, help="Cartas por mano de la tabla")
+    parser.add_argument("--tablebase", metavar="FICHERO", help="Tabla de finales a usar")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla de la partida a analizar")
+    parser.add_argument("--cards", type=int, default=3,
+                        help="Se juega al azar hasta que la IA tenga estas cartas numéricas")
+    args = parser.parse_args()
+
+    if args.build_tablebase:
+        start = time.perf_counter()
+        EndgameTablebase.build(args.build_tablebase, max_cards=args.max_cards, verbose=True)
+        print(f"Tabla construida en {time.perf_counter() - start:.1f} s")
+        return
+
+    from .game_logic import Game
+    from .simulation import _resolve_player_loss, _resolve_ai_loss
+
+    tablebase = EndgameTablebase(args.tablebase) if args.tablebase else None
+    solver = Solver(tablebase=tablebase)
+    game = Game(seed=args.seed)
+    game.setup_game()
+    policy = RandomPolicy()
+    # Juega al azar, como en el simulador, hasta llegar a un final
+    while not game.is_game_over() and len(_numbers(game.ai_player)) > args.cards:
+        game.play_turn(policy.choose_card(game, game.player))
+        if game.current_loser is game.player:
+            _resolve_player_loss(game, policy)
+        elif game.current_loser is game.ai_player:
+            _resolve_ai_loss(game)
+    if game.is_game_over():
+        print("La partida terminó antes de llegar al final")
+        return
+
+    start = time.perf_counter()
+    key = position_key(game)
+    print(f"Posición: {key}")
+    for card, value in solver.card_values(key).items():
+        print(f"  IA juega {card}: gana la IA con probabilidad {value:.4f}")
+    print(f"Valor: {solver.evaluate(game):.4f} ({time.perf_counter() - start:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Instantánea compacta e inmutable del estado de una partida.
+
+`GameState` es una tupla con nombre: las manos son tuplas de enteros pequeños
+y el resto del estado son escalares, así que se puede usar como clave de
+diccionario y "clonarla" no cuesta nada (es inmutable). Los estados derivados
+se obtienen con `_replace` y se vuelcan sobre un `Game` con `restore`.
+
+Codificación de cartas:
+    - Carta numérica: su valor (1-10, hasta 20 tras Aumento/Duplicar)
+    - Carta de habilidad: SKILL_CODE_BASE + índice en SKILL_DEFINITIONS
+    - Sin carta: NO_CARD
+"""
+from collections import namedtuple
+from itertools import count
+
+from .card import NumberCard, SkillCard, SKILL_DEFINITIONS
+
+NO_CARD = 0
+SKILL_CODE_BASE = 100  # Igual que los IDs de las cartas de habilidad
+SKILL_CODES = {skill["effect"]: SKILL_CODE_BASE + i for i, skill in enumerate(SKILL_DEFINITIONS)}
+
+# Códigos de asiento para el perdedor del turno y el ganador
+NOBODY, PLAYER, AI = 0, 1, 2
+
+# Baraja completa: dos copias de cada número y de cada habilidad (ver Game.setup_game)
+DECK_CODES = tuple(value for value in range(1, 11) for _ in range(2)) + \
+    tuple(code for code in SKILL_CODES.values() for _ in range(2))
+
+
+def encode_card(card):
+    """Codifica una carta como entero pequeño."""
+    if card is None:
+        return NO_CARD
+    if card.type == "number":
+        return card.value
+    return SKILL_CODES[card.effect_type]
+
+
+def decode_card(code, card_id):
+    """
+    Crea la carta correspondiente a un código de `encode_card`.
+
+    Las cartas de habilidad no cambian nunca, así que se comparte una única
+    instancia por tipo; las numéricas se crean nuevas porque las habilidades
+    modifican su valor.
+    """
+    if code == NO_CARD:
+        return None
+    if code < SKILL_CODE_BASE:
+        return NumberCard(card_id, code)
+    return _SKILL_CARDS[code]
+
+
+_SKILL_CARDS = {
+    SKILL_CODE_BASE + i: SkillCard(SKILL_CODE_BASE + i, skill["name"], skill["desc"], skill["effect"])
+    for i, skill in enumerate(SKILL_DEFINITIONS)
+}
+
+
+def is_skill_code(code):
+    return code >= SKILL_CODE_BASE
+
+
+def determinize(state, hidden_seat, rng):
+    """
+    Reparte al azar la mano oculta de `hidden_seat` de forma compatible con
+    lo que ve el otro asiento: su propia mano, las cartas que ya han salido del
+    juego y cuántas cartas numéricas y de habilidad tiene el rival.
+
+    Args:
+        state: `GameState` de la partida
+        hidden_seat: PLAYER o AI, el asiento cuya mano no se conoce
+        rng: Generador `random.Random`
+
+    Returns:
+        GameState: La misma posición con la mano oculta sustituida
+    """
+    if hidden_seat == PLAYER:
+        hidden, known = state.player_hand, state.ai_hand
+    else:
+        hidden, known = state.ai_hand, state.player_hand
+    pool = list(DECK_CODES)
+    for code in known + state.discard_pile:
+        pool.remove(code)
+    numbers = [code for code in pool if not is_skill_code(code)]
+    skills = [code for code in pool if is_skill_code(code)]
+    hidden_numbers = sum(1 for code in hidden if not is_skill_code(code))
+    hand = tuple(rng.sample(numbers, hidden_numbers) + rng.sample(skills, len(hidden) - hidden_numbers))
+    if hidden_seat == PLAYER:
+        return state._replace(player_hand=hand)
+    return state._replace(ai_hand=hand)
+
+
+_GameStateBase = namedtuple("_GameStateBase", [
+    "player_hand",      # tuple de códigos de carta, en el orden de la mano
+    "ai_hand",
+    "player_played",    # código de la carta jugada en el turno actual
+    "ai_played",
+    "player_alive",
+    "ai_alive",
+    "probability",      # probabilidad actual de la ruleta (%)
+    "turn_count",
+    "current_loser",    # NOBODY, PLAYER o AI
+    "skill_used",
+    "decision_pending", # el perdedor aún debe usar habilidad o ruleta
+    "game_over",
+    "winner",           # NOBODY, PLAYER o AI
+    "discard_pile",     # códigos de las cartas que ya salieron del juego
+])
+
+
+class GameState(_GameStateBase):
+    """Instantánea inmutable y hashable del estado completo de una partida."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_game(cls, game):
+        """Captura el estado de `game`."""
+        player, ai = game.player, game.ai_player
+        return cls(
+            tuple(map(encode_card, player.hand)),
+            tuple(map(encode_card, ai.hand)),
+            encode_card(player.played_card),
+            encode_card(ai.played_card),
+            player.alive,
+            ai.alive,
+            game.roulette.current_probability,
+            game.turn_count,
+            _seat_code(game, game.current_loser),
+            game.skill_used_this_turn,
+            game.decision_pending,
+            game.game_over,
+            _seat_code(game, game.winner),
+            tuple(game.discard_pile),
+        )
+
+    def clone(self):
+        """Las instantáneas son inmutables: clonar es devolver la misma tupla."""
+        return self
+
+    def restore(self, game):
+        """
+        Vuelca este estado sobre `game`, creando cartas nuevas.
+
+        Los IDs de las cartas se reasignan: no forman parte del estado de juego.
+        """
+        player, ai = game.player, game.ai_player
+        ids = count()
+        player.hand = [decode_card(code, next(ids)) for code in self.player_hand]
+        ai.hand = [decode_card(code, next(ids)) for code in self.ai_hand]
+        player.played_card = decode_card(self.player_played, next(ids))
+        ai.played_card = decode_card(self.ai_played, next(ids))
+        player.alive = self.player_alive
+        ai.alive = self.ai_alive
+        game.roulette.current_probability = self.probability
+        game.turn_count = self.turn_count
+        game.current_loser = _seat_player(game, self.current_loser)
+        game.skill_used_this_turn = self.skill_used
+        game.decision_pending = self.decision_pending
+        game.game_over = self.game_over
+        game.winner = _seat_player(game, self.winner)
+        game.current_player = player
+        game.discard_pile = list(self.discard_pile)
+        game.zobrist.reset(game)
+        return game
+
+    def to_game(self, **kwargs):
+        """Crea un `Game` nuevo en este estado (`kwargs` se pasan a `Game`)."""
+        from .game_logic import Game
+        return self.restore(Game(**kwargs))
+
+    def hand(self, seat):
+        return self.player_hand if seat == PLAYER else self.ai_hand
+
+
+def _seat_code(game, player):
+    if player is None:
+        return NOBODY
+    return PLAYER if player is game.player else AI
+
+
+def _seat_player(game, code):
+    if code == NOBODY:
+        return None
+    return game.player if code == PLAYER else game.ai_player
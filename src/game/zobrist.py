@@ -0,0 +1,200 @@
+"""
+Hash Zobrist de posiciones y tabla de transposiciones acotada.
+
+Cada componente de la posición tiene una clave aleatoria de 64 bits y el
+hash es el XOR de las claves presentes. Las manos se tratan como multiconjuntos:
+la k-ésima copia de un código de carta tiene su propia clave, de modo que dos
+órdenes de juego que dejan las mismas cartas dan el mismo hash.
+
+`ZobristTracker` mantiene de forma incremental la parte de las manos (cada
+carta que sale o vuelve a una mano es un XOR); el resto de la posición son
+unos pocos escalares que se combinan en O(1) al pedir el hash. `Game` actualiza
+su tracker en `play_turn`, `Player.use_skill_card`, `setup_game`, `restore` y
+`unmake_move`.
+"""
+from collections import OrderedDict, namedtuple
+
+from .rng import derive_seed
+from .state import encode_card, NO_CARD, PLAYER, AI
+
+KEY_SEED = 0x5A0B157  # Semilla fija: los hashes son estables entre procesos y partidas
+
+_KEYS = {}
+
+
+def zobrist_key(*parts):
+    """Clave de 64 bits (estable) para un componente de la posición."""
+    try:
+        return _KEYS[parts]
+    except KeyError:
+        key = _KEYS[parts] = derive_seed(KEY_SEED, "zobrist", *parts)
+        return key
+
+
+_SKILL_USED_KEY = zobrist_key("skill_used")
+_PENDING_KEY = zobrist_key("pending")
+
+
+class ZobristTracker:
+    """Hash incremental de las dos manos de una partida."""
+
+    def __init__(self):
+        self.hand_hash = 0
+        self.counts = {PLAYER: {}, AI: {}}
+
+    def reset(self, game):
+        """Recalcula el hash de las manos desde cero."""
+        self.hand_hash = 0
+        self.counts = {PLAYER: {}, AI: {}}
+        for seat, player in ((PLAYER, game.player), (AI, game.ai_player)):
+            for card in player.hand:
+                self.add(seat, encode_card(card))
+
+    def add(self, seat, code):
+        """Registra que una carta entra en la mano de `seat`."""
+        counts = self.counts[seat]
+        copy = counts.get(code, 0)
+        self.hand_hash ^= zobrist_key("hand", seat, code, copy)
+        counts[code] = copy + 1
+
+    def remove(self, seat, code):
+        """Registra que una carta sale de la mano de `seat`."""
+        counts = self.counts[seat]
+        copy = counts[code] - 1
+        self.hand_hash ^= zobrist_key("hand", seat, code, copy)
+        counts[code] = copy
+
+    def position_hash(self, game):
+        """Hash de la posición completa: manos más los escalares de `game`."""
+        h = self.hand_hash ^ zobrist_key("probability", game.roulette.current_probability)
+        player, ai = game.player, game.ai_player
+        if player.played_card is not None:
+            h ^= zobrist_key("played", PLAYER, player.played_card.value)
+        if ai.played_card is not None:
+            h ^= zobrist_key("played", AI, ai.played_card.value)
+        if game.current_loser is not None:
+            h ^= zobrist_key("loser", PLAYER if game.current_loser is player else AI)
+        if game.skill_used_this_turn:
+            h ^= _SKILL_USED_KEY
+        if game.decision_pending:
+            h ^= _PENDING_KEY
+        if not player.alive:
+            h ^= zobrist_key("dead", PLAYER)
+        if not ai.alive:
+            h ^= zobrist_key("dead", AI)
+        return h
+
+
+def full_hash(game):
+    """Hash de la posición de `game` calculado desde cero (para verificación)."""
+    tracker = ZobristTracker()
+    tracker.reset(game)
+    return tracker.position_hash(game)
+
+
+def state_hash(state):
+    """Hash Zobrist de una instantánea `GameState`, igual al de la partida que describe."""
+    h = zobrist_key("probability", state.probability)
+    for seat, hand in ((PLAYER, state.player_hand), (AI, state.ai_hand)):
+        counts = {}
+        for code in hand:
+            copy = counts.get(code, 0)
+            h ^= zobrist_key("hand", seat, code, copy)
+            counts[code] = copy + 1
+    if state.player_played != NO_CARD:
+        h ^= zobrist_key("played", PLAYER, state.player_played)
+    if state.ai_played != NO_CARD:
+        h ^= zobrist_key("played", AI, state.ai_played)
+    if state.current_loser in (PLAYER, AI):
+        h ^= zobrist_key("loser", state.current_loser)
+    if state.skill_used:
+        h ^= _SKILL_USED_KEY
+    if state.decision_pending:
+        h ^= _PENDING_KEY
+    if not state.player_alive:
+        h ^= zobrist_key("dead", PLAYER)
+    if not state.ai_alive:
+        h ^= zobrist_key("dead", AI)
+    return h
+
+
+TTEntry = namedtuple("TTEntry", ["value", "depth", "move"])
+
+
+class TranspositionTable:
+    """
+    Tabla de transposiciones acotada.
+
+    Política de reemplazo:
+        - Misma clave: se conserva la entrada de mayor profundidad de búsqueda
+          (a igual profundidad gana la más reciente).
+        - Tabla llena: se expulsa la entrada usada hace más tiempo (LRU), de
+          modo que las posiciones de turnos y partidas anteriores ceden su
+          sitio a las actuales.
+    """
+
+    def __init__(self, capacity=1 << 20):
+        """
+        Args:
+            capacity: Número máximo de entradas
+        """
+        if capacity <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, min_depth=0):
+        """
+        Busca una posición.
+
+        Args:
+            key: Hash de la posición
+            min_depth: Profundidad mínima exigida a la entrada
+
+        Returns:
+            TTEntry: La entrada guardada, o None si no hay una suficientemente profunda
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.depth < min_depth:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key, value, depth=0, move=None):
+        """Guarda la evaluación de una posición según la política de reemplazo."""
+        entries = self._entries
+        old = entries.get(key)
+        if old is not None:
+            if depth < old.depth:
+                entries.move_to_end(key)
+                return
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[key] = TTEntry(value, depth, move)
+        entries.move_to_end(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """Devuelve el tamaño y la tasa de aciertos de la tabla."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -6,18 +6,60 @@ import pygame
 from game.game_logic import Game
 from ui.screens import GameScreen
 from ai.gemini_player import AIPlayerWithGemini  # Cambiado a Gemini
+from ai.ai_player import AIPlayerWithOllama
+from ai.http_client import close_session
+from ai.decision_cache import DecisionCache
+from ai.coordinator import DecisionCoordinator
+from ai.mcts_player import ISMCTSPlayer
+from ai.llm_policy import LLMPolicy
+from ai.decision_worker import DecisionWorker
+from ui.advisor import Advisor
+from utils.logging_setup import setup_logging, shutdown_logging
+from config.settings import (MCTS_TIME_BUDGET, MCTS_WORKERS, ADVISOR_ENABLED, ADVISOR_MAX_ROLLOUTS,
+                             AI_BACKEND, AI_DECISION_DEADLINE, DECISION_CACHE_PATH, DECISION_CACHE_SIZE,
+                             DECISION_CACHE_TTL, LOG_LEVEL, LOG_DIR, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+                             LOG_PAYLOAD_SAMPLE_RATE)
+
+def build_ai_policy(backend, decision_cache=None):
+    """Crea la política de la IA según `AI_BACKEND`."""
+    if backend == "gemini":
+        llm_player = AIPlayerWithGemini(decision_cache=decision_cache)
+    elif backend == "ollama":
+        llm_player = AIPlayerWithOllama(decision_cache=decision_cache)
+    else:
+        llm_player = None
+    if llm_player is not None:
+        # La conexión se abre mientras se carga la interfaz
+        llm_player.warm_up()
+        # Si el modelo no responde a tiempo decide la IA local
+        return DecisionCoordinator(LLMPolicy(llm_player), deadline=AI_DECISION_DEADLINE)
+    # IA local (no necesita red)
+    return ISMCTSPlayer(time_budget=MCTS_TIME_BUDGET, workers=MCTS_WORKERS)
 
 def main():
     """Función principal que inicia el juego."""
-    # Inicializar el juego
-    game = Game()
+    # Registro en segundo plano: escribir en disco no retrasa las decisiones
+    setup_logging(LOG_LEVEL, LOG_DIR, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                  payload_sample_rate=LOG_PAYLOAD_SAMPLE_RATE)
+    
+    # Las decisiones de los modelos se reutilizan entre partidas y sesiones
+    decision_cache = None
+    if AI_BACKEND in ("gemini", "ollama"):
+        decision_cache = DecisionCache(capacity=DECISION_CACHE_SIZE, ttl=DECISION_CACHE_TTL,
+                                       path=DECISION_CACHE_PATH)
+    ai_policy = build_ai_policy(AI_BACKEND, decision_cache)
+    game = Game(ai_policy=ai_policy)
+    
+    # Las decisiones de la IA se calculan en otro hilo para no congelar la ventana
+    decision_worker = DecisionWorker()
     
-    # Inicializar la IA con Gemini
-    ai_player = AIPlayerWithGemini()  # Usamos Gemini en lugar de Ollama
-    ai_player.initialize_conversation()
+    # Asesor de probabilidad de victoria en segundo plano (opcional)
+    advisor = Advisor(max_rollouts=ADVISOR_MAX_ROLLOUTS) if ADVISOR_ENABLED else None
+    if advisor is not None:
+        advisor.start()
     
     # Inicializar la interfaz gráfica
-    game_screen = GameScreen(game)
+    game_screen = GameScreen(game, advisor=advisor, decision_worker=decision_worker)
     
     # Ejecutar el juego
     try:
@@ -25,7 +67,15 @@ def main():
     except Exception as e:
         print(f"Error durante la ejecución: {e}")
     finally:
+        decision_worker.shutdown()
+        ai_policy.close()
+        close_session()
+        if decision_cache is not None:
+            decision_cache.save()
+        if advisor is not None:
+            advisor.stop()
         pygame.quit()
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Asesor de probabilidad de victoria para el jugador humano.
+
+Un proceso trabajador estima, con partidas simuladas desde la posición
+actual, la probabilidad de ganar de cada opción del jugador (cada carta
+numérica al inicio del turno; cada habilidad y la ruleta tras perder). La
+mano de la IA no se mira: en cada partida simulada se reparte al azar entre
+las cartas que el jugador no ha visto. En las simulaciones ambos asientos
+juegan como `RandomPolicy`.
+
+La comunicación con el trabajador es siempre asíncrona:
+    - `analyze` envía una posición nueva con un número de generación; el
+      trabajador abandona el trabajo de generaciones anteriores.
+    - `focus` pide más partidas para la opción bajo el ratón.
+    - `poll` recoge sin bloquear las estimaciones acumuladas y descarta las
+      de posiciones antiguas.
+
+El trabajo se hace en otro proceso para no competir por el GIL con el bucle
+de `GameScreen.run`.
+"""
+import logging
+import multiprocessing
+import queue
+import random
+import time
+
+from game.game_logic import Game
+from game.policies import RandomPolicy
+from game.simulation import finish_match
+from game.state import AI, PLAYER, determinize, is_skill_code, SKILL_CODES
+
+CODE_EFFECTS = {code: effect for effect, code in SKILL_CODES.items()}
+ROULETTE = ("roulette",)
+
+
+def player_options(state):
+    """
+    Opciones del jugador humano en una posición, o [] si no le toca decidir.
+
+    Returns:
+        list: ("card", valor), ("skill", efecto) o ("roulette",)
+    """
+    if state.game_over or not state.player_alive or not state.ai_alive:
+        return []
+    if not state.decision_pending:
+        return [("card", value) for value in sorted({code for code in state.player_hand
+                                                     if not is_skill_code(code)})]
+    if state.current_loser != PLAYER or state.skill_used:
+        return []
+    skills = sorted({CODE_EFFECTS[code] for code in state.player_hand if is_skill_code(code)})
+    return [ROULETTE] + [("skill", effect) for effect in skills]
+
+
+def card_option(card, decision_pending):
+    """Opción que corresponde a jugar o usar `card` en la situación actual."""
+    if card.type == "number":
+        return None if decision_pending else ("card", card.value)
+    return ("skill", card.effect_type) if decision_pending else None
+
+
+class Advisor:
+    """Estimador de probabilidad de victoria en segundo plano."""
+
+    def __init__(self, max_rollouts=4000, batch_size=40):
+        """
+        Args:
+            max_rollouts: Partidas simuladas por opción antes de dar la estimación por
+                buena. La opción enfocada sigue refinándose hasta el cuádruple
+            batch_size: Partidas entre dos comprobaciones de mensajes en el trabajador
+        """
+        self.max_rollouts = max_rollouts
+        self.batch_size = batch_size
+        self.generation = 0
+        self.estimates = {}  # opción -> (victorias, partidas)
+        self._position = None
+        self._focus = None
+        self._process = None
+        self._requests = None
+        self._results = None
+
+    def start(self):
+        """Arranca el proceso trabajador."""
+        if self._process is not None:
+            return
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self._process = context.Process(
+            target=_worker,
+            args=(self._requests, self._results, self.max_rollouts, self.batch_size),
+            daemon=True,
+        )
+        self._process.start()
+
+    def analyze(self, state):
+        """
+        Pide analizar la posición `state` (un `GameState`) si ha cambiado.
+
+        No bloquea: las estimaciones llegan más tarde a través de `poll`.
+        """
+        if state == self._position:
+            return
+        self._position = state
+        self._focus = None
+        self.generation += 1
+        self.estimates = {}
+        if self._requests is not None:
+            self._requests.put(("position", self.generation, state))
+
+    def focus(self, option):
+        """Concentra el trabajo en `option` (por ejemplo, la carta bajo el ratón)."""
+        if option == self._focus or self._position is None:
+            return
+        self._focus = option
+        if self._requests is not None:
+            self._requests.put(("focus", self.generation, option))
+
+    def cancel(self):
+        """Abandona la posición actual (por ejemplo, al terminar la partida)."""
+        if self._position is None:
+            return
+        self._position = None
+        self.generation += 1
+        self.estimates = {}
+        if self._requests is not None:
+            self._requests.put(("idle", self.generation, None))
+
+    def poll(self):
+        """
+        Recoge sin bloquear los resultados pendientes del trabajador.
+
+        Returns:
+            dict: {opción: probabilidad de victoria estimada} de la posición actual
+        """
+        if self._results is not None:
+            while True:
+                try:
+                    generation, estimates = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if generation == self.generation:
+                    self.estimates = estimates
+        return self.win_rates()
+
+    def win_rates(self):
+        return {option: wins / games for option, (wins, games) in self.estimates.items() if games}
+
+    def stop(self):
+        """Detiene el proceso trabajador."""
+        if self._process is None:
+            return
+        self._requests.put(("stop", self.generation, None))
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        self._requests = None
+        self._results = None
+
+
+def _worker(requests, results, max_rollouts, batch_size, report_interval=0.1):
+    """Bucle del proceso trabajador: simula partidas de la posición más reciente."""
+    # Las partidas simuladas no deben llenar el registro del juego
+    logging.disable(logging.INFO)
+    rng = random.Random()
+    game = Game(rng=rng)
+    policy = RandomPolicy()
+    generation, state, options, focus = None, None, [], None
+    stats = {}
+    last_report = 0.0
+
+    def pending():
+        return [o for o in options
+                if stats[o][1] < (max_rollouts * 4 if o == focus else max_rollouts)]
+
+    while True:
+        # Sin trabajo pendiente se espera bloqueado al siguiente mensaje
+        done = not pending()
+        try:
+            message = requests.get() if done else requests.get_nowait()
+        except queue.Empty:
+            message = None
+        while message is not None:
+            kind, message_generation, payload = message
+            if kind == "stop":
+                return
+            if kind == "position":
+                generation, state, focus = message_generation, payload, None
+                options = player_options(state)
+                stats = {option: [0, 0] for option in options}
+            elif kind == "idle":
+                generation, state, options, focus = message_generation, None, [], None
+            elif kind == "focus" and message_generation == generation and payload in stats:
+                focus = payload
+            try:
+                message = requests.get_nowait()
+            except queue.Empty:
+                message = None
+
+        options_left = pending()
+        if not options_left:
+            continue
+
+        # La opción enfocada recibe la mitad del lote; el resto se reparte
+        for i in range(batch_size):
+            if focus in options_left and i % 2 == 0:
+                option = focus
+            else:
+                option = options_left[i % len(options_left)]
+            stats[option][0] += _rollout(game, state, option, policy, rng)
+            stats[option][1] += 1
+
+        now = time.perf_counter()
+        if not pending() or now - last_report >= report_interval:
+            results.put((generation, {o: tuple(s) for o, s in stats.items()}))
+            last_report = now
+
+
+def _rollout(game, state, option, policy, rng):
+    """Juega una partida desde `state` empezando por `option`; devuelve 1 si gana el jugador."""
+    determinize(state, AI, rng).restore(game)
+    player = game.player
+    if option[0] == "card":
+        index = next(i for i, card in enumerate(player.hand)
+                     if card.type == "number" and card.value == option[1])
+        game.play_turn(index)
+    elif option[0] == "skill":
+        index = next(i for i, card in enumerate(player.hand)
+                     if card.type == "skill" and card.effect_type == option[1])
+        player.use_skill_card(index, game, game.ai_player)
+    else:
+        game.use_roulette(player)
+    return 1 if finish_match(game, policy)["winner"] == "player" else 0
@@ -1,5 +1,6 @@
 import pygame
 from config.settings import BLACK
+from ui.text_cache import render_text
 
 class Button:
     """Clase para crear botones interactivos."""
@@ -21,10 +22,19 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, 0, 10)
         pygame.draw.rect(screen, BLACK, self.rect, 2, 10)
         
-        text_surf = font.render(self.text, True, self.text_color)
+        text_surf = render_text(font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
     
+    def bounds(self, font):
+        """Zona que ocupa el botón, incluido el texto si es más ancho que él."""
+        text_rect = render_text(font, self.text, self.text_color).get_rect(center=self.rect.center)
+        return self.rect.union(text_rect)
+    
+    def render_state(self):
+        """Lo que cambia el aspecto del botón (para el dibujado por zonas)."""
+        return (self.text, self.hovered, self.active)
+    
     def check_hover(self, pos):
         if not self.active:
             return False
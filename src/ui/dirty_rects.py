@@ -0,0 +1,114 @@
+"""
+Dibujado por rectángulos sucios para `GameScreen`.
+
+En cada fotograma la pantalla describe lo que hay que dibujar como una
+lista de `DrawItem` en orden de pintado. Cada elemento indica la zona que
+ocupa (`rect`) y un `state` que cambia cuando cambia su aspecto. Al comparar
+con el fotograma anterior:
+    - un elemento nuevo ensucia su zona; uno que desaparece, la que ocupaba;
+    - un elemento que se mueve o cambia de `state` ensucia la zona vieja y la
+      nueva.
+Solo en esas zonas (unidas cuando se solapan) se repone el fondo y se
+vuelven a dibujar, recortados a la zona, los elementos que las tocan, en su
+orden. La ventana se actualiza con `pygame.display.update(zonas)`; si nada ha
+cambiado no se dibuja ni se envía nada.
+"""
+from collections import namedtuple
+
+import pygame
+
+# key: identifica el elemento entre fotogramas; rect: zona que ocupa (incluidas
+# sombras y textos); state: valor comparable que cambia si cambia su aspecto;
+# draw: función sin argumentos que lo dibuja en la pantalla
+DrawItem = namedtuple("DrawItem", "key rect state draw")
+
+
+def merge_rects(rects):
+    """Une los rectángulos que se solapan hasta que no quede ninguno solapado."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Redibuja y envía a la ventana solo las zonas que cambian entre fotogramas."""
+
+    def __init__(self, screen, paint_background):
+        """
+        Args:
+            screen: Superficie de la ventana
+            paint_background: Función `(superficie)` que dibuja el fondo estático
+        """
+        self.screen = screen
+        self.paint_background = paint_background
+        self.background = None
+        self.previous = None  # key -> (rect, state) del último fotograma
+        self.frames = 0
+        self.updated_area = 0  # Píxeles enviados a la ventana en total
+
+    def invalidate(self):
+        """Obliga a redibujar la pantalla completa en el próximo fotograma."""
+        self.previous = None
+
+    def render(self, items):
+        """
+        Dibuja un fotograma.
+
+        Args:
+            items: Lista de `DrawItem` en orden de pintado
+
+        Returns:
+            list: Zonas de la pantalla actualizadas
+        """
+        self.frames += 1
+        current = {item.key: (pygame.Rect(item.rect), item.state) for item in items}
+        if self.background is None:
+            self.background = pygame.Surface(self.screen.get_size()).convert()
+            self.paint_background(self.background)
+
+        if self.previous is None:
+            self.screen.blit(self.background, (0, 0))
+            for item in items:
+                item.draw()
+            pygame.display.flip()
+            self.previous = current
+            self.updated_area += self.screen.get_width() * self.screen.get_height()
+            return [self.screen.get_rect()]
+
+        dirty = []
+        for key, (rect, state) in current.items():
+            old = self.previous.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif old[0] != rect or old[1] != state:
+                dirty.append(old[0])
+                dirty.append(rect)
+        for key, (rect, _) in self.previous.items():
+            if key not in current:
+                dirty.append(rect)
+        self.previous = current
+
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in merge_rects(dirty)]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        if not dirty:
+            return []
+
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.blit(self.background, area, area)
+            for item in items:
+                if area.colliderect(current[item.key][0]):
+                    item.draw()
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        self.updated_area += sum(rect.width * rect.height for rect in dirty)
+        return dirty
@@ -8,15 +8,11 @@ import logging
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from config.settings import *
 from ui.buttons import Button
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("juego_ia.log"),
-        logging.StreamHandler()
-    ]
-)
+from ui.dirty_rects import DirtyRectRenderer, DrawItem
+from ui.sprite_atlas import SpriteAtlas
+from ui.text_cache import get_font, render_text
+from ui.advisor import card_option, ROULETTE
+from ai.decision_worker import random_card
 
 class Button:
     """Clase para crear botones interactivos."""
@@ -37,10 +33,19 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, 0, 10)
         pygame.draw.rect(screen, BLACK, self.rect, 2, 10)
         
-        text_surf = font.render(self.text, True, self.text_color)
+        text_surf = render_text(font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
     
+    def bounds(self, font):
+        """Zona que ocupa el botón, incluido el texto si es más ancho que él."""
+        text_rect = render_text(font, self.text, self.text_color).get_rect(center=self.rect.center)
+        return self.rect.union(text_rect)
+    
+    def render_state(self):
+        """Lo que cambia el aspecto del botón (para el dibujado por zonas)."""
+        return (self.text, self.hovered, self.active)
+    
     def check_hover(self, pos):
         self.hovered = self.rect.collidepoint(pos)
         return self.hovered
@@ -55,6 +60,9 @@ class Button:
     def set_active(self, active):
         self.active = active
 
+# Caras de las cartas ya dibujadas; cada casilla deja sitio a la sombra
+card_atlas = SpriteAtlas((CARD_WIDTH + 3, CARD_HEIGHT + 3))
+
 class Card:
     """Representación visual de una carta."""
     def __init__(self, x, y, card_data, is_face_up=True, is_ai_card=False):
@@ -86,59 +94,88 @@ class Card:
         # Actualizar posición Y de la carta según el hover_offset
         self.rect.y = self.original_y - self.hover_offset
         
+    def current_color(self):
+        """Color de la carta según su estado (normal, hover o seleccionada)."""
+        if self.selected:
+            return self.selected_color
+        if self.hovered and not self.is_ai_card:
+            return self.hover_color
+        return self.color
+    
+    def bounds(self):
+        """Zona que ocupa la carta, sombra incluida."""
+        return pygame.Rect(self.rect.x, self.rect.y, self.rect.width + self.card_shadow_offset,
+                           self.rect.height + self.card_shadow_offset)
+    
+    def render_state(self, font):
+        """Lo que cambia el aspecto de la carta (para el dibujado por zonas)."""
+        return self.sprite_key(self.current_color(), font)
+    
     def draw(self, screen, font):
         # Seleccionar el color basado en el estado de la carta
-        if self.selected:
-            color = self.selected_color
-        elif self.hovered and not self.is_ai_card:
-            color = self.hover_color
-        else:
-            color = self.color
+        color = self.current_color()
         
+        # La cara se dibuja una sola vez por aspecto en el atlas de cartas; después
+        # cada fotograma es un único blit
+        card_atlas.blit(screen, self.sprite_key(color, font), self.rect.topleft,
+                        lambda surface, slot: self._paint(surface, pygame.Rect(slot.topleft, self.rect.size),
+                                                          color, font))
+    
+    def sprite_key(self, color, font):
+        """Clave del aspecto de la carta: cambia si cambia su valor (Aumento, Duplicar)."""
+        if not self.is_face_up:
+            return ("dorso", color)
+        card = self.card_data
+        if card.type == "number":
+            return ("number", card.value, color, font)
+        return ("skill", card.effect_type, card.name, card.description, color)
+    
+    def _paint(self, surface, rect, color, font):
+        """Dibuja la carta en `rect` de `surface` (una casilla del atlas)."""
         # Dibujar sombra
         shadow_rect = pygame.Rect(
-            self.rect.x + self.card_shadow_offset,
-            self.rect.y + self.card_shadow_offset,
-            self.rect.width,
-            self.rect.height
+            rect.x + self.card_shadow_offset,
+            rect.y + self.card_shadow_offset,
+            rect.width,
+            rect.height
         )
-        pygame.draw.rect(screen, (50, 50, 50, 150), shadow_rect, 0, self.card_border_radius)
+        pygame.draw.rect(surface, (50, 50, 50), shadow_rect, 0, self.card_border_radius)
             
         # Dibujar la carta
-        pygame.draw.rect(screen, color, self.rect, 0, self.card_border_radius)
-        pygame.draw.rect(screen, BLACK, self.rect, 2, self.card_border_radius)
+        pygame.draw.rect(surface, color, rect, 0, self.card_border_radius)
+        pygame.draw.rect(surface, BLACK, rect, 2, self.card_border_radius)
         
         # Decoraciones adicionales para la carta
         # Dibujar un marco decorativo interior
         inner_rect = pygame.Rect(
-            self.rect.x + 8, 
-            self.rect.y + 8, 
-            self.rect.width - 16, 
-            self.rect.height - 16
+            rect.x + 8, 
+            rect.y + 8, 
+            rect.width - 16, 
+            rect.height - 16
         )
-        pygame.draw.rect(screen, (255, 255, 255, 100), inner_rect, 1, self.card_border_radius-2)
+        pygame.draw.rect(surface, (255, 255, 255), inner_rect, 1, self.card_border_radius-2)
         
         # Si es una carta boca abajo (de la IA)
         if not self.is_face_up:
             # Dibujar un diseño para el dorso más elaborado
-            pygame.draw.rect(screen, (80, 80, 150), inner_rect, 0, self.card_border_radius-2)
+            pygame.draw.rect(surface, (80, 80, 150), inner_rect, 0, self.card_border_radius-2)
             
             # Dibujar un patrón de rejilla para el dorso
             for i in range(0, inner_rect.width, 10):
-                pygame.draw.line(screen, (60, 60, 120), 
+                pygame.draw.line(surface, (60, 60, 120), 
                                 (inner_rect.left + i, inner_rect.top), 
                                 (inner_rect.left + i, inner_rect.bottom), 1)
                 
             for j in range(0, inner_rect.height, 10):
-                pygame.draw.line(screen, (60, 60, 120), 
+                pygame.draw.line(surface, (60, 60, 120), 
                                 (inner_rect.left, inner_rect.top + j), 
                                 (inner_rect.right, inner_rect.top + j), 1)
                 
             # Logo central para el dorso
             symbol_rect = pygame.Rect(0, 0, 30, 30)
             symbol_rect.center = inner_rect.center
-            pygame.draw.rect(screen, (200, 200, 255), symbol_rect, 0, 5)
-            pygame.draw.rect(screen, (60, 60, 120), symbol_rect, 2, 5)
+            pygame.draw.rect(surface, (200, 200, 255), symbol_rect, 0, 5)
+            pygame.draw.rect(surface, (60, 60, 120), symbol_rect, 2, 5)
             
             return
         
@@ -146,38 +183,38 @@ class Card:
         if self.card_data.type == "number":
             # Marco decorativo para el número
             value_bg_rect = pygame.Rect(0, 0, 40, 40)
-            value_bg_rect.center = self.rect.center
-            pygame.draw.rect(screen, (240, 240, 200), value_bg_rect, 0, 5)
-            pygame.draw.rect(screen, (100, 100, 100), value_bg_rect, 1, 5)
+            value_bg_rect.center = rect.center
+            pygame.draw.rect(surface, (240, 240, 200), value_bg_rect, 0, 5)
+            pygame.draw.rect(surface, (100, 100, 100), value_bg_rect, 1, 5)
             
             # El número en sí
-            text_surf = font.render(str(self.card_data.value), True, BLACK)
-            text_rect = text_surf.get_rect(center=self.rect.center)
-            screen.blit(text_surf, text_rect)
+            text_surf = render_text(font, str(self.card_data.value), BLACK)
+            text_rect = text_surf.get_rect(center=rect.center)
+            surface.blit(text_surf, text_rect)
             
             # Decoraciones en las esquinas
-            mini_text = pygame.font.SysFont(None, 20).render(str(self.card_data.value), True, BLACK)
-            screen.blit(mini_text, (self.rect.left + 5, self.rect.top + 5))
-            screen.blit(mini_text, (self.rect.right - 15, self.rect.bottom - 15))
+            mini_text = render_text(get_font(20), str(self.card_data.value), BLACK)
+            surface.blit(mini_text, (rect.left + 5, rect.top + 5))
+            surface.blit(mini_text, (rect.right - 15, rect.bottom - 15))
         else:
             # Para cartas de habilidad
             # Fondo de título
-            title_bg = pygame.Rect(self.rect.x + 5, self.rect.y + 5, self.rect.width - 10, 20)
-            pygame.draw.rect(screen, (150, 150, 220), title_bg, 0, 5)
+            title_bg = pygame.Rect(rect.x + 5, rect.y + 5, rect.width - 10, 20)
+            pygame.draw.rect(surface, (150, 150, 220), title_bg, 0, 5)
             
             # Nombre de la habilidad con fuente más pequeña
-            small_font = pygame.font.SysFont(None, 20)  # Reducir tamaño de fuente para título
-            name_surf = small_font.render(self.card_data.name, True, BLACK)
-            name_rect = name_surf.get_rect(center=(self.rect.centerx, self.rect.top + 14))
-            screen.blit(name_surf, name_rect)
+            small_font = get_font(20)  # Reducir tamaño de fuente para título
+            name_surf = render_text(small_font, self.card_data.name, BLACK)
+            name_rect = name_surf.get_rect(center=(rect.centerx, rect.top + 14))
+            surface.blit(name_surf, name_rect)
             
             # Icono de la habilidad según el tipo
             icon_rect = pygame.Rect(0, 0, 30, 30)
-            icon_rect.center = (self.rect.centerx, self.rect.centery)
+            icon_rect.center = (rect.centerx, rect.centery)
             
             if self.card_data.effect_type == "increase":
                 # Dibujar un ícono de flecha hacia arriba
-                pygame.draw.rect(screen, (100, 200, 100), icon_rect, 0, 5)
+                pygame.draw.rect(surface, (100, 200, 100), icon_rect, 0, 5)
                 points = [(icon_rect.centerx, icon_rect.top + 5), 
                           (icon_rect.right - 5, icon_rect.centery + 5),
                           (icon_rect.centerx + 5, icon_rect.centery + 5),
@@ -185,35 +222,35 @@ class Card:
                           (icon_rect.centerx - 5, icon_rect.bottom - 5),
                           (icon_rect.centerx - 5, icon_rect.centery + 5),
                           (icon_rect.left + 5, icon_rect.centery + 5)]
-                pygame.draw.polygon(screen, (50, 150, 50), points)
+                pygame.draw.polygon(surface, (50, 150, 50), points)
             elif self.card_data.effect_type == "swap":
                 # Dibujar un ícono de flechas cruzadas
-                pygame.draw.rect(screen, (200, 150, 100), icon_rect, 0, 5)
-                pygame.draw.line(screen, (150, 100, 50), 
+                pygame.draw.rect(surface, (200, 150, 100), icon_rect, 0, 5)
+                pygame.draw.line(surface, (150, 100, 50), 
                                (icon_rect.left + 5, icon_rect.top + 5),
                                (icon_rect.right - 5, icon_rect.bottom - 5), 3)
-                pygame.draw.line(screen, (150, 100, 50), 
+                pygame.draw.line(surface, (150, 100, 50), 
                                (icon_rect.right - 5, icon_rect.top + 5),
                                (icon_rect.left + 5, icon_rect.bottom - 5), 3)
             elif self.card_data.effect_type == "block":
                 # Cambiar a un ícono de salvavidas en lugar de escudo
-                pygame.draw.rect(screen, (100, 200, 250), icon_rect, 0, 5)
+                pygame.draw.rect(surface, (100, 200, 250), icon_rect, 0, 5)
                 
                 # Dibujar un salvavidas circular
-                pygame.draw.circle(screen, (255, 255, 255), icon_rect.center, 12, 0)
-                pygame.draw.circle(screen, (255, 50, 50), icon_rect.center, 12, 3)
-                pygame.draw.circle(screen, (255, 255, 255), icon_rect.center, 8, 0)
-                pygame.draw.circle(screen, (255, 50, 50), icon_rect.center, 8, 2)
-                pygame.draw.circle(screen, (255, 255, 255), icon_rect.center, 4, 0)
+                pygame.draw.circle(surface, (255, 255, 255), icon_rect.center, 12, 0)
+                pygame.draw.circle(surface, (255, 50, 50), icon_rect.center, 12, 3)
+                pygame.draw.circle(surface, (255, 255, 255), icon_rect.center, 8, 0)
+                pygame.draw.circle(surface, (255, 50, 50), icon_rect.center, 8, 2)
+                pygame.draw.circle(surface, (255, 255, 255), icon_rect.center, 4, 0)
             elif self.card_data.effect_type == "double":
                 # Dibujar un ícono de x2
-                pygame.draw.rect(screen, (100, 150, 200), icon_rect, 0, 5)
-                x2_text = pygame.font.SysFont(None, 24).render("x2", True, (50, 100, 150))
+                pygame.draw.rect(surface, (100, 150, 200), icon_rect, 0, 5)
+                x2_text = render_text(get_font(24), "x2", (50, 100, 150))
                 x2_rect = x2_text.get_rect(center=icon_rect.center)
-                screen.blit(x2_text, x2_rect)
+                surface.blit(x2_text, x2_rect)
             
             # Descripción en la parte inferior
-            tiny_font = pygame.font.SysFont(None, 16)  # Fuente muy pequeña para descripción
+            tiny_font = get_font(16)  # Fuente muy pequeña para descripción
             
             # Asegurarse de que la descripción no sea demasiado larga
             max_chars = 18  # Ajustar según el tamaño de la carta
@@ -222,12 +259,12 @@ class Card:
                 description = description[:max_chars-3] + "..."
             
             # Hacer el rectángulo de fondo un poco más ancho y alto para texto más pequeño
-            desc_bg = pygame.Rect(self.rect.x + 5, self.rect.bottom - 22, self.rect.width - 10, 17)
-            pygame.draw.rect(screen, (240, 240, 200), desc_bg, 0, 4)
+            desc_bg = pygame.Rect(rect.x + 5, rect.bottom - 22, rect.width - 10, 17)
+            pygame.draw.rect(surface, (240, 240, 200), desc_bg, 0, 4)
             
-            desc_surf = tiny_font.render(description, True, BLACK)
-            desc_rect = desc_surf.get_rect(center=(self.rect.centerx, self.rect.bottom - 14))
-            screen.blit(desc_surf, desc_rect)
+            desc_surf = render_text(tiny_font, description, BLACK)
+            desc_rect = desc_surf.get_rect(center=(rect.centerx, rect.bottom - 14))
+            surface.blit(desc_surf, desc_rect)
     
     def check_hover(self, pos):
         if not self.is_ai_card:  # Solo las cartas del jugador pueden tener hover
@@ -242,6 +279,9 @@ class Card:
             return self.rect.collidepoint(pos)
         return False
     
+# Color transparente de las superficies de la rueda (no aparece en el dibujo)
+WHEEL_COLORKEY = (255, 0, 255)
+
 class RouletteVisualizer:
     """Visualizador de la ruleta rusa."""
     def __init__(self, x, y, radius):
@@ -254,6 +294,9 @@ class RouletteVisualizer:
         self.spin_start_time = 0
         self.spin_result = None  # None = no resultado, True = muerte, False = supervivencia
         self.probability = 1  # Probabilidad actual
+        # Rueda dibujada por ángulo cuantizado para la probabilidad de `wheel_key`
+        self.wheel_key = None
+        self.wheels = {}
         
     def start_spin(self, probability, result):
         """Inicia la animación de giro."""
@@ -287,11 +330,57 @@ class RouletteVisualizer:
             if self.angle >= 360:
                 self.angle -= 360
         
-    def draw(self, screen, font):
-        """Dibuja la ruleta."""
+    def bounds(self):
+        """Zona que ocupa la ruleta, con el texto del resultado encima."""
+        return pygame.Rect(self.x - self.radius - 2, self.y - self.radius - 45,
+                           self.radius * 2 + 4, self.radius * 2 + 47)
+    
+    def render_state(self):
+        """Lo que cambia el aspecto de la ruleta (para el dibujado por zonas)."""
+        return (self.angle_step(), self.probability, self.spinning, self.spin_result)
+    
+    def angle_step(self):
+        """Ángulo actual cuantizado al paso de la caché de giros (índice del paso)."""
+        return int(round(self.angle / ROULETTE_ANGLE_STEP)) % (360 // ROULETTE_ANGLE_STEP)
+    
+    def wheel_surface(self, font):
+        """
+        Rueda ya dibujada para la probabilidad y el ángulo (cuantizado) actuales.
+        
+        Cada ángulo se dibuja la primera vez que se necesita; los giros
+        guardados se descartan solo cuando cambia la probabilidad, como mucho
+        una vez por turno.
+        """
+        key = (self.probability, font)
+        if key != self.wheel_key:
+            self.wheel_key = key
+            self.wheels = {}
+        step = self.angle_step()
+        wheel = self.wheels.get(step)
+        if wheel is None:
+            center = self.radius + 2
+            wheel = pygame.Surface((center * 2, center * 2))
+            wheel.fill(WHEEL_COLORKEY)
+            wheel.set_colorkey(WHEEL_COLORKEY)
+            self.paint_wheel(wheel, (self.x - center, self.y - center), step * ROULETTE_ANGLE_STEP, font)
+            if pygame.display.get_surface() is not None:
+                wheel = wheel.convert()
+            self.wheels[step] = wheel
+        return wheel
+    
+    def paint_wheel(self, surface, origin, angle, font):
+        """
+        Dibuja la rueda girada `angle` grados en `surface`, cuya esquina superior
+        izquierda está en `origin` de la pantalla.
+        
+        Las coordenadas se calculan en la pantalla y después se trasladan, para que
+        los píxeles salgan igual que dibujando directamente en ella.
+        """
+        ox, oy = origin
+        cx, cy = self.x - ox, self.y - oy
         # Dibujar círculo exterior
-        pygame.draw.circle(screen, (120, 220, 130), (self.x, self.y), self.radius, 0)
-        pygame.draw.circle(screen, (200, 200, 200), (self.x, self.y), self.radius, 3)
+        pygame.draw.circle(surface, (120, 220, 130), (cx, cy), self.radius, 0)
+        pygame.draw.circle(surface, (200, 200, 200), (cx, cy), self.radius, 3)
         
         # Dibujar segmentos según la probabilidad con colores más suaves
         danger_angle = 360 * (self.probability / 100)
@@ -299,44 +388,52 @@ class RouletteVisualizer:
         
         # Segmento peligroso (rosa/rojo suave)
         if danger_angle > 0:
-            pygame.draw.arc(screen, (220, 150, 150), 
-                        (self.x - self.radius, self.y - self.radius, 
+            pygame.draw.arc(surface, (220, 150, 150), 
+                        (cx - self.radius, cy - self.radius, 
                             self.radius * 2, self.radius * 2),
-                        math.radians(self.angle + safe_angle), 
-                        math.radians(self.angle + 360), 
+                        math.radians(angle + safe_angle), 
+                        math.radians(angle + 360), 
                         self.radius)
         
         # Dibujar divisiones entre segmentos
         for i in range(8):
-            angle_rad = math.radians(self.angle + i * 45)
-            end_x = self.x + math.cos(angle_rad) * self.radius
-            end_y = self.y + math.sin(angle_rad) * self.radius
-            pygame.draw.line(screen, (200, 200, 200), 
-                            (self.x, self.y), (end_x, end_y), 2)
+            angle_rad = math.radians(angle + i * 45)
+            end_x = self.x + math.cos(angle_rad) * self.radius - ox
+            end_y = self.y + math.sin(angle_rad) * self.radius - oy
+            pygame.draw.line(surface, (200, 200, 200), 
+                            (cx, cy), (end_x, end_y), 2)
         
         # Dibujar aguja/indicador
         needle_length = self.radius - 10
         needle_angle = math.radians(270)  # Siempre apunta hacia arriba
-        needle_x = self.x + math.cos(needle_angle) * needle_length
-        needle_y = self.y + math.sin(needle_angle) * needle_length
-        pygame.draw.line(screen, (255, 255, 255), 
-                        (self.x, self.y), (needle_x, needle_y), 4)
+        needle_x = self.x + math.cos(needle_angle) * needle_length - ox
+        needle_y = self.y + math.sin(needle_angle) * needle_length - oy
+        pygame.draw.line(surface, (255, 255, 255), 
+                        (cx, cy), (needle_x, needle_y), 4)
         
         # Dibujar círculo central
-        pygame.draw.circle(screen, (150, 150, 150), (self.x, self.y), 15, 0)
-        pygame.draw.circle(screen, (100, 100, 100), (self.x, self.y), 15, 1)
+        pygame.draw.circle(surface, (150, 150, 150), (cx, cy), 15, 0)
+        pygame.draw.circle(surface, (100, 100, 100), (cx, cy), 15, 1)
         
         # Mostrar probabilidad en el centro
-        prob_text = font.render(f"{int(self.probability)}%", True, (255, 255, 255))
-        prob_rect = prob_text.get_rect(center=(self.x, self.y))
-        screen.blit(prob_text, prob_rect)
+        prob_text = render_text(font, f"{int(self.probability)}%", (255, 255, 255))
+        prob_rect = prob_text.get_rect(center=(cx, cy))
+        surface.blit(prob_text, prob_rect)
+    
+    def draw(self, screen, font):
+        """Dibuja la ruleta."""
+        # La rueda (segmentos, aguja, centro y probabilidad) está ya dibujada para
+        # el ángulo actual: un único blit por fotograma
+        wheel = self.wheel_surface(font)
+        center = self.radius + 2
+        screen.blit(wheel, (self.x - center, self.y - center))
         
         # Mostrar resultado si terminó de girar y hay resultado
         if not self.spinning and self.spin_result is not None:
             if self.spin_result:  # Muerte
-                result_text = font.render("¡BANG!", True, (255, 50, 50))
+                result_text = render_text(font, "¡BANG!", (255, 50, 50))
             else:  # Supervivencia
-                result_text = font.render("Safe", True, (50, 255, 50))
+                result_text = render_text(font, "Safe", (50, 255, 50))
                 
             result_rect = result_text.get_rect(center=(self.x, self.y - self.radius - 30))
             screen.blit(result_text, result_rect)
@@ -359,6 +456,18 @@ class PlayerVisualizer:
             self.death_animation_time = pygame.time.get_ticks()
         self.alive = alive
         
+    def bounds(self):
+        """Zona que ocupa el avatar, con la explosión de la animación de muerte."""
+        reach = self.size * 2
+        return pygame.Rect(self.x - reach, self.y - reach, reach * 2, reach * 2)
+    
+    def render_state(self):
+        """Lo que cambia el aspecto del avatar (para el dibujado por zonas)."""
+        elapsed = pygame.time.get_ticks() - self.death_animation_time
+        if not self.alive and elapsed < self.death_animation_duration:
+            return ("muerte", elapsed)
+        return (self.alive,)
+    
     def draw(self, screen, font):
         """Dibuja al jugador o a la IA."""
         current_time = pygame.time.get_ticks()
@@ -433,20 +542,72 @@ class PlayerVisualizer:
             
         # Etiqueta
         label = "IA" if self.is_ai else "Jugador"
-        label_surf = font.render(label, True, (255, 255, 255))
+        label_surf = render_text(font, label, (255, 255, 255))
         label_rect = label_surf.get_rect(center=(self.x, self.y + 50))
         screen.blit(label_surf, label_rect)
 
+# Texto del panel de instrucciones (una línea por elemento)
+INSTRUCTIONS = [
+    "OBJETIVO: Eliminar al oponente o hacer que se quede sin cartas numéricas.",
+    "",
+    "REGLAS BÁSICAS:",
+    "1. Cada jugador tiene cartas numéricas (1-10) y cartas de habilidad.",
+    "2. En cada turno, ambos jugadores juegan una carta numérica. El valor más alto gana.",
+    "3. El perdedor del turno debe tomar una decisión:",
+    "   - Usar una carta de habilidad para cambiar la situación.",
+    "   - Arriesgarse a girar la ruleta rusa.",
+    "4. La ruleta comienza con 1% de probabilidad de 'muerte' y aumenta un 10% cada turno.",
+    "5. El juego termina cuando un jugador 'muere' en la ruleta o se queda sin cartas numéricas.",
+    "",
+    "CARTAS DE HABILIDAD:",
+    "• Aumento: Aumenta tu número en 3 puntos.",
+    "• Intercambio: Intercambia tu carta con la del oponente.",
+    "• Salvavidas: Te salva automáticamente sin usar la ruleta.",
+    "• Duplicar: Duplica el valor de tu carta numérica.",
+    "",
+    "DINÁMICA DEL JUEGO:",
+    "1. Al inicio de la partida, cada jugador recibe una mano de cartas aleatorias.",
+    "2. En tu turno, selecciona una carta numérica para jugar contra la IA.",
+    "3. El jugador con el valor más alto gana el turno.",
+    "4. El perdedor debe decidir entre usar una carta de habilidad o girar la ruleta.",
+    "5. Las cartas de habilidad pueden cambiar el resultado del turno o evitar la ruleta.",
+    "6. Si eliges girar la ruleta, hay una probabilidad de 'muerte' que aumenta cada turno.",
+    "7. El juego continúa hasta que un jugador muere en la ruleta o se queda sin cartas.",
+    "",
+    "ESTRATEGIA:",
+    "• Guarda tus cartas numéricas altas para momentos críticos.",
+    "• Las cartas de habilidad son valiosas cuando la probabilidad de la ruleta es alta.",
+    "• La IA tomará decisiones basadas en la probabilidad de la ruleta y sus cartas disponibles.",
+    "• No te arriesgues demasiado en los primeros turnos, la ruleta se vuelve más peligrosa.",
+    "",
+    "CONTROLES:",
+    "• Haz clic en una carta para seleccionarla.",
+    "• Usa los botones en la parte inferior para realizar acciones.",
+    "• El botón 'Instrucciones' abre esta ventana de ayuda.",
+    "",
+    "¡Buena suerte y que gane el mejor estratega!"
+]
+
+# Botón de cierre dentro del panel de instrucciones
+INSTRUCTIONS_CLOSE_RECT = pygame.Rect(700, 40, 50, 30)
+
 class GameScreen:
     """Pantalla principal del juego."""
-    def __init__(self, game):
+    def __init__(self, game, advisor=None, decision_worker=None):
         self.game = game
+        self.advisor = advisor  # Asesor opcional de probabilidad de victoria (ui.advisor)
+        self.decision_worker = decision_worker  # Decisiones de la IA en otro hilo (ai.decision_worker)
+        self.advisor_estimates = {}
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 30)
-        self.title_font = pygame.font.SysFont(None, 48)
+        # Fuentes compartidas: se cargan una sola vez (ui/text_cache.py)
+        self.font = get_font(30)
+        self.title_font = get_font(48)
+        self.advisor_font = get_font(24)
+        # Dibujado por zonas: solo se redibuja lo que cambia (ui/dirty_rects.py)
+        self.renderer = DirtyRectRenderer(self.screen, self.draw_background) if DIRTY_RECT_RENDERING else None
         
         # Estado de la interfaz
         self.player_card_objects = []
@@ -460,6 +621,9 @@ class GameScreen:
         self.waiting_for_ai = False
         self.waiting_time = 0
         self.turn_result = None
+        self.pending_card_index = None  # Carta del jugador a la espera de la de la IA
+        self.pending_ai_card = None  # Decisión en curso de la carta de la IA
+        self.pending_ai_decision = None  # Decisión en curso de la IA tras perder
         
         # Inicializar botones
         self.init_buttons()
@@ -482,6 +646,10 @@ class GameScreen:
         self.instructions_scroll_pos = 0
         self.instructions_max_scroll = 0  # Se calculará dinámicamente
         self.instructions_scroll_speed = 15
+        # Texto del panel y superficies ya dibujadas (ver instructions_surfaces)
+        self.instructions_lines = INSTRUCTIONS
+        self.instructions_cache = None
+        self.instructions_panel = None
         
         # Modificado: Panel de instrucciones se muestra automáticamente al inicio
         self.showing_instructions = True
@@ -598,6 +766,12 @@ class GameScreen:
             ai_card_obj = Card(SCREEN_WIDTH // 2 + 20, center_y, ai_card, is_face_up=True)
             self.center_cards.append(ai_card_obj)
     
+    def handle_window_event(self, event):
+        """Redibuja la pantalla completa si la ventana ha perdido su contenido."""
+        if self.renderer is not None and event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                                                         pygame.WINDOWRESTORED):
+            self.renderer.invalidate()
+    
     def handle_events(self):
         """Maneja los eventos de entrada."""
         
@@ -610,6 +784,7 @@ class GameScreen:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                self.handle_window_event(event)
             
             # Mostrar un mensaje de "IA pensando..."
             current_time = pygame.time.get_ticks()
@@ -617,11 +792,24 @@ class GameScreen:
             dots = "." * (elapsed_time % 4)  # Animación de puntos
             self.game_message = f"La IA está pensando{dots}"
             
-            # Si ha pasado demasiado tiempo, asumir que la IA está atascada
-            if elapsed_time > 15:  # 15 segundos de timeout
-                self.ai_thinking = False
-                self.game_message = "La IA tardó demasiado tiempo. Continúa el juego."
+            pending = self.pending_ai_decision
+            if pending is not None and pending.done():
+                self.pending_ai_decision = None
+                try:
+                    decision = pending.result()
+                except Exception:
+                    # El error ya queda registrado en el hilo trabajador
+                    decision = None
+                self.finish_ai_loss_decision(decision)
+            elif elapsed_time > AI_DECISION_TIMEOUT:
+                # Si ha pasado demasiado tiempo, asumir que la IA está atascada y girar la ruleta
                 logging.warning("Timeout en la espera de decisión de la IA")
+                if pending is not None:
+                    pending.cancel()
+                    self.pending_ai_decision = None
+                self.finish_ai_loss_decision({"choice": "roulette"})
+                if not self.game.is_game_over():
+                    self.game_message = "La IA tardó demasiado tiempo y gira la ruleta."
             
             return
         
@@ -642,6 +830,7 @@ class GameScreen:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            self.handle_window_event(event)
                 
             pos = pygame.mouse.get_pos()
             
@@ -685,8 +874,14 @@ class GameScreen:
                         # Mostrar la carta jugada por el jugador
                         self.update_center_cards(player_card=played_card)
                         
-                        # Jugar la carta pero aún no mostrar el resultado
-                        self.turn_result = self.game.play_turn(self.selected_card_index)
+                        # La IA elige su carta en segundo plano; el turno se juega
+                        # cuando responde (ver handle_ai_turn)
+                        self.pending_card_index = self.selected_card_index
+                        self.turn_result = None
+                        if self.decision_worker is not None:
+                            self.pending_ai_card = self.decision_worker.submit_card_choice(self.game)
+                        else:
+                            self.turn_result = self.game.play_turn(self.pending_card_index)
                         self.selected_card_index = None
                     else:
                         self.game_message = "Solo puedes jugar cartas numéricas en tu turno"
@@ -772,6 +967,74 @@ class GameScreen:
                     else:
                         self.game_message = "Selecciona una carta de habilidad"
     
+    def update_advisor(self):
+        """Envía la posición al asesor si ha cambiado y recoge sus estimaciones sin bloquear."""
+        if self.advisor is None:
+            return
+        game = self.game
+        
+        # Solo se analiza cuando le toca decidir al jugador (nunca antes de revelar el turno)
+        human_turn = False
+        if not self.waiting_for_ai and not self.ai_thinking and not game.is_game_over():
+            if game.decision_pending:
+                human_turn = game.current_loser == game.player and not game.skill_used_this_turn
+            else:
+                human_turn = self.play_button.active
+        
+        if human_turn:
+            self.advisor.analyze(game.snapshot())
+            hovered = next((card for card in self.player_card_objects if card.hovered), None)
+            if hovered is not None:
+                option = card_option(hovered.card_data, game.decision_pending)
+                if option is not None:
+                    self.advisor.focus(option)
+            elif game.decision_pending and self.roulette_button.hovered:
+                self.advisor.focus(ROULETTE)
+        else:
+            self.advisor.cancel()
+        
+        self.advisor_estimates = self.advisor.poll()
+    
+    def advisor_labels(self):
+        """Etiquetas del asesor a mostrar: lista de (probabilidad, centro_x, centro_y)."""
+        if self.advisor is None or not self.advisor_estimates:
+            return []
+        
+        labels = []
+        decision_pending = self.game.decision_pending
+        for card in self.player_card_objects:
+            rate = self.advisor_estimates.get(card_option(card.card_data, decision_pending))
+            if rate is not None:
+                # El valor se redondea al porcentaje mostrado para reutilizar el texto renderizado
+                labels.append((round(rate, 2), card.rect.centerx, card.rect.top - 16))
+        
+        rate = self.advisor_estimates.get(ROULETTE)
+        if rate is not None and decision_pending:
+            labels.append((round(rate, 2), self.roulette_button.rect.centerx,
+                           self.roulette_button.rect.top - 16))
+        return labels
+    
+    def draw_advisor_overlay(self):
+        """Dibuja sobre las cartas y la ruleta la probabilidad de victoria estimada."""
+        for label in self.advisor_labels():
+            self.draw_advisor_label(*label)
+    
+    def advisor_label_text(self, rate):
+        """Texto renderizado de una etiqueta, de rojo (0%) a verde (100%)."""
+        color = (int(255 * (1 - rate)), int(255 * rate), 80)
+        return render_text(self.advisor_font, f"{rate:.0%}", color)
+    
+    def advisor_label_rect(self, rate, center_x, center_y):
+        """Zona que ocupa una etiqueta del asesor, con su fondo."""
+        return self.advisor_label_text(rate).get_rect(center=(center_x, center_y)).inflate(10, 6)
+    
+    def draw_advisor_label(self, rate, center_x, center_y):
+        """Etiqueta con un porcentaje, de rojo (0%) a verde (100%)."""
+        text = self.advisor_label_text(rate)
+        rect = text.get_rect(center=(center_x, center_y))
+        pygame.draw.rect(self.screen, (20, 20, 30), rect.inflate(10, 6), 0, 6)
+        self.screen.blit(text, rect)
+    
     def update_roulette_display(self):
         """Actualiza la visualización de la ruleta con la probabilidad actual."""
         # Actualizar el valor de probabilidad de la visualizador con el valor actual del juego
@@ -782,6 +1045,23 @@ class GameScreen:
         current_time = pygame.time.get_ticks()
         elapsed_time = current_time - self.waiting_time
         
+        # Jugar el turno en cuanto la IA tenga su carta
+        if self.turn_result is None:
+            self.resolve_ai_card(elapsed_time)
+            if self.turn_result is None:
+                if elapsed_time > 1500:
+                    dots = "." * ((elapsed_time // 1000) % 4)
+                    self.game_message = f"La IA está eligiendo carta{dots}"
+                # Procesar eventos de salida mientras se espera
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                return
+            # Si la IA ha tardado, dar tiempo a ver su carta antes del resultado
+            self.waiting_time = min(self.waiting_time, current_time - 1500)
+            elapsed_time = current_time - self.waiting_time
+        
         # Esperar 1.5 segundos para mostrar la carta de la IA
         if elapsed_time > 1500 and not self.center_cards[-1].is_ai_card:
             # Mostrar la carta jugada por la IA
@@ -816,64 +1096,8 @@ class GameScreen:
                     
                     self.game_message = "Perdiste el turno. ¿Usar habilidad o girar la ruleta?"
                 elif self.game.current_loser == self.game.ai_player:
-                    # La IA decide automáticamente
-                    self.game_message = "La IA perdió el turno y está decidiendo..."
-                    self.ai_thinking = True
-                    self.ai_decision_start_time = pygame.time.get_ticks()
-                    
-                    # Aquí implementamos la lógica de decisión de la IA
-                    try:
-                        logging.info("La IA está tomando una decisión después de perder...")
-                        ai_decision = self.game.ai_decision_after_losing()
-                        logging.info(f"Decisión de la IA: {ai_decision}")
-                        
-                        if ai_decision["choice"] == "skill":
-                            logging.info(f"La IA usa una habilidad: {ai_decision.get('skill_name', 'desconocida')}")
-                            # Verificar si ya se usó una habilidad en este turno
-                            if self.game.skill_used_this_turn:
-                                # La IA solo puede usar la ruleta
-                                result = self.game.use_roulette(self.game.ai_player)
-                                if result:
-                                    self.game_message = "¡La IA perdió en la ruleta!"
-                                else:
-                                    self.game_message = "La IA sobrevivió a la ruleta"
-                                self.play_button.set_active(True)
-                            else:
-                                # La IA puede usar una habilidad
-                                if ai_decision.get("loser_changed", False) and self.game.current_loser == self.game.player:
-                                    # El perdedor cambió, ahora el jugador debe decidir
-                                    self.game_message = "La IA usó la habilidad y ahora tú pierdes el turno. Solo puedes usar la ruleta."
-                                    self.roulette_button.set_active(True)
-                                    self.skill_button.set_active(False)  # Desactivar habilidades
-                                    self.play_button.set_active(False)  # Desactivar jugar carta hasta resolver
-                                else:
-                                    # La IA usó una habilidad pero sigue perdiendo o empate
-                                    self.game_message = f"La IA usó la habilidad: {ai_decision['skill_name']}"
-                                    self.play_button.set_active(True)  # Activar para siguiente turno
-                        else:
-                            logging.info(f"La IA decide usar la ruleta con probabilidad: {self.game.roulette.get_probability()}%")
-                            result = self.game.use_roulette(self.game.ai_player)
-                            logging.info(f"Resultado de la ruleta para la IA: {'muerte' if result else 'sobrevivió'}")
-                            # Iniciar animación de la ruleta
-                            self.roulette_vis.start_spin(self.game.roulette.get_probability(), result)
-                            
-                            # Actualizar mensaje según resultado
-                            if result:
-                                self.game_message = "¡La IA perdió en la ruleta!"
-                                self.show_message_effect("¡IA ELIMINADA!", (255, 50, 50))
-                                self.ai_vis.set_alive(False)
-                            else:
-                                self.game_message = "La IA sobrevivió a la ruleta"
-                                self.show_message_effect("¡IA SAFE!", (50, 255, 50))
-                                
-                        self.update_card_objects()
-                        
-                    except Exception as e:
-                        logging.error(f"Error en la decisión de la IA: {e}", exc_info=True)
-                        self.game_message = "La IA tuvo un error y pasa su turno"
-                        self.play_button.set_active(True)
-
-                    self.ai_thinking = False
+                    # La IA decide automáticamente, sin bloquear la interfaz
+                    self.start_ai_loss_decision()
         
         # Procesar eventos de salida
         for event in pygame.event.get():
@@ -881,6 +1105,106 @@ class GameScreen:
                 pygame.quit()
                 sys.exit()
             
+    def resolve_ai_card(self, elapsed_time):
+        """Juega el turno si la carta de la IA está lista o si se agotó el tiempo de espera."""
+        pending = self.pending_ai_card
+        ai_index = None
+        if pending is not None:
+            if not pending.done() and elapsed_time <= AI_DECISION_TIMEOUT * 1000:
+                return
+            self.pending_ai_card = None
+            if pending.done():
+                try:
+                    ai_index = pending.result()
+                except Exception:
+                    # El error ya queda registrado en el hilo trabajador
+                    ai_index = None
+            else:
+                logging.warning("Timeout en la espera de la carta de la IA")
+                pending.cancel()
+            if ai_index is None:
+                ai_index = random_card(self.game)
+        
+        self.turn_result = self.game.play_turn(self.pending_card_index, ai_index)
+        self.pending_card_index = None
+        
+        # Si la IA ha perdido, su respuesta se calcula mientras se revela el turno
+        game = self.game
+        if (self.decision_worker is not None and game.decision_pending
+                and game.current_loser == game.ai_player and not game.is_game_over()):
+            self.decision_worker.prefetch("loss", game)
+    
+    def update_prefetch(self):
+        """Adelanta en segundo plano la carta de la IA mientras el jugador elige la suya."""
+        if self.decision_worker is None:
+            return
+        game = self.game
+        if (self.play_button.active and not self.waiting_for_ai and not self.ai_thinking
+                and not game.decision_pending and not game.is_game_over()):
+            self.decision_worker.prefetch("card", game)
+    
+    def start_ai_loss_decision(self):
+        """Pide al hilo trabajador la respuesta de la IA tras perder (ver handle_events)."""
+        self.game_message = "La IA perdió el turno y está decidiendo..."
+        self.ai_thinking = True
+        self.ai_decision_start_time = pygame.time.get_ticks()
+        logging.info("La IA está tomando una decisión después de perder...")
+        if self.decision_worker is not None:
+            self.pending_ai_decision = self.decision_worker.submit_loss_decision(self.game)
+        else:
+            try:
+                decision = self.game.decide_after_losing()
+            except Exception as e:
+                logging.error(f"Error en la decisión de la IA: {e}", exc_info=True)
+                decision = None
+            self.finish_ai_loss_decision(decision)
+    
+    def finish_ai_loss_decision(self, decision):
+        """
+        Aplica la respuesta de la IA tras perder y actualiza la interfaz.
+        
+        Args:
+            decision: Resultado de `Game.decide_after_losing`, o None si la IA falló (gira la ruleta)
+        """
+        self.ai_thinking = False
+        if decision is None:
+            # La derrota se resuelve igualmente en la partida: sin respuesta, la IA gira la ruleta
+            logging.warning("La IA no respondió tras perder; se usa la ruleta")
+            decision = {"choice": "roulette"}
+        
+        logging.info(f"Decisión de la IA: {decision}")
+        ai_decision = self.game.apply_ai_decision(decision)
+        
+        if ai_decision["choice"] == "skill":
+            logging.info(f"La IA usa una habilidad: {ai_decision.get('skill_name', 'desconocida')}")
+            if ai_decision.get("loser_changed", False) and self.game.current_loser == self.game.player:
+                # El perdedor cambió, ahora el jugador debe decidir
+                self.game_message = "La IA usó la habilidad y ahora tú pierdes el turno. Solo puedes usar la ruleta."
+                self.roulette_button.set_active(True)
+                self.skill_button.set_active(False)  # Desactivar habilidades
+                self.play_button.set_active(False)  # Desactivar jugar carta hasta resolver
+            else:
+                # La IA usó una habilidad pero sigue perdiendo o empate
+                self.game_message = f"La IA usó la habilidad: {ai_decision['skill_name']}"
+                self.play_button.set_active(True)  # Activar para siguiente turno
+        else:
+            result = ai_decision["died"]
+            logging.info(f"Resultado de la ruleta para la IA: {'muerte' if result else 'sobrevivió'}")
+            # Iniciar animación de la ruleta
+            self.roulette_vis.start_spin(self.game.roulette.get_probability(), result)
+            
+            # Actualizar mensaje según resultado
+            if result:
+                self.game_message = "¡La IA perdió en la ruleta!"
+                self.show_message_effect("¡IA ELIMINADA!", (255, 50, 50))
+                self.ai_vis.set_alive(False)
+            else:
+                self.game_message = "La IA sobrevivió a la ruleta"
+                self.show_message_effect("¡IA SAFE!", (50, 255, 50))
+            self.play_button.set_active(True)
+        
+        self.update_card_objects()
+    
     def handle_turn_result(self, result):
         """Maneja el resultado de un turno de juego."""
         if result["status"] == "error":
@@ -894,224 +1218,227 @@ class GameScreen:
     
     def draw(self):
         """Dibuja todos los elementos en la pantalla."""
-        # Fondo
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # Título y mensajes
-        title = self.title_font.render(GAME_TITLE, True, WHITE)
-        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
-        
-        # Información de la IA
-        ai_info = self.font.render(f"Cartas de la IA: {len(self.game.ai_player.hand)}", True, WHITE)
-        self.screen.blit(ai_info, (50, 80))
+        items = self.frame_items()
+        if self.renderer is not None:
+            # Solo se redibujan y se envían a la ventana las zonas que cambian
+            self.renderer.render(items)
+            return
         
-        # Probabilidad de la ruleta
-        roulette_text = self.font.render(
-            f"Probabilidad de la ruleta: {self.game.roulette.get_probability()}%", 
-            True, 
-            WHITE
-        )
-        self.screen.blit(roulette_text, (SCREEN_WIDTH - 350, 80))
+        self.draw_background(self.screen)
+        for item in items:
+            item.draw()
+        pygame.display.flip()
+    
+    def draw_background(self, surface):
+        """Dibuja el fondo estático: color de fondo y tablero."""
+        surface.fill(BACKGROUND_COLOR)
         
         # Dibujar el tablero de juego mejorado
         board_rect = pygame.Rect(SCREEN_WIDTH // 8, 100, SCREEN_WIDTH * 3 // 4, SCREEN_HEIGHT - 180)  # Cambiar 200 a 180
-        pygame.draw.rect(self.screen, (40, 60, 40), board_rect, 0, 15)
-        pygame.draw.rect(self.screen, (60, 80, 60), board_rect, 5, 15)
+        pygame.draw.rect(surface, (40, 60, 40), board_rect, 0, 15)
+        pygame.draw.rect(surface, (60, 80, 60), board_rect, 5, 15)
         
         # Dibujar líneas decorativas en el tablero
         for i in range(10):
             y = board_rect.top + i * (board_rect.height // 10)
-            pygame.draw.line(self.screen, (50, 70, 50), 
+            pygame.draw.line(surface, (50, 70, 50), 
                            (board_rect.left + 20, y), 
                            (board_rect.right - 20, y), 1)
+    
+    def frame_items(self):
+        """
+        Elementos del fotograma en orden de pintado, cada uno con la zona que
+        ocupa y un estado que cambia cuando cambia su aspecto (ui/dirty_rects.py).
+        """
+        items = []
+        screen = self.screen
+        
+        def add_text(key, surface, position):
+            items.append(DrawItem(key, surface.get_rect(topleft=position), (surface.get_size(), key),
+                                  lambda: screen.blit(surface, position)))
         
-        # Dibujar visualizaciones del jugador y la IA
-        self.player_vis.draw(self.screen, self.font)
-        self.ai_vis.draw(self.screen, self.font)
-        
-        # Dibujar ruleta
-        self.roulette_vis.draw(self.screen, self.font)
-        
-        # Mensaje del juego
-        if self.game_message:
-            message = self.font.render(self.game_message, True, WHITE)
-            self.screen.blit(message, (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        
-        # Dibujar cartas del jugador
-        for card in self.player_card_objects:
-            card.draw(self.screen, self.font)
+        # Título y mensajes
+        title = render_text(self.title_font, GAME_TITLE, WHITE)
+        add_text("title", title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 20))
         
-        # Dibujar cartas de la IA
-        for card in self.ai_card_objects:
-            card.draw(self.screen, self.font)
+        # Información de la IA
+        ai_info_text = f"Cartas de la IA: {len(self.game.ai_player.hand)}"
+        add_text(ai_info_text, render_text(self.font, ai_info_text, WHITE), (50, 80))
         
-        # Dibujar cartas en el centro
-        for card in self.center_cards:
-            card.draw(self.screen, self.font)
+        # Probabilidad de la ruleta
+        roulette_label = f"Probabilidad de la ruleta: {self.game.roulette.get_probability()}%"
+        add_text(roulette_label, render_text(self.font, roulette_label, WHITE), (SCREEN_WIDTH - 350, 80))
         
-        # Dibujar etiquetas para las áreas de cartas
-        player_label = self.font.render("Tus cartas", True, WHITE)
-        self.screen.blit(player_label, (50, SCREEN_HEIGHT - 230))
+        # Visualizaciones del jugador, la IA y la ruleta
+        for key, visualizer in (("player_vis", self.player_vis), ("ai_vis", self.ai_vis),
+                                ("roulette_vis", self.roulette_vis)):
+            items.append(DrawItem(key, visualizer.bounds(), visualizer.render_state(),
+                                  lambda visualizer=visualizer: visualizer.draw(screen, self.font)))
         
-        # Dibujar botones
-        for button in self.buttons:
-            button.draw(self.screen, self.font)
-            
+        # Mensaje del juego
+        if self.game_message:
+            message = render_text(self.font, self.game_message, WHITE)
+            add_text(("message", self.game_message), message,
+                     (SCREEN_WIDTH // 2 - message.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+        
+        # Cartas del jugador, de la IA y del centro
+        for card in self.player_card_objects + self.ai_card_objects + self.center_cards:
+            items.append(DrawItem(("card", id(card)), card.bounds(), card.render_state(self.font),
+                                  lambda card=card: card.draw(screen, self.font)))
+        
+        # Estimaciones del asesor
+        labels = self.advisor_labels()
+        if labels:
+            area = self.advisor_label_rect(*labels[0]).unionall(
+                [self.advisor_label_rect(*label) for label in labels[1:]])
+            items.append(DrawItem("advisor", area, labels, self.draw_advisor_overlay))
+        
+        # Etiquetas para las áreas de cartas
+        add_text("player_label", render_text(self.font, "Tus cartas", WHITE), (50, SCREEN_HEIGHT - 230))
+        
+        # Botones
+        for i, button in enumerate(self.buttons):
+            items.append(DrawItem(("button", i), button.bounds(self.font), button.render_state(),
+                                  lambda button=button: button.draw(screen, self.font)))
+        
+        # Mensaje grande con zoom
         if self.showing_message_effect:
-            current_time = pygame.time.get_ticks()
-            elapsed = current_time - self.message_effect_start_time
-            
+            elapsed = pygame.time.get_ticks() - self.message_effect_start_time
             if elapsed < 2000:  # Duración de 2 segundos
-                # Calcular tamaño y opacidad según el tiempo
-                max_size = 72
-                min_size = 36
-                
-                if elapsed < 500:  # Primeros 0.5 segundos - creciendo
-                    progress = elapsed / 500
-                    size = min_size + (max_size - min_size) * progress
-                    alpha = 255 * progress
-                elif elapsed < 1500:  # 1 segundo mantenido
-                    size = max_size
-                    alpha = 255
-                else:  # Últimos 0.5 segundos - desvaneciéndose
-                    progress = (elapsed - 1500) / 500
-                    size = max_size - (max_size - min_size) * progress
-                    alpha = 255 * (1 - progress)
-                
-                # Crear superficie con transparencia
-                message_font = pygame.font.SysFont(None, int(size))
-                message_surf = message_font.render(self.message_effect_text, True, self.message_effect_color)
-                
-                # Añadir un efecto de sombra
-                shadow_surf = message_font.render(self.message_effect_text, True, (0, 0, 0))
-                shadow_rect = shadow_surf.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 + 3))
-                message_surf.set_alpha(alpha)
-                shadow_surf.set_alpha(alpha * 0.7)  # Sombra más transparente
-                
-                # Mostrar el mensaje
-                message_rect = message_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                self.screen.blit(shadow_surf, shadow_rect)
-                self.screen.blit(message_surf, message_rect)
+                width, height = get_font(72).size(self.message_effect_text)
+                area = pygame.Rect(0, 0, width, height)
+                area.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                items.append(DrawItem("message_effect", area.inflate(8, 8), elapsed,
+                                      lambda: self.draw_message_effect(elapsed)))
             else:
                 self.showing_message_effect = False
         
-         # Dibujar botón de instrucciones
-        self.instructions_button.draw(self.screen, pygame.font.SysFont(None, 24))
-
+        # Botón de instrucciones
+        items.append(DrawItem("instructions_button", self.instructions_button.bounds(get_font(24)),
+                              self.instructions_button.render_state(),
+                              lambda: self.instructions_button.draw(screen, get_font(24))))
+        
         if self.showing_instructions:
-            self.draw_instructions_panel()
-
-        pygame.display.flip()
+            area = pygame.Rect(SCREEN_WIDTH//2 - 400, SCREEN_HEIGHT//2 - 300, 800, 600)
+            items.append(DrawItem("instructions", area, self.instructions_scroll_pos,
+                                  self.draw_instructions_panel))
+        return items
+    
+    def draw_message_effect(self, elapsed):
+        """Dibuja el mensaje grande que crece, se mantiene y se desvanece."""
+        # Calcular tamaño y opacidad según el tiempo
+        max_size = 72
+        min_size = 36
+        
+        if elapsed < 500:  # Primeros 0.5 segundos - creciendo
+            progress = elapsed / 500
+            size = min_size + (max_size - min_size) * progress
+            alpha = 255 * progress
+        elif elapsed < 1500:  # 1 segundo mantenido
+            size = max_size
+            alpha = 255
+        else:  # Últimos 0.5 segundos - desvaneciéndose
+            progress = (elapsed - 1500) / 500
+            size = max_size - (max_size - min_size) * progress
+            alpha = 255 * (1 - progress)
+        
+        # Crear superficie con transparencia (propia: cambia de opacidad en cada fotograma,
+        # así que no pasa por la caché de textos)
+        message_font = get_font(size)
+        message_surf = message_font.render(self.message_effect_text, True, self.message_effect_color)
+        
+        # Añadir un efecto de sombra
+        shadow_surf = message_font.render(self.message_effect_text, True, (0, 0, 0))
+        shadow_rect = shadow_surf.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 + 3))
+        message_surf.set_alpha(alpha)
+        shadow_surf.set_alpha(alpha * 0.7)  # Sombra más transparente
+        
+        # Mostrar el mensaje
+        message_rect = message_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.screen.blit(shadow_surf, shadow_rect)
+        self.screen.blit(message_surf, message_rect)
         
     def draw_instructions_panel(self):
         """Dibuja el panel de instrucciones del juego con capacidad de scroll."""
-        # Crear un panel semi-transparente
-        panel = pygame.Surface((800, 600), pygame.SRCALPHA)
-        panel.fill((30, 30, 50, 230))
         panel_pos = (SCREEN_WIDTH//2 - 400, SCREEN_HEIGHT//2 - 300)
+        base, content_surface = self.instructions_surfaces()
+        content_height = content_surface.get_height()
+
+        self.instructions_max_scroll = max(0, content_height - 470)
+        self.instructions_scroll_pos = max(0, min(self.instructions_scroll_pos, self.instructions_max_scroll))
+
+        # El panel compuesto solo se rehace al desplazar el contenido
+        if self.instructions_panel is None or self.instructions_panel[0] != self.instructions_scroll_pos:
+            panel = base.copy()
+            content_rect = pygame.Rect(0, self.instructions_scroll_pos, 700, 470)
+            panel.blit(content_surface, (50, 100), content_rect)
+
+            if self.instructions_max_scroll > 0:
+                track_h = 430
+                bar_h = max(50, track_h * (470 / content_height))
+                bar_y = 120 + (track_h - bar_h) * (self.instructions_scroll_pos / self.instructions_max_scroll)
+                pygame.draw.rect(panel, (80,80,80,150), (750,120,10,track_h), 0, 5)
+                pygame.draw.rect(panel, (200,200,200,200), (750, bar_y, 10, bar_h), 0, 5)
+                # flechas encima
+                if self.instructions_scroll_pos>0:
+                    pygame.draw.polygon(panel, WHITE, [(755,120),(765,140),(745,140)])
+                if self.instructions_scroll_pos<self.instructions_max_scroll:
+                    pygame.draw.polygon(panel, WHITE, [(755,550),(765,530),(745,530)])
+            self.instructions_panel = (self.instructions_scroll_pos, panel)
+
+        # mover a coords de pantalla para colisión
+        self.close_btn = INSTRUCTIONS_CLOSE_RECT.move(panel_pos)
+
+        self.screen.blit(self.instructions_panel[1], panel_pos)
+    
+    def instructions_surfaces(self):
+        """
+        Fondo fijo del panel de instrucciones y su contenido completo, dibujados
+        una sola vez; se rehacen solo si cambia la resolución o el texto
+        (`instructions_lines`).
+        
+        Returns:
+            tuple: (panel sin contenido, superficie con todas las líneas)
+        """
+        key = (self.screen.get_size(), self.instructions_lines)
+        if self.instructions_cache is not None and self.instructions_cache[0] == key:
+            return self.instructions_cache[1]
+        
+        # Crear un panel semi-transparente
+        base = pygame.Surface((800, 600), pygame.SRCALPHA)
+        base.fill((30, 30, 50, 230))
         
         # Añadir un borde al panel
-        pygame.draw.rect(panel, (200, 200, 200, 150), panel.get_rect(), 3, 15)
+        pygame.draw.rect(base, (200, 200, 200, 150), base.get_rect(), 3, 15)
         
         # Título del panel (fijo, no hace scroll)
-        title_font = pygame.font.SysFont(None, 48)
-        title_text = title_font.render("INSTRUCCIONES DEL JUEGO", True, (255, 255, 255))
+        title_font = get_font(48)
+        title_text = render_text(title_font, "INSTRUCCIONES DEL JUEGO", (255, 255, 255))
         title_rect = title_text.get_rect(center=(400, 40))
-        panel.blit(title_text, title_rect)
+        base.blit(title_text, title_rect)
         
         # Separador (fijo, no hace scroll)
-        pygame.draw.line(panel, (200, 200, 200, 150), (50, 80), (750, 80), 2)
-        
-        # Crear una superficie para el contenido scrollable
-        content_height = 1200  # Altura estimada del contenido
-        content_surface = pygame.Surface((700, content_height), pygame.SRCALPHA)
-        content_surface.fill((0, 0, 0, 0))  # Transparente
-        
-        # Instrucciones del juego - contenido extenso
-        instructions = [
-            "OBJETIVO: Eliminar al oponente o hacer que se quede sin cartas numéricas.",
-            "",
-            "REGLAS BÁSICAS:",
-            "1. Cada jugador tiene cartas numéricas (1-10) y cartas de habilidad.",
-            "2. En cada turno, ambos jugadores juegan una carta numérica. El valor más alto gana.",
-            "3. El perdedor del turno debe tomar una decisión:",
-            "   - Usar una carta de habilidad para cambiar la situación.",
-            "   - Arriesgarse a girar la ruleta rusa.",
-            "4. La ruleta comienza con 1% de probabilidad de 'muerte' y aumenta un 10% cada turno.",
-            "5. El juego termina cuando un jugador 'muere' en la ruleta o se queda sin cartas numéricas.",
-            "",
-            "CARTAS DE HABILIDAD:",
-            "• Aumento: Aumenta tu número en 3 puntos.",
-            "• Intercambio: Intercambia tu carta con la del oponente.",
-            "• Salvavidas: Te salva automáticamente sin usar la ruleta.",
-            "• Duplicar: Duplica el valor de tu carta numérica.",
-            "",
-            "DINÁMICA DEL JUEGO:",
-            "1. Al inicio de la partida, cada jugador recibe una mano de cartas aleatorias.",
-            "2. En tu turno, selecciona una carta numérica para jugar contra la IA.",
-            "3. El jugador con el valor más alto gana el turno.",
-            "4. El perdedor debe decidir entre usar una carta de habilidad o girar la ruleta.",
-            "5. Las cartas de habilidad pueden cambiar el resultado del turno o evitar la ruleta.",
-            "6. Si eliges girar la ruleta, hay una probabilidad de 'muerte' que aumenta cada turno.",
-            "7. El juego continúa hasta que un jugador muere en la ruleta o se queda sin cartas.",
-            "",
-            "ESTRATEGIA:",
-            "• Guarda tus cartas numéricas altas para momentos críticos.",
-            "• Las cartas de habilidad son valiosas cuando la probabilidad de la ruleta es alta.",
-            "• La IA tomará decisiones basadas en la probabilidad de la ruleta y sus cartas disponibles.",
-            "• No te arriesgues demasiado en los primeros turnos, la ruleta se vuelve más peligrosa.",
-            "",
-            "CONTROLES:",
-            "• Haz clic en una carta para seleccionarla.",
-            "• Usa los botones en la parte inferior para realizar acciones.",
-            "• El botón 'Instrucciones' abre esta ventana de ayuda.",
-            "",
-            "¡Buena suerte y que gane el mejor estratega!"
-        ]
-        
-        font = pygame.font.SysFont(None, 24)
-        # calcular altura total
-        y_acc = 0
-        for line in instructions:
-            surf = font.render(line, True, WHITE)
-            y_acc += surf.get_height() + 5
-        content_height = y_acc
-
-        # crear superficie de contenido
+        pygame.draw.line(base, (200, 200, 200, 150), (50, 80), (750, 80), 2)
+        
+        # Botón de cierre
+        font = get_font(24)
+        pygame.draw.rect(base, (200,50,50), INSTRUCTIONS_CLOSE_RECT, 0, 10)
+        pygame.draw.rect(base, WHITE, INSTRUCTIONS_CLOSE_RECT, 2, 10)
+        x_surf = render_text(font, "X", WHITE)
+        base.blit(x_surf, x_surf.get_rect(center=INSTRUCTIONS_CLOSE_RECT.center))
+        
+        # Contenido con scroll: cada línea se renderiza una vez
+        surfaces = [render_text(font, line, WHITE) for line in self.instructions_lines]
+        content_height = sum(surf.get_height() + 5 for surf in surfaces)
         content_surface = pygame.Surface((700, content_height), pygame.SRCALPHA)
         y = 0
-        for line in instructions:
-            surf = font.render(line, True, WHITE)
+        for surf in surfaces:
             content_surface.blit(surf, (0, y))
             y += surf.get_height() + 5
-
-        self.instructions_max_scroll = max(0, content_height - 470)
-        self.instructions_scroll_pos = max(0, min(self.instructions_scroll_pos, self.instructions_max_scroll))
-
-        content_rect = pygame.Rect(0, self.instructions_scroll_pos, 700, 470)
-        panel.blit(content_surface.subsurface(content_rect), (50, 100))
-
-        if self.instructions_max_scroll > 0:
-            track_h = 430
-            bar_h = max(50, track_h * (470 / content_height))
-            bar_y = 120 + (track_h - bar_h) * (self.instructions_scroll_pos / self.instructions_max_scroll)
-            pygame.draw.rect(panel, (80,80,80,150), (750,120,10,track_h), 0, 5)
-            pygame.draw.rect(panel, (200,200,200,200), (750, bar_y, 10, bar_h), 0, 5)
-            # flechas encima
-            if self.instructions_scroll_pos>0:
-                pygame.draw.polygon(panel, WHITE, [(755,120),(765,140),(745,140)])
-            if self.instructions_scroll_pos<self.instructions_max_scroll:
-                pygame.draw.polygon(panel, WHITE, [(755,550),(765,530),(745,530)])
-
-        local_close = pygame.Rect(700, 40, 50, 30)
-        pygame.draw.rect(panel, (200,50,50), local_close, 0, 10)
-        pygame.draw.rect(panel, WHITE, local_close, 2, 10)
-        x_surf = font.render("X", True, WHITE)
-        panel.blit(x_surf, x_surf.get_rect(center=local_close.center))
-        # mover a coords de pantalla para colisión
-        self.close_btn = local_close.move(panel_pos)
-
-        self.screen.blit(panel, panel_pos)
+        
+        self.instructions_cache = (key, (base, content_surface))
+        self.instructions_panel = None
+        return base, content_surface
     
     def run(self):
         """Bucle principal del juego."""
@@ -1123,6 +1450,8 @@ class GameScreen:
         while running:
             self.clock.tick(FPS)
             self.handle_events()
+            self.update_prefetch()
+            self.update_advisor()
             self.update_roulette_display()
             self.draw()
             
@@ -1130,4 +1459,7 @@ class GameScreen:
                 winner_name = self.game.winner.name if self.game.winner else "Empate"
                 self.game_message = f"¡Juego terminado! Ganador: {winner_name}"
                 self.show_message_effect("¡Juego Terminado!", (255, 50, 50))
-                self.play_button.set_active(False)
\ No newline at end of file
+                self.play_button.set_active(False)
+                # Las decisiones de la IA que sigan en marcha ya no sirven
+                if self.decision_worker is not None:
+                    self.decision_worker.cancel_all()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Atlas de sprites del mismo tamaño.
+
+Cada sprite se dibuja una sola vez, la primera vez que se pide su clave, en
+una casilla de una única superficie `convert_alpha()`; a partir de ahí
+dibujarlo es un `blit` de esa zona del atlas. Si las casillas se acaban, el
+atlas crece en filas conservando lo ya dibujado.
+
+La clave debe describir todo lo que cambia el aspecto del sprite: si algo
+cambia (por ejemplo el valor de una carta tras Aumento o Duplicar) la clave
+es otra y se dibuja un sprite nuevo; los demás no se tocan.
+"""
+import pygame
+
+
+class SpriteAtlas:
+    """Sprites de tamaño fijo dibujados una vez y reutilizados con `blit`."""
+
+    def __init__(self, slot_size, columns=8, rows=4):
+        """
+        Args:
+            slot_size: (ancho, alto) de cada casilla
+            columns: Casillas por fila
+            rows: Filas iniciales (se añaden más al llenarse)
+        """
+        self.slot_width, self.slot_height = slot_size
+        self.columns = columns
+        self.rows = rows
+        self.surface = None
+        self.slots = {}  # clave -> pygame.Rect de su casilla
+        self.rendered = 0
+
+    def _allocate(self):
+        index = len(self.slots)
+        if self.surface is None or index >= self.columns * self.rows:
+            if self.surface is not None:
+                self.rows *= 2
+            self._grow()
+        row, column = divmod(index, self.columns)
+        return pygame.Rect(column * self.slot_width, row * self.slot_height, self.slot_width, self.slot_height)
+
+    def _grow(self):
+        size = (self.columns * self.slot_width, self.rows * self.slot_height)
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        if self.surface is not None:
+            surface.blit(self.surface, (0, 0))
+        self.surface = surface
+
+    def get(self, key, paint):
+        """
+        Casilla del sprite `key`; si no existe se dibuja con `paint`.
+
+        Args:
+            key: Clave hashable que identifica el aspecto del sprite
+            paint: Función `(superficie, rect_de_la_casilla)` que dibuja el sprite
+
+        Returns:
+            pygame.Rect: Zona del atlas con el sprite
+        """
+        area = self.slots.get(key)
+        if area is None:
+            area = self._allocate()
+            self.slots[key] = area
+            # Se dibuja sobre una subsuperficie: `paint` no puede salirse de la casilla
+            paint(self.surface.subsurface(area), pygame.Rect(0, 0, self.slot_width, self.slot_height))
+            self.rendered += 1
+        return area
+
+    def blit(self, dest, key, position, paint):
+        """Dibuja el sprite `key` en `dest` con su esquina superior izquierda en `position`."""
+        area = self.get(key, paint)
+        return dest.blit(self.surface, position, area)
+
+    def clear(self):
+        self.slots.clear()
+        self.surface = None
+
+    def __len__(self):
+        return len(self.slots)
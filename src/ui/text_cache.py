@@ -0,0 +1,112 @@
+"""
+Fuentes y textos renderizados compartidos por toda la interfaz.
+
+`pygame.font.SysFont` busca y carga la fuente del sistema en cada llamada, y
+`Font.render` rasteriza el texto cada vez. La interfaz dibuja los mismos
+textos (valores de las cartas, etiquetas, botones) en cada fotograma, así que:
+
+- `get_font` guarda una fuente por (nombre, tamaño, negrita, cursiva) y la
+  crea solo la primera vez;
+- `render_text` guarda en una caché LRU la superficie de cada combinación
+  de texto, fuente, color y suavizado.
+
+Las superficies devueltas por `render_text` se comparten: no deben
+modificarse (`set_alpha`, `fill`, ...). Para un texto que cambia de tamaño u
+opacidad en cada fotograma se usa `get_font(...).render(...)` directamente.
+"""
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+
+
+def get_font(size, name=None, bold=False, italic=False):
+    """
+    Fuente del sistema compartida (se crea una vez por combinación).
+
+    Args:
+        size: Tamaño en puntos
+        name: Nombre de la fuente (None = la predeterminada de pygame)
+        bold: Negrita
+        italic: Cursiva
+
+    Returns:
+        pygame.font.Font: La fuente
+    """
+    key = (name, int(size), bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, int(size), bold, italic)
+    return font
+
+
+class TextCache:
+    """Caché LRU de textos renderizados."""
+
+    def __init__(self, capacity=512):
+        """
+        Args:
+            capacity: Superficies máximas guardadas
+        """
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Superficie de `text` con `font` y `color`, renderizada solo la primera vez."""
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def stats(self):
+        """Devuelve el tamaño y la tasa de aciertos de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    Renderiza `text` a través de la caché compartida.
+
+    Args:
+        font: Fuente (normalmente de `get_font`) o tamaño de la fuente predeterminada
+        text: Texto a renderizar
+        color: Color del texto
+
+    Returns:
+        pygame.Surface: Superficie compartida (no modificar)
+    """
+    if isinstance(font, (int, float)):
+        font = get_font(font)
+    return _text_cache.render(font, str(text), color, antialias)
+
+
+def text_cache():
+    """La caché de textos compartida (para consultar sus estadísticas)."""
+    return _text_cache
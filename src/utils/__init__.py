@@ -0,0 +1 @@
+# Este archivo inicializa el paquete de utilidades.
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Registro del juego sin bloquear a quien escribe.
+
+`setup_logging` (llamado desde main.py, nunca al importar un módulo) deja en
+el logger raíz un único `QueueHandler`: registrar un mensaje solo lo mete en
+una cola en memoria, y un hilo aparte (`QueueListener`) le da formato y lo
+escribe en disco y en consola. Si la cola se llena el mensaje se descarta en
+lugar de esperar, de modo que la escritura de registros nunca retrasa una
+decisión de la IA.
+
+- El fichero guarda un objeto JSON por línea (`JsonFormatter`).
+- Al llegar a `max_bytes` el fichero rota y la copia antigua se comprime con
+  gzip (`CompressingRotatingFileHandler`); se conservan `backup_count` copias.
+- Los datos voluminosos (prompts, respuestas, payloads) se pasan aparte con
+  `extra={"payload": ...}`; `PayloadSampler` solo conserva una fracción de
+  ellos y los recorta, mientras el mensaje en sí se registra siempre.
+"""
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import shutil
+import time
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como un objeto JSON en una línea."""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                  + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "payload", None) is not None:
+            entry["payload"] = record.payload
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """`RotatingFileHandler` que comprime con gzip las copias rotadas."""
+
+    def __init__(self, filename, max_bytes, backup_count, **kwargs):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding="utf-8", **kwargs)
+        self.namer = lambda name: name + ".gz"
+        self.rotator = _gzip_rotator
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class PayloadSampler(logging.Filter):
+    """
+    Muestrea los datos voluminosos de los registros (`extra={"payload": ...}`).
+
+    Con probabilidad `rate` el payload se conserva (recortado a `max_chars` si
+    es texto); si no, se quita del registro. El mensaje se registra igualmente.
+    """
+
+    def __init__(self, rate=0.1, max_chars=2000, seed=None):
+        """
+        Args:
+            rate: Fracción de payloads que se conservan (0-1)
+            max_chars: Caracteres máximos de un payload de texto
+            seed: Semilla del muestreo (propio, no afecta al azar del juego)
+        """
+        super().__init__()
+        self.rate = rate
+        self.max_chars = max_chars
+        self.rng = random.Random(seed)
+
+    def filter(self, record):
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return True
+        if self.rate < 1 and self.rng.random() >= self.rate:
+            record.payload = None
+        elif isinstance(payload, str) and len(payload) > self.max_chars:
+            record.payload = payload[:self.max_chars] + f"... (+{len(payload) - self.max_chars})"
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """`QueueHandler` que descarta el registro si la cola está llena en lugar de esperar."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # El formato (JSON, trazas) se hace en el hilo del listener; aquí solo
+        # se fija el texto del mensaje por si sus argumentos cambian después
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level="INFO", log_dir=None, filename="juego_ia.log", max_bytes=1_000_000,
+                  backup_count=5, payload_sample_rate=0.1, payload_max_chars=2000,
+                  queue_size=10000, console=True):
+    """
+    Configura el registro de la aplicación (una sola vez, desde main.py).
+
+    Args:
+        level: Nivel mínimo ("DEBUG", "INFO", ... o su valor numérico)
+        log_dir: Carpeta del fichero de registro (None = sin fichero)
+        filename: Nombre del fichero dentro de `log_dir`
+        max_bytes: Tamaño a partir del cual rota el fichero
+        backup_count: Copias comprimidas que se conservan
+        payload_sample_rate: Fracción de payloads voluminosos que se registran
+        payload_max_chars: Caracteres máximos de un payload de texto
+        queue_size: Registros pendientes máximos antes de descartar
+        console: Mostrar también los registros en consola (formato legible)
+
+    Returns:
+        NonBlockingQueueHandler: El handler instalado en el logger raíz
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    handlers = []
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = CompressingRotatingFileHandler(os.path.join(log_dir, filename), max_bytes,
+                                                      backup_count)
+        file_handler.setFormatter(JsonFormatter())
+        # El muestreo va en el handler del fichero (el único que escribe los
+        # payloads), así se ejecuta en el hilo del listener y no en el que registra
+        file_handler.addFilter(PayloadSampler(payload_sample_rate, payload_max_chars))
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener.start()
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Escribe los registros pendientes y detiene el hilo de escritura."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    if _queue_handler.dropped:
+        logging.warning(f"Se descartaron {_queue_handler.dropped} registros con la cola llena")
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los módulos se importan como en main.py: `game`, `ai`, ... desde src/ y `config` desde la raíz
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,23 @@
+"""Equivalencia estadística entre el motor vectorizado y el motor de objetos (`Game`)."""
+import pytest
+
+from game.batch_engine import Z_THRESHOLD, compare_engines, run_batch
+
+SEED = 7
+
+
+@pytest.fixture(scope="module")
+def z_scores():
+    return compare_engines(n_object_games=20000, n_batch_games=200000, seed=SEED)
+
+
+@pytest.mark.parametrize("metric", ["player_wins", "turns", "deaths"])
+def test_batch_engine_matches_object_engine(z_scores, metric):
+    assert abs(z_scores[metric]) < Z_THRESHOLD, f"z({metric}) = {z_scores[metric]:+.2f}"
+
+
+def test_batch_engine_is_reproducible():
+    first = run_batch(20000, seed=SEED)
+    second = run_batch(20000, seed=SEED)
+    for key in ("player_wins", "ai_wins", "turns", "deaths"):
+        assert first[key] == second[key]
@@ -0,0 +1,120 @@
+"""Cortacircuitos y timeout adaptativo de `BackendHealth`, con un reloj simulado."""
+import pytest
+
+from ai.health import CLOSED, HALF_OPEN, OPEN, BackendHealth, BackendUnavailable, InvalidResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_health(clock, **kwargs):
+    options = dict(failure_streak=3, cooldown=10.0, max_cooldown=35.0, min_samples=5,
+                   max_error_rate=1.0, clock=clock)
+    options.update(kwargs)
+    return BackendHealth("prueba", **options)
+
+
+def open_breaker(health):
+    for _ in range(health.failure_streak):
+        assert health.allow_request()
+        health.record_failure()
+
+
+def test_failure_streak_opens_the_breaker(clock):
+    health = make_health(clock)
+    for _ in range(health.failure_streak - 1):
+        health.record_failure()
+        assert health.state == CLOSED
+    health.record_failure()
+    assert health.state == OPEN
+
+
+def test_success_resets_the_streak(clock):
+    health = make_health(clock)
+    health.record_failure()
+    health.record_failure()
+    health.record_success(0.1)
+    health.record_failure()
+    assert health.state == CLOSED
+
+
+def test_open_breaker_rejects_calls(clock):
+    health = make_health(clock)
+    open_breaker(health)
+    clock.advance(health.cooldown - 1)
+    assert not health.allow_request()
+    calls = []
+    with pytest.raises(BackendUnavailable):
+        health.call(lambda timeout: calls.append(timeout))
+    assert calls == []
+    assert health.rejected == 2
+
+
+def test_single_probe_after_cooldown(clock):
+    health = make_health(clock)
+    open_breaker(health)
+    clock.advance(health.cooldown)
+    assert health.allow_request()
+    assert health.state == HALF_OPEN
+    # Mientras la prueba no termina no pasa ninguna otra petición
+    assert not health.allow_request()
+    assert not health.allow_request()
+
+
+def test_failed_probe_doubles_cooldown_up_to_max(clock):
+    health = make_health(clock)
+    open_breaker(health)
+    expected = [20.0, 35.0, 35.0]
+    for cooldown in expected:
+        clock.advance(health.cooldown)
+        assert health.allow_request()
+        health.record_failure()
+        assert health.state == OPEN
+        assert health.cooldown == cooldown
+    clock.advance(health.cooldown - 0.5)
+    assert not health.allow_request()
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    health = make_health(clock)
+    open_breaker(health)
+    clock.advance(health.cooldown)
+    assert health.call(lambda timeout: "ok") == "ok"
+    assert health.state == CLOSED
+    assert health.cooldown == health.base_cooldown
+    assert health.allow_request()
+    assert health.allow_request()
+
+
+def test_invalid_response_counts_as_failure(clock):
+    health = make_health(clock)
+
+    def parse(text):
+        raise InvalidResponse("sin JSON", text)
+
+    for _ in range(health.failure_streak):
+        with pytest.raises(InvalidResponse):
+            health.call(lambda timeout: "sin decisión", parse=parse)
+    assert health.state == OPEN
+
+
+@pytest.mark.parametrize("latency, expected", [(0.01, 1.0), (2.0, 3.0), (30.0, 10.0)])
+def test_timeout_is_clamped(clock, latency, expected):
+    health = make_health(clock, min_timeout=1.0, max_timeout=10.0, timeout_factor=1.5)
+    assert health.timeout() == health.max_timeout  # sin datos suficientes
+    for _ in range(health.min_samples):
+        health.record_success(latency)
+    assert health.timeout() == pytest.approx(expected)
@@ -0,0 +1,46 @@
+"""`make_move`/`unmake_move` de `Game` y el hash Zobrist incremental."""
+import random
+
+import pytest
+
+from game.game_logic import Game
+from game.zobrist import ZobristTracker
+
+
+def fresh_hash(game):
+    """Hash de la posición recalculando las manos desde cero."""
+    tracker = ZobristTracker()
+    tracker.reset(game)
+    return tracker.position_hash(game)
+
+
+def random_move(game, rng):
+    """Jugada legal al azar; la ruleta siempre con resultado fijo (nodo de azar)."""
+    kind, seat, argument = move = rng.choice(game.legal_moves())
+    if kind == "roulette":
+        return (kind, seat, rng.random() < 0.5)
+    return move
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_playouts_round_trip(seed):
+    rng = random.Random(seed)
+    game = Game(seed=seed)
+    game.setup_game()
+    round_trips = 0
+    for _ in range(20):
+        # Partida completa al azar y vuelta atrás jugada a jugada (LIFO)
+        stack = []
+        while game.legal_moves():
+            before = (game.snapshot(), game.position_hash())
+            record = game.make_move(random_move(game, rng))
+            assert game.position_hash() == fresh_hash(game)
+            stack.append((before, record))
+        while stack:
+            (snapshot, position_hash), record = stack.pop()
+            game.unmake_move(record)
+            assert game.snapshot() == snapshot
+            assert game.position_hash() == position_hash
+            assert fresh_hash(game) == position_hash
+            round_trips += 1
+    assert round_trips > 0
@@ -0,0 +1,65 @@
+"""`JsonObjectScanner` y `read_decision` con respuestas troceadas."""
+import json
+
+from ai.streaming import JsonObjectScanner, read_decision
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_braces_inside_reasoning():
+    text = ('{"reasoning": "si juego {3} gano; y si no } pierdo", '
+            '"card_to_play": 2, "if_lose_choice": "roulette"}')
+    result, cut_short = read_decision(chunked(text, 7))
+    assert cut_short
+    assert json.loads(result) == {"reasoning": "si juego {3} gano; y si no } pierdo",
+                                  "card_to_play": 2, "if_lose_choice": "roulette"}
+
+
+def test_stops_once_decision_fields_are_complete():
+    text = ('{"card_to_play": 1, "if_lose_choice": "skill", "skill_card_index": 0, '
+            '"reasoning": "la habilidad {cambia} el perdedor"}')
+    chunks = iter(chunked(text, 5))
+    result, cut_short = read_decision(chunks)
+    assert cut_short
+    assert json.loads(result) == {"card_to_play": 1, "if_lose_choice": "skill", "skill_card_index": 0}
+    # La lectura se cortó antes de llegar al final del texto
+    assert next(chunks, None) is not None
+
+
+def test_stray_braces_before_the_object():
+    text = ('Pienso en {mi mano} y en {la del rival}.\n'
+            '{"card_to_play": 5, "if_lose_choice": "roulette"} y nada más')
+    result, cut_short = read_decision(chunked(text, 4))
+    assert cut_short
+    assert json.loads(result) == {"card_to_play": 5, "if_lose_choice": "roulette"}
+
+
+def test_chunk_boundaries_inside_escapes():
+    decision = {"reasoning": 'dice "}" y \\ luego {', "card_to_play": 4, "if_lose_choice": "roulette"}
+    text = json.dumps(decision)
+    for split in range(1, len(text)):
+        scanner = JsonObjectScanner(ready=None)
+        assert scanner.feed(text[:split]) is None
+        assert json.loads(scanner.feed(text[split:])) == decision
+
+
+def test_character_by_character():
+    decision = {"reasoning": 'a\\"b \\\\ "}{"', "card_to_play": 3, "if_lose_choice": "roulette"}
+    result, _ = read_decision(json.dumps(decision))
+    assert json.loads(result) == decision
+
+
+def test_truncated_object_with_complete_decision():
+    text = '{"card_to_play": 4, "if_lose_choice": "skill", "skill_card_index": 1'
+    result, cut_short = read_decision(chunked(text, 6))
+    assert not cut_short
+    assert json.loads(result) == {"card_to_play": 4, "if_lose_choice": "skill", "skill_card_index": 1}
+
+
+def test_truncated_object_without_decision():
+    text = '{"card_to_play": 4, "if_lose_choice": "skill"'
+    result, cut_short = read_decision(chunked(text, 6))
+    assert not cut_short
+    assert result == text